@@ -0,0 +1,1051 @@
+# Benchmarks και parity checks για τα γρήγορα μονοπάτια του Deliverable 1A
+# Χρήση (από τον φάκελο Paradoteo1A): python benchmark.py <name> [<name> ...]
+# Χωρίς όρισμα τρέχουν όλα. Κάθε parity check σηκώνει AssertionError σε απόκλιση.
+
+import os
+import sys
+import time
+import random
+import subprocess
+import src  # το src/__init__.py προσθέτει στο sys.path το κοινό package nlp_common
+
+RAW_DIR = os.path.join("data", "raw")
+
+# Startup budget: cumulative χρόνος του `import main` (-X importtime, καλύτερος από μερικά runs) και modules που
+# πρέπει να φορτώνονται μόνο όταν τα χρειαστεί ένα στάδιο (lazy imports) - βλ. bench_startup
+STARTUP_BUDGET_MS = 250
+LAZY_MODULES = ('nltk', 'contractions', 'numpy', 'http.server', 'sqlite3')
+
+# Ελάχιστο ποσοστό ίδιων tags του numpy tagger engine με το nltk.pos_tag - βλ. bench_batch_tagger
+BATCH_TAGGER_MIN_AGREEMENT = 0.999
+
+# ============================== HELPERS ==============================
+
+def load_sample_sentences():
+    # Οι προτάσεις του demo + μερικές δύσκολες περιπτώσεις (unicode, tabs, πολλαπλή στίξη)
+    sentences = []
+    for name in ("sentence1.txt", "sentence2.txt"):
+        path = os.path.join(RAW_DIR, name)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                sentences.append(f.read().strip())
+    sentences += [
+        "Hello,   World!!! It's   a \t test — isn't it…",
+        "“Quoted” text, with ‘single’ quotes; and (parentheses) [brackets] {braces}.",
+        "MIXED case\nnew lines\r\nand non-breaking spaces",
+        "",
+    ]
+    return sentences
+
+
+def synthetic_document(size_bytes, seed=0):
+    # Συνθετικό κείμενο με λέξεις από τις προτάσεις του demo μέχρι το ζητούμενο μέγεθος
+    rng = random.Random(seed)
+    words = " ".join(load_sample_sentences()).split() or ["word"]
+    parts = []
+    total = 0
+    while total < size_bytes:
+        word = rng.choice(words)
+        parts.append(word)
+        total += len(word) + 1
+    return " ".join(parts)
+
+
+def timed(func, *args, repeat=3):
+    # Επιστρέφει (καλύτερος χρόνος, αποτέλεσμα)
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+
+def import_profile(module, cwd="."):
+    # `python -X importtime -c "import <module>"` σε νέο interpreter -> {module: (self_us, cumulative_us)}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=cwd, capture_output=True, text=True, check=True)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+# ============================== BENCHMARKS ==============================
+
+def bench_normalization(size_mb=4):
+    # Parity + throughput: fused normalize_text vs Steps 2-4 βήμα-βήμα
+    from src.preprocessing import (
+        apply_lowercasing, remove_punctuation_and_special_chars, clean_whitespace, normalize_text
+    )
+
+    def step_by_step(text):
+        return clean_whitespace(remove_punctuation_and_special_chars(apply_lowercasing(text)))
+
+    for sentence in load_sample_sentences():
+        assert normalize_text(sentence) == step_by_step(sentence), sentence
+
+    document = synthetic_document(size_mb * 1024 * 1024)
+    steps_time, steps_out = timed(step_by_step, document)
+    fused_time, fused_out = timed(normalize_text, document)
+    assert fused_out == steps_out
+
+    print(f"[normalization] {size_mb} MB document")
+    print(f"  step-by-step: {steps_time:.3f}s")
+    print(f"  fused:        {fused_time:.3f}s  ({steps_time / fused_time:.1f}x)")
+
+
+def _retained_stream_peak_rss(keep, n_sentences, queue):
+    # Τρέχει σε ξεχωριστό process: κρατάει όλα τα αποτελέσματα στη μνήμη και επιστρέφει peak RSS (KB)
+    import resource
+    from src.preprocessing import preprocess_stream, get_tagger, get_lemmatizer
+
+    # Φόρτωση NLTK πριν τη μέτρηση της βάσης
+    get_tagger()
+    get_lemmatizer()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    sentences = load_sample_sentences()[:2] or ["The quick brown fox jumps over the lazy dog."]
+    texts = (sentences[i % len(sentences)] + f" record {i}" for i in range(n_sentences))
+    retained = list(preprocess_stream(texts, keep=keep))
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((len(retained), baseline, peak))
+
+
+def bench_preprocess_memory(n_sentences=50_000):
+    # Peak RSS του preprocess_stream με όλα τα στάδια vs lean mode (μόνο pos_tags)
+    import multiprocessing
+    from src.preprocessing import LEAN_STAGES
+
+    context = multiprocessing.get_context("spawn")
+    print(f"[preprocess_memory] {n_sentences} sentences retained in memory")
+    peaks = {}
+    for label, keep in (("all stages", None), ("lean", LEAN_STAGES)):
+        queue = context.Queue()
+        process = context.Process(target=_retained_stream_peak_rss, args=(keep, n_sentences, queue))
+        process.start()
+        count, baseline, peak = queue.get()
+        process.join()
+        peaks[label] = peak - baseline
+        print(f"  {label:<10}: peak RSS {peak / 1024:.1f} MB (+{(peak - baseline) / 1024:.1f} MB for {count} results)")
+
+    saved = peaks["all stages"] - peaks["lean"]
+    print(f"  lean mode saves {saved / 1024:.1f} MB ({100 * saved / max(peaks['all stages'], 1):.0f}% of result memory)")
+
+
+def bench_parallel_scaling(n_sentences=2000, chunk_size=64):
+    # Throughput του run_corpus για 1, 2, 4, ... workers μέχρι τον αριθμό των πυρήνων
+    from src.corpus_runner import run_corpus, default_workers
+
+    sentences = load_sample_sentences()[:2] or ["The quick brown fox jumps over the lazy dog."]
+    texts = [sentences[i % len(sentences)] for i in range(n_sentences)]
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= default_workers():
+        worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"[parallel_scaling] {n_sentences} sentences, chunk size {chunk_size}")
+    baseline = None
+    for workers in worker_counts:
+        stats = {}
+        for _ in run_corpus(texts, workers=workers, chunk_size=chunk_size, stats=stats):
+            pass
+        throughput = stats['records_per_sec']
+        baseline = baseline or throughput
+        print(f"  {workers:>3} workers: {throughput:8.1f} sentences/sec  (x{throughput / baseline:.2f})")
+
+
+def bench_tagged_memory(n_tokens=40):
+    # Μνήμη ανά πρόταση: λίστα από (token, tag) tuples vs TaggedSentence (χωρίς τα κοινά interned strings)
+    from src.tagged_sentence import TaggedSentence
+
+    words = synthetic_document(n_tokens * 8).split()[:n_tokens]
+    tags = ['DT', 'JJ', 'NN', 'VBZ', 'IN', 'PRP', 'RB', 'NNS']
+    pos_tags = [(word, tags[i % len(tags)]) for i, word in enumerate(words)]
+    sentence = TaggedSentence.from_pos_tags(pos_tags)
+
+    tuple_bytes = sys.getsizeof(pos_tags) + sum(sys.getsizeof(pair) for pair in pos_tags)
+    compact_bytes = sys.getsizeof(sentence) + sum(
+        sys.getsizeof(buffer) for buffer in (sentence.token_ids, sentence.tag_ids, sentence.masks)
+    )
+    assert sentence.to_pos_tags() == pos_tags
+
+    print(f"[tagged_memory] sentence with {len(pos_tags)} tokens")
+    print(f"  list of tuples:  {tuple_bytes} bytes")
+    print(f"  TaggedSentence:  {compact_bytes} bytes  ({tuple_bytes / compact_bytes:.1f}x smaller)")
+
+    # Token table σε long-running process: κάθε πρόταση με νέα tokens (αριθμοί) - ο πίνακας δεν ξεπερνάει το όριο
+    # και οι προτάσεις που δημιουργήθηκαν πριν από την αλλαγή πίνακα διαβάζονται σωστά
+    import src.tagged_sentence as tagged_sentence
+    from src.syntactic_analysis import syntactic_analysis_pipeline, plan_signature
+    limit = tagged_sentence.TOKEN_TABLE_LIMIT
+    tagged_sentence.TOKEN_TABLE_LIMIT = 1_000
+    try:
+        kept = []
+        largest = 0
+        for k in range(200):
+            pos_tags = [('the', 'DT'), ('dog', 'NN')] + [(str(k * 100 + j), 'CD') for j in range(50)]
+            sentence = TaggedSentence.from_pos_tags(pos_tags)
+            plan_signature(sentence)
+            syntactic_analysis_pipeline(pos_tags, False, details=False)
+            largest = max(largest, len(tagged_sentence.current_token_table()))
+            if k % 40 == 0:
+                kept.append((sentence, pos_tags))
+        assert all(sentence.to_pos_tags() == pos_tags for sentence, pos_tags in kept), "stale token ids"
+        assert largest < tagged_sentence.TOKEN_TABLE_LIMIT + 100, f"token table grew to {largest}"
+        print(f"  token table: 10000 distinct tokens, largest table {largest} (limit {tagged_sentence.TOKEN_TABLE_LIMIT})")
+    finally:
+        tagged_sentence.TOKEN_TABLE_LIMIT = limit
+
+
+def synthetic_pos_tags(n_sentences, n_tokens=25, seed=0):
+    # Συνθετικές tagged προτάσεις για τα benchmarks του syntactic stage (δεν χρειάζονται NLTK)
+    rng = random.Random(seed)
+    lexicon = [
+        ('the', 'DT'), ('a', 'DT'), ('my', 'PRP$'), ('he', 'PRP'), ('we', 'PRP'),
+        ('big', 'JJ'), ('new', 'JJ'), ('better', 'JJR'), ('quickly', 'RB'),
+        ('dog', 'NN'), ('festival', 'NN'), ('cats', 'NNS'), ('John', 'NNP'),
+        ('is', 'VBZ'), ('was', 'VBD'), ('will', 'MD'), ('run', 'VB'), ('celebrate', 'VB'), ('told', 'VBD'),
+        ('in', 'IN'), ('with', 'IN'), ('because', 'IN'), ('although', 'IN'),
+        ('and', 'CC'), ('but', 'CC'), ('up', 'RP'), (',', ','), ('to', 'TO'),
+    ]
+    # Ξεκινούν με determiner: οι διορθώσεις δεν τον μετακινούν, οπότε καμία πρόταση δεν ξεκινά με σύνδεσμο
+    return [[('the', 'DT')] + [rng.choice(lexicon) for _ in range(n_tokens - 1)] for _ in range(n_sentences)]
+
+
+def _count_calls(module, names):
+    # Τυλίγει συναρτήσεις του module ώστε να μετράει κλήσεις - επιστρέφει (counts, restore)
+    counts = dict.fromkeys(names, 0)
+    originals = {name: getattr(module, name) for name in names}
+
+    def wrap(name):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return originals[name](*args, **kwargs)
+        return counted
+
+    for name in names:
+        setattr(module, name, wrap(name))
+
+    def restore():
+        for name, func in originals.items():
+            setattr(module, name, func)
+    return counts, restore
+
+
+def bench_analysis_scans(n_sentences=2000):
+    # Scans ανά πρόταση: κάθε consumer υπολογίζει μόνος του (χωρίς context) vs AnalysisContext του pipeline
+    from src import syntactic_analysis as sa
+
+    sentences = synthetic_pos_tags(n_sentences)
+    scan_functions = ('identify_noun_phrases', 'find_verb_groups', 'detect_subordinate_conjunctions')
+
+    def without_context(pos_tags):
+        fixed, _ = sa.detect_and_fix_problems(pos_tags)
+        sa.identify_noun_phrases(fixed)
+        sa.find_verb_groups(fixed)
+        sa.identify_clauses(fixed)
+        sa.extract_svo_components(fixed)
+        sa.handle_clauses(fixed)
+
+    def with_context(pos_tags):
+        sa.syntactic_analysis_pipeline(pos_tags, False)
+
+    print(f"[analysis_scans] {n_sentences} synthetic sentences")
+    for label, run in (("without context", without_context), ("with context", with_context)):
+        counts, restore = _count_calls(sa, scan_functions)
+        try:
+            start = time.perf_counter()
+            for pos_tags in sentences:
+                run(pos_tags)
+            elapsed = time.perf_counter() - start
+        finally:
+            restore()
+        per_sentence = sum(counts.values()) / n_sentences
+        print(f"  {label:<16}: {per_sentence:.2f} scans/sentence, {elapsed:.3f}s  {counts}")
+
+
+def bench_span_scaling(sizes=(500, 1000, 2000, 4000, 8000)):
+    # Μεγάλες προτάσεις (π.χ. νομικά κείμενα): PP extraction και SVO πρέπει να κλιμακώνονται γραμμικά
+    # με το μήκος - ο χρόνος ανά token πρέπει να μένει περίπου σταθερός
+    from src.syntactic_analysis import AnalysisContext, extract_prepositional_phrases, extract_svo_components
+    from src.tagged_sentence import TaggedSentence
+
+    print(f"[span_scaling] synthetic sentences of {', '.join(map(str, sizes))} tokens")
+    baseline = None
+    for n_tokens in sizes:
+        sentence = TaggedSentence.from_pos_tags(synthetic_pos_tags(1, n_tokens, seed=n_tokens)[0])
+
+        # Τα scans (NP chunking, verb groups) γίνονται μία φορά εκτός μέτρησης - μετράνε μόνο οι lookups
+        context = AnalysisContext(sentence)
+        context.np_index, context.verb_groups, context.prepositional_phrases
+
+        def extract():
+            extract_prepositional_phrases(sentence, context.noun_phrases, context.np_index[0])
+            extract_svo_components(sentence, context)
+
+        elapsed, _ = timed(extract)
+        per_token = elapsed / n_tokens * 1e6
+        baseline = baseline or per_token
+        print(f"  {n_tokens:>6} tokens: {elapsed * 1000:8.2f}ms  {per_token:6.2f}us/token  (x{per_token / baseline:.2f} vs {sizes[0]})")
+
+
+def bench_fix_scaling(sizes=(500, 1000, 2000, 4000, 8000)):
+    # Θορυβώδεις μεγάλες προτάσεις: πολλές διορθώσεις ανά πρόταση
+    # Με in-place μετακινήσεις ο χρόνος ανά token μένει σταθερός (πριν: νέα λίστα σε κάθε διόρθωση, O(n^2))
+    from src.syntactic_analysis import detect_and_fix_problems
+    from src.tagged_sentence import TaggedSentence
+
+    print(f"[fix_scaling] noisy synthetic sentences of {', '.join(map(str, sizes))} tokens")
+    baseline = None
+    for n_tokens in sizes:
+        rng = random.Random(n_tokens)
+        noisy = [('quickly', 'RB')]
+        while len(noisy) < n_tokens:
+            noisy += rng.choice([
+                [('in', 'IN'), ('big', 'JJ'), ('the', 'DT'), ('dog', 'NN')],  # Problem 1
+                [('the', 'DT'), ('quickly', 'RB'), (',', ','), ('run', 'VB'), ('cats', 'NNS')],  # Problem 2
+                [('he', 'PRP'), ('is', 'VBZ'), ('new', 'JJ')],
+            ])
+        sentence = TaggedSentence.from_pos_tags(noisy[:n_tokens])
+
+        elapsed, (_, problems) = timed(detect_and_fix_problems, sentence)
+        per_token = elapsed / n_tokens * 1e6
+        baseline = baseline or per_token
+        print(f"  {n_tokens:>6} tokens: {len(problems):>5} fixes  {elapsed * 1000:8.2f}ms  "
+              f"{per_token:6.2f}us/token  (x{per_token / baseline:.2f} vs {sizes[0]})")
+
+
+def bench_leading_conjunction():
+    # Regression: προτάσεις που ξεκινάνε με συντονιστικό σύνδεσμο ("And the cat ran", "But ...") - το
+    # handle_clauses_plan σήκωνε IndexError - τόσο ανά πρόταση όσο και στο batch syntactic stage
+    from src.syntactic_analysis import syntactic_analysis_pipeline
+    from src.pattern_scan import syntactic_analysis_batch
+
+    sentences = [
+        [('And', 'CC'), ('the', 'DT'), ('cat', 'NN'), ('ran', 'VBD'), ('.', '.')],
+        [('But', 'CC'), ('he', 'PRP'), ('told', 'VBD'), ('me', 'PRP'), ('and', 'CC'), ('she', 'PRP'), ('left', 'VBD')],
+        [('or', 'CC')],
+    ]
+    expected = [syntactic_analysis_pipeline(pos_tags, False, details=False) for pos_tags in sentences]
+    batch = syntactic_analysis_batch(sentences, details=False)
+    for pos_tags, result, batch_result in zip(sentences, expected, batch):
+        print(f"[leading_conjunction] {' '.join(token for token, _ in pos_tags)!r} -> {result['reconstructed']!r}")
+        assert pos_tags[0][0].lower() in result['reconstructed'].lower().split()[0], result['reconstructed']
+        assert batch_result['reconstructed'] == result['reconstructed']
+
+
+def bench_pattern_scan(n_sentences=20_000, noisy_ratio=0.1):
+    # Corpus όπου οι περισσότερες προτάσεις δεν έχουν προβλήματα:
+    # detect_and_fix_problems σε κάθε πρόταση vs batch scan με NumPy + fixers μόνο στις flagged
+    from src.syntactic_analysis import detect_and_fix_problems, syntactic_analysis_pipeline
+    from src.pattern_scan import find_problem_sentences, syntactic_analysis_batch
+    from src.tagged_sentence import TaggedSentence
+
+    rng = random.Random(0)
+    clean = [
+        [('the', 'DT'), ('dog', 'NN'), ('is', 'VBZ'), ('big', 'JJ'), ('.', '.')],
+        [('he', 'PRP'), ('told', 'VBD'), ('the', 'DT'), ('cats', 'NNS'), ('about', 'IN'), ('the', 'DT'), ('festival', 'NN'), ('.', '.')],
+        [('we', 'PRP'), ('will', 'MD'), ('celebrate', 'VB'), ('with', 'IN'), ('my', 'PRP$'), ('new', 'JJ'), ('friends', 'NNS'), ('.', '.')],
+    ]
+    noisy = [
+        [('the', 'DT'), ('dog', 'NN'), ('with', 'IN'), ('big', 'JJ'), ('the', 'DT'), ('tail', 'NN'), ('.', '.')],
+        [('quickly', 'RB'), ('the', 'DT'), ('dog', 'NN'), ('run', 'VB'), ('.', '.')],
+    ]
+    sentences = [TaggedSentence.from_pos_tags(rng.choice(noisy if rng.random() < noisy_ratio else clean))
+                 for _ in range(n_sentences)]
+
+    def per_sentence():
+        return [detect_and_fix_problems(sentence) for sentence in sentences]
+
+    def batch():
+        flagged = find_problem_sentences(sentences)
+        return [detect_and_fix_problems(sentence) for sentence, flag in zip(sentences, flagged) if flag]
+
+    print(f"[pattern_scan] {n_sentences} sentences, {noisy_ratio:.0%} with problems")
+    t_sentence, _ = timed(per_sentence)
+    t_batch, fixed = timed(batch)
+    print(f"  detection per sentence : {t_sentence:.3f}s")
+    print(f"  numpy scan + fixers    : {t_batch:.3f}s  ({len(fixed)} sentences fixed, x{t_sentence / t_batch:.1f})")
+
+    t_pipeline, expected = timed(lambda: [syntactic_analysis_pipeline(sentence, False) for sentence in sentences], repeat=1)
+    t_pipeline_batch, results = timed(syntactic_analysis_batch, sentences, repeat=1)
+    print(f"  full syntactic stage   : {t_pipeline:.3f}s per sentence, {t_pipeline_batch:.3f}s batch "
+          f"(identical: {results == expected})")
+
+
+def bench_plan_cache(n_sentences=20_000, n_templates=200, n_tokens=12):
+    # Corpus με επαναλαμβανόμενα templates προτάσεων (ίδια tags, διαφορετικές λέξεις):
+    # πλήρης ανάλυση vs plan cache - και έλεγχος ότι το reconstructed είναι ίδιο (parity)
+    from src.syntactic_analysis import syntactic_analysis_pipeline, get_plan_cache
+
+    rng = random.Random(0)
+    words = {'DT': ['the', 'a', 'this'], 'JJ': ['big', 'new', 'old', 'small'], 'NN': ['dog', 'festival', 'house', 'city'],
+             'NNS': ['cats', 'friends', 'papers'], 'PRP': ['he', 'we', 'they'], 'VBD': ['told', 'saw', 'took'],
+             'VB': ['run', 'celebrate', 'write'], 'IN': ['in', 'with', 'about', 'because'], 'RB': ['quickly', 'often'],
+             'MD': ['will', 'can'], ',': [','], 'CC': ['and', 'but'], '.': ['.']}
+    templates = [['DT'] + [rng.choice(list(words)) for _ in range(n_tokens - 2)] + ['.'] for _ in range(n_templates)]
+    sentences = [[(rng.choice(words[tag]), tag) for tag in rng.choice(templates)] for _ in range(n_sentences)]
+
+    cache = get_plan_cache()
+    cache.clear()
+    start = time.perf_counter()
+    expected = [syntactic_analysis_pipeline(pos_tags, False)['reconstructed'] for pos_tags in sentences]
+    t_full = time.perf_counter() - start
+    start = time.perf_counter()
+    cached = [syntactic_analysis_pipeline(pos_tags, False, details=False)['reconstructed'] for pos_tags in sentences]
+    t_cached = time.perf_counter() - start
+
+    stats = cache.stats()
+    mismatches = sum(a != b for a, b in zip(expected, cached))
+    print(f"[plan_cache] {n_sentences} sentences from {n_templates} tag templates")
+    print(f"  full analysis : {t_full:.3f}s")
+    print(f"  plan cache    : {t_cached:.3f}s  (x{t_full / t_cached:.1f}, hit rate {stats['hit_rate']:.1%}, "
+          f"{stats['size']} plans cached)")
+    print(f"  parity        : {mismatches} mismatches")
+
+
+def bench_spelling(sizes=(35, 1_000, 10_000, 50_000, 100_000), n_sentences=2000, regex_limit=1_000):
+    # Χρόνος διόρθωσης ανά λεξικό: ένα re.sub ανά καταχώρηση (παλιά μέθοδος, μέχρι regex_limit καταχωρήσεις)
+    # vs SpellingCorrector (ένα πέρασμα) - το δεύτερο δεν πρέπει να εξαρτάται από το μέγεθος του λεξικού
+    import re
+    import string
+    from src.spelling import SpellingCorrector, DEFAULT_SPELLING_CORRECTIONS
+
+    rng = random.Random(0)
+    sentences = [synthetic_document(120, seed=i) for i in range(n_sentences)]
+    sentences = [sentence.replace("the ", "thier ", 1) for sentence in sentences]
+
+    print(f"[spelling] {n_sentences} sentences")
+    for size in sizes:
+        corrections = dict(DEFAULT_SPELLING_CORRECTIONS)
+        while len(corrections) < size:
+            word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+            corrections[word + 'x'] = word
+
+        start = time.perf_counter()
+        corrector = SpellingCorrector(corrections)
+        t_compile = time.perf_counter() - start
+        t_single, corrected = timed(lambda: [corrector.correct(sentence) for sentence in sentences])
+
+        line = f"  {size:>7} entries: one pass {t_single * 1000:8.1f}ms (compile {t_compile * 1000:.0f}ms)"
+        if size <= regex_limit:
+            patterns = [(re.compile(r'\b' + re.escape(key) + r'\b', re.IGNORECASE), value) for key, value in corrections.items()]
+
+            def per_entry():
+                results = []
+                for sentence in sentences:
+                    for pattern, value in patterns:
+                        sentence = pattern.sub(value.replace('\\', '\\\\'), sentence)
+                    results.append(sentence)
+                return results
+
+            t_regex, expected = timed(per_entry, repeat=1)
+            line += f"   re.sub per entry {t_regex * 1000:8.1f}ms (identical: {expected == corrected})"
+        print(line)
+
+    # Φράση 8 λέξεων με 30 ορθογραφικά λάθη ανά λέξη: 31^8 παραλλαγές - δεν πρέπει να παράγονται στο compile
+    corrections = {f"w{k}x{m}": f"w{k}" for k in range(8) for m in range(30)}
+    corrections[' '.join(f"w{k}" for k in range(8))] = "phrase"
+    start = time.perf_counter()
+    corrector = SpellingCorrector(corrections)
+    t_compile = time.perf_counter() - start
+    corrected = corrector.correct("a w0x3 w1 w2x9 w3 w4x1 w5 w6 w7x29 b")
+    print(f"  8-word phrase with 30 misspellings per word: compile {t_compile * 1000:.1f}ms -> {corrected!r}")
+    assert corrected == "a phrase b", corrected
+    assert t_compile < 1.0, f"phrase variants expanded at compile time ({t_compile:.1f}s)"
+
+
+def bench_symspell(n_words=50_000, n_queries=5_000):
+    # Symmetric delete index: χρόνος build και lookup ανά λέξη σε απόσταση 1 και 2 (χωρίς την LRU cache)
+    # closest: ό,τι χρησιμοποιεί ο corrector (μόνο οι κοντινότερες), all: όλες οι προτάσεις έως απόσταση 2
+    import string
+    from nlp_common.symspell import build_symspell, edit_distance
+
+    rng = random.Random(0)
+    counts = {}
+    while len(counts) < n_words:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        counts[word] = rng.randint(1, 10_000)
+
+    start = time.perf_counter()
+    symspell = build_symspell(counts)
+    print(f"[symspell] {n_words} words, {len(symspell.deletes)} deletes, built in {time.perf_counter() - start:.1f}s")
+
+    vocabulary = list(counts)
+    for distance in (1, 2):
+        queries = []
+        for word in rng.sample(vocabulary, n_queries):
+            for _ in range(distance):
+                i = rng.randrange(len(word))
+                word = word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+            queries.append(word)
+        t_closest, results = timed(lambda: [symspell.lookup(word, closest=True) for word in queries], repeat=1)
+        t_all, _ = timed(lambda: [symspell.lookup(word) for word in queries], repeat=1)
+        found = sum(1 for result in results if result)
+        assert all(edit_distance(word, result[0][0], 2) == result[0][1] for word, result in zip(queries, results) if result)
+        print(f"  distance {distance}: closest {t_closest / n_queries * 1e6:6.1f}us/word, all {t_all / n_queries * 1e6:6.1f}us/word"
+              f"  ({found}/{n_queries} with suggestions)")
+
+
+def bench_symspell_pipeline():
+    # Regression: οι διορθώσεις του SymSpell (Step 1.5) πρέπει να φτάνουν στην έξοδο του
+    # grammatical_correction_pipeline - οι κανόνες του Step 2 ξαναχτίζουν το κείμενο από τα tagged tokens
+    from nlp_common.symspell import build_symspell
+    from src.grammatical_correction import grammatical_correction_pipeline
+
+    symspell = build_symspell({'the': 100, 'dog': 40, 'runs': 20, 'to': 80, 'house': 30})
+    text = "teh dgo runs to housee"
+    without = grammatical_correction_pipeline(text, False)
+    corrected = grammatical_correction_pipeline(text, False, symspell=symspell)
+    print(f"[symspell_pipeline] {text!r}: without {without!r}, with SymSpell {corrected!r}")
+    assert corrected.lower().split() == ['the', 'dog', 'runs', 'to', 'house.'], corrected
+
+
+def bench_retagging(n_sentences=2000):
+    # Step 0.5 του grammatical correction: word_tokenize + tagger σε όλο το reconstructed (full)
+    # vs incremental retagging από το reconstructed_stream του syntactic stage - ποσοστό θέσεων που ξαναυπολογίζονται
+    # και προτάσεις με διαφορετικά tags από το full retag (έξω από το invalidation window κρατιούνται τα αρχικά tags)
+    from src.preprocessing import preprocess_stream, get_tagger
+    from src.syntactic_analysis import syntactic_analysis_pipeline
+    from src.grammatical_correction import retag_reconstructed_text, retag_stream, stream_matches_text
+
+    texts = [synthetic_document(size, seed=i) for i, size in enumerate([80, 160, 240] * (n_sentences // 3))]
+    syntax = []
+    for result in preprocess_stream(texts):
+        syntax.append(syntactic_analysis_pipeline(result['pos_tags'], False, details=False))
+    syntax = [result for result in syntax if result['reconstructed']]
+    tagger = get_tagger()
+
+    t_full, expected = timed(lambda: [retag_reconstructed_text(result['reconstructed']) for result in syntax], repeat=1)
+
+    def incremental():
+        tagged = []
+        for result in syntax:
+            stream = result['reconstructed_stream']
+            if stream_matches_text(stream, result['reconstructed']):
+                tagged.append(retag_stream(stream, tagger))
+            else:
+                tagged.append((retag_reconstructed_text(result['reconstructed']), None))
+        return tagged
+
+    t_incremental, tagged = timed(incremental, repeat=1)
+    fallbacks = sum(1 for _, retagged in tagged if retagged is None)
+    positions = sum(len(pos_tags) for pos_tags, retagged in tagged if retagged is not None)
+    retagged = sum(retagged for _, retagged in tagged if retagged is not None)
+    mismatches = sum(a != b for a, (b, _) in zip(expected, tagged))
+    print(f"[retagging] {len(syntax)} reconstructed sentences")
+    print(f"  full retag  : {t_full * 1000:8.1f}ms")
+    print(f"  incremental : {t_incremental * 1000:8.1f}ms  (x{t_full / t_incremental:.1f}, "
+          f"{retagged}/{positions} positions retagged ({retagged / positions if positions else 0.0:.1%}), "
+          f"{fallbacks} full fallbacks)")
+    print(f"  parity      : {mismatches}/{len(syntax)} sentences differ from the full retag")
+
+
+def _reference_post_processing():
+    # Οι αλυσίδες re.sub που αντικατέστησε το nlp_common/postprocessing.py (μία ανά profile), για parity
+    import re
+
+    def grammar(text):
+        if not text:
+            return text
+        text = re.sub(r'\s+', ' ', text.strip())
+        text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+        text = re.sub(r'([.,!?;:])([A-Za-z])', r'\1 \2', text)
+        if text: text = text[0].upper() + text[1:] if len(text) > 1 else text.upper()
+        if text and text[-1] not in '.!?': text += '.'
+        text = re.sub(r'\.{2,}', '.', text)
+        text = re.sub(r'!{2,}', '!', text)
+        text = re.sub(r'\?{2,}', '?', text)
+        return re.sub(r'\s+([.,!?])', r'\1', text)
+
+    def syntactic(text):
+        text = re.sub(r'\s+([.,!?])', r'\1', text)
+        text = re.sub(r'\s+', ' ', text).strip()
+        if text: text = text[0].upper() + text[1:]
+        if text and text[-1] not in '.!?': text += '.'
+        return text
+
+    def textblob(text):
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+        text = re.sub(r'([.,!?;:])\s*', r'\1 ', text)
+        text = re.sub(r'([.,!?;:])\1+', r'\1', text)
+        text = text.strip()
+        if text and text[-1] not in '.!?': text += '.'
+        return text
+
+    def transformer(text):
+        text = text.strip()
+        if text: text = text[0].upper() + text[1:]
+        text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+        text = re.sub(r'([.,!?;:])\s*', r'\1 ', text)
+        text = re.sub(r'([.,!?;:])\1+', r'\1', text)
+        if text and text[-1] not in '.!?': text += '.'
+        return re.sub(r'\s+', ' ', text).strip()
+
+    return {'grammar': grammar, 'syntactic': syntactic, 'textblob': textblob, 'transformer': transformer}
+
+
+def bench_postprocessing(size_mb=4, n_fuzz=50_000):
+    # Κοινό post-processing: parity με τις παλιές αλυσίδες re.sub (fuzz με στίξη/κενά) και throughput σε μεγάλα κείμενα
+    from nlp_common.postprocessing import postprocess, PROFILES
+
+    references = _reference_post_processing()
+    rng = random.Random(0)
+    alphabet = list('abAB1é .,!?;:\t\n') + ['  ', 'word', ' ']
+    for _ in range(n_fuzz):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+        for name in PROFILES:
+            assert postprocess(text, name) == references[name](text), (name, text)
+
+    words = synthetic_document(size_mb * 1024 * 1024).split()
+    separators = [' '] * 12 + ['  ', '\n', ' , ', ', ', '. ', ' ; ', '!! ', '\t']
+    document = ''.join(word + rng.choice(separators) for word in words)
+    print(f"[postprocessing] {size_mb} MB document, {n_fuzz} fuzzed strings per profile (parity ok)")
+    for name in PROFILES:
+        t_old, expected = timed(references[name], document)
+        t_new, formatted = timed(postprocess, document, name)
+        assert formatted == expected, name
+        print(f"  {name:<12}: re.sub chain {t_old:.3f}s, one pass {t_new:.3f}s  (x{t_old / t_new:.1f}, "
+              f"{size_mb / t_new:.1f} MB/s)")
+
+
+def _reference_surface_rules(tokens):
+    # Ο παλιός βρόχος των κανόνων 1-7 του apply_surface_grammar_rules (για parity)
+    adjectives = ['JJ', 'JJR', 'JJS']
+    cleaned_tokens = []
+    i = 0
+    while i < len(tokens):
+        word, pos = tokens[i]
+        if pos == 'DT' and i + 1 < len(tokens):
+            next_word, next_pos = tokens[i + 1]
+            if next_pos == 'DT' and word.lower() == next_word.lower():
+                i += 1
+                continue
+        if pos in adjectives and i == len(tokens) - 1:
+            i += 1
+            continue
+        if i + 1 < len(tokens):
+            next_word, _ = tokens[i + 1]
+            if word.lower() == next_word.lower():
+                cleaned_tokens.append(word)
+                i += 2
+                continue
+        if pos == 'DT' and i == len(tokens) - 1:
+            i += 1
+            continue
+        if pos in adjectives:
+            adj_count = 1
+            j = i + 1
+            while j < len(tokens) and tokens[j][1] in adjectives:
+                adj_count += 1
+                j += 1
+            if adj_count > 3:
+                i += adj_count - 2
+                continue
+        if pos == 'IN' and i == len(tokens) - 1:
+            i += 1
+            continue
+        if pos == 'IN' and i + 1 < len(tokens):
+            next_word, next_pos = tokens[i + 1]
+            if next_pos == 'IN':
+                cleaned_tokens.append(word)
+                i += 2
+                continue
+        cleaned_tokens.append(word)
+        i += 1
+    return cleaned_tokens
+
+
+def bench_grammar_rules(n_sentences=20_000, chain_lengths=(1_000, 2_000, 4_000, 8_000)):
+    # Κανόνες του apply_surface_grammar_rules: parity με τον παλιό βρόχο, χρόνος σε συνθετικές προτάσεις,
+    # κλιμάκωση σε μακριές ακολουθίες επιθέτων και μετρητές / χρόνος ανά κανόνα (timed=True)
+    from src.grammar_rules import RuleEngine, format_rule_stats
+
+    rng = random.Random(0)
+    lexicon = [('the', 'DT'), ('The', 'DT'), ('a', 'DT'), ('big', 'JJ'), ('bigger', 'JJR'), ('new', 'JJ'),
+               ('dog', 'NN'), ('dogs', 'NNS'), ('in', 'IN'), ('with', 'IN'), ('ran', 'VBD'), ('he', 'PRP')]
+    sentences = [[rng.choice(lexicon) for _ in range(rng.randint(1, 25))] for _ in range(n_sentences)]
+
+    engine = RuleEngine()
+    for sentence in sentences:
+        assert engine.apply(sentence) == _reference_surface_rules(sentence), sentence
+
+    tagged = synthetic_pos_tags(n_sentences)
+    for sentence in tagged:
+        assert engine.apply(sentence) == _reference_surface_rules(sentence), sentence
+
+    print(f"[grammar_rules] {n_sentences} sentences (parity ok)")
+    for label, batch in (("random tokens", sentences), ("synthetic tags", tagged)):
+        t_old, _ = timed(lambda: [_reference_surface_rules(sentence) for sentence in batch], repeat=5)
+        t_new, _ = timed(lambda: [engine.apply(sentence) for sentence in batch], repeat=5)
+        print(f"  {label:<15}: old loop {t_old:.3f}s, rule table {t_new:.3f}s  (x{t_old / t_new:.2f})")
+
+    adjectives = [('big', 'JJ'), ('new', 'JJ'), ('red', 'JJ'), ('older', 'JJR')]
+    for length in chain_lengths:
+        chain = [('the', 'DT')] + [adjectives[k % len(adjectives)] for k in range(length)] + [('dog', 'NN')]
+        t_old, expected = timed(_reference_surface_rules, chain, repeat=1)
+        t_new, cleaned = timed(engine.apply, chain, repeat=1)
+        assert cleaned == expected
+        print(f"  {length:>6} adjectives: old {t_old * 1000:8.1f}ms, rule table {t_new * 1000:6.2f}ms")
+
+    profiled = RuleEngine(timed=True)
+    for sentence in sentences:
+        profiled.apply(sentence)
+    print(format_rule_stats(profiled.stats()))
+
+
+def bench_result_cache(n_sentences=5000, chunk_size=64):
+    # Result cache: syntactic stage ανά chunk χωρίς cache, με άδεια cache (compute + εγγραφή) και με γεμάτη
+    # (μόνο lookups) - το syntactic stage δεν χρειάζεται NLTK. Parity: ίδια αποτελέσματα και στις τρεις περιπτώσεις
+    import tempfile
+    from src.pattern_scan import syntactic_analysis_batch
+    from src.result_cache import ResultCache, cached_batch
+
+    sentences = synthetic_pos_tags(n_sentences)
+    chunks = [sentences[k:k + chunk_size] for k in range(0, len(sentences), chunk_size)]
+
+    def compute(batch):
+        return syntactic_analysis_batch(batch, details=False)
+
+    def run(cache):
+        return [result for chunk in chunks for result in cached_batch(cache, 'syntactic', chunk, compute)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(os.path.join(directory, "results.sqlite"))
+        t_plain, expected = timed(run, None, repeat=1)
+        t_cold, cold = timed(run, cache, repeat=1)
+        t_warm, warm = timed(run, cache, repeat=3)
+        assert cold == expected and warm == expected
+        stats = cache.stats()
+        cache.close()
+
+    print(f"[result_cache] {n_sentences} sentences, syntactic stage, chunks of {chunk_size}")
+    print(f"  no cache    : {t_plain:.3f}s")
+    print(f"  cold cache  : {t_cold:.3f}s  (compute + write)")
+    print(f"  warm cache  : {t_warm:.3f}s  (x{t_plain / t_warm:.1f} vs no cache)")
+    print(f"  {stats['stages']['syntactic']['entries']} entries, {stats['bytes'] / 1e6:.2f} MB")
+
+
+def bench_correction_cache(n_sentences=300):
+    # Result cache του correction stage: το ίδιο reconstructed κείμενο από άλλο token stream (άλλη αρχική πρόταση)
+    # μπορεί να δώσει άλλη διόρθωση, αφού το incremental retagging κρατάει tags της αρχικής πρότασης. Για κάθε
+    # πρόταση προστίθεται το ίδιο reconstructed με αρχική πρόταση τα tokens του αντίστροφα - με cache (και με
+    # αντίστροφη σειρά εγγραφών) τα αποτελέσματα πρέπει να είναι ίδια με χωρίς cache
+    import tempfile
+    from src.preprocessing import preprocess_stream, get_tagger
+    from src.syntactic_analysis import syntactic_analysis_pipeline
+    from src.grammatical_correction import grammatical_correction_pipeline
+    from src.result_cache import ResultCache, cached_batch, correction_payload
+
+    # Λέξεις που ενεργοποιούν τους γραμματικούς κανόνες (προσδιοριστές, επίθετα, προθέσεις), ώστε τα tags να
+    # αλλάζουν τη διόρθωση
+    rng = random.Random(0)
+    words = ['the', 'a', 'big', 'new', 'red', 'old', 'dog', 'park', 'ran', 'saw', 'in', 'with', 'to', 'he', 'fast']
+    texts = [' '.join(rng.choice(words) for _ in range(rng.randint(20, 40))) for _ in range(n_sentences)]
+    tagger = get_tagger()
+    records = []
+    for result in preprocess_stream(texts):
+        syntax = syntactic_analysis_pipeline(result['pos_tags'], False, details=False)
+        if not syntax['reconstructed']:
+            continue
+        stream = syntax['reconstructed_stream']
+        moved = [k for k, origin in enumerate(stream['origins']) if origin is not None]
+        source_tokens = [stream['tokens'][k] for k in reversed(moved)]
+        origins = list(stream['origins'])
+        for position, k in enumerate(reversed(moved)):
+            origins[k] = position
+        records.append(syntax)
+        records.append({'reconstructed': syntax['reconstructed'], 'reconstructed_stream': {
+            'tokens': stream['tokens'], 'origins': origins, 'source_tokens': source_tokens,
+            'source_tags': [tag for _, tag in tagger.tag(source_tokens)],
+        }})
+
+    def compute(batch):
+        return [grammatical_correction_pipeline(record['reconstructed'], False, stream=record['reconstructed_stream'])
+                for record in batch]
+
+    expected = compute(records)
+    differing = sum(expected[k] != expected[k + 1] for k in range(0, len(records), 2))
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(os.path.join(directory, "results.sqlite"))
+        cold = cached_batch(cache, 'correction', records, compute, key=correction_payload)
+        warm = cached_batch(cache, 'correction', records, compute, key=correction_payload)
+        reverse_cache = ResultCache(os.path.join(directory, "reverse.sqlite"))
+        reverse = cached_batch(reverse_cache, 'correction', records[::-1], compute, key=correction_payload)[::-1]
+    print(f"[correction_cache] {len(records) // 2} reconstructed texts x 2 token streams, "
+          f"{differing} with a different correction per stream")
+    assert cold == expected, "cold cache differs from uncached corrections"
+    assert warm == expected, "warm cache differs from uncached corrections"
+    assert reverse == expected, "cache filled in reverse order differs from uncached corrections"
+    print("  cached == uncached (cold, warm, reverse order)")
+
+
+def bench_startup(repeat=5, budget_ms=STARTUP_BUDGET_MS):
+    # Χρόνος εκκίνησης του main.py (import του main, πριν τρέξει οτιδήποτε) - αποτυγχάνει αν κάποιο από τα
+    # LAZY_MODULES φορτώνεται στην εκκίνηση ή αν ξεπεραστεί το budget (guard για regressions)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    profiles = [import_profile('main', cwd) for _ in range(repeat)]
+    startup_ms = min(profile['main'][1] for profile in profiles) / 1000
+    profile = profiles[-1]
+    eager = sorted(name for name in LAZY_MODULES if name in profile)
+
+    print(f"[startup] import main: {startup_ms:.1f}ms (best of {repeat}, budget {budget_ms}ms)")
+    for name, (self_us, cumulative_us) in sorted(profile.items(), key=lambda item: -item[1][0])[:5]:
+        print(f"  {name:<40} self {self_us / 1000:6.1f}ms  cumulative {cumulative_us / 1000:6.1f}ms")
+    assert not eager, f"heavy modules imported at startup: {eager}"
+    assert startup_ms <= budget_ms, f"startup {startup_ms:.1f}ms over budget ({budget_ms}ms)"
+
+
+def bench_server(n_clients=16, requests_per_client=50):
+    # Τοπικός server: ταυτόχρονοι clients με ένα κείμενο ανά request, χωρίς micro-batching (max_batch=1) και με
+    # batches (τα κείμενα που φτάνουν μέσα σε λίγα ms γίνονται tag μαζί) - throughput και latency percentiles.
+    # Στο τέλος ουρά 4 θέσεων: τα requests που περισσεύουν παίρνουν 503 αντί να μεγαλώνει η αναμονή
+    import json
+    import threading
+    import urllib.error
+    import urllib.request
+    from src.preprocessing import warm_up
+    from src.server import MicroBatcher, PipelineServer, format_server_stats, DEFAULT_BATCH_WAIT_MS
+
+    texts = load_sample_sentences()[:-1]
+    warm_up()
+
+    def run(max_batch, batch_wait_ms, max_queue=256):
+        batcher = MicroBatcher(max_batch=max_batch, batch_wait_ms=batch_wait_ms, max_queue=max_queue)
+        batcher.start()
+        server = PipelineServer(("127.0.0.1", 0), batcher)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/process"
+        statuses = []
+
+        def client(k):
+            for j in range(requests_per_client):
+                body = json.dumps({'text': texts[(k + j) % len(texts)]}).encode('utf-8')
+                try:
+                    with urllib.request.urlopen(urllib.request.Request(url, body)) as response:
+                        statuses.append(response.status)
+                except urllib.error.HTTPError as e:
+                    statuses.append(e.code)
+
+        clients = [threading.Thread(target=client, args=(k,)) for k in range(n_clients)]
+        start = time.perf_counter()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+        return elapsed, statuses, batcher.stats()
+
+    print(f"[server] {n_clients} clients x {requests_per_client} requests, one text per request")
+    for label, max_batch, batch_wait_ms, max_queue in (
+        ("no batching", 1, 0.0, 256),
+        (f"micro-batches ({DEFAULT_BATCH_WAIT_MS:g}ms)", 64, DEFAULT_BATCH_WAIT_MS, 256),
+        ("queue of 4", 64, DEFAULT_BATCH_WAIT_MS, 4),
+    ):
+        elapsed, statuses, stats = run(max_batch, batch_wait_ms, max_queue)
+        served = statuses.count(200)
+        print(f"  {label}: {served / elapsed:.0f} req/s, {statuses.count(503)} rejected (503)")
+        print("    " + format_server_stats(stats).replace("\n", "\n    "))
+        assert served + statuses.count(503) == len(statuses)
+
+
+def bench_server_errors():
+    # Σφάλματα στον server (χωρίς NLTK - ψεύτικο process): ένα κακό κείμενο δεν ρίχνει όλο το micro-batch,
+    # λάθος Content-Length -> 400, request με περισσότερα από max_batch κείμενα -> 413, και ένα request που πήρε
+    # 504 δεν υπολογίζεται αφού φτάσει η σειρά του
+    import http.client
+    import json
+    import threading
+    from src.server import MicroBatcher, PipelineServer, _Request
+
+    def process(texts):
+        if "boom" in texts:
+            raise ValueError("boom")
+        return [{'original': text, 'corrected': text.upper()} for text in texts]
+
+    batcher = MicroBatcher(process=process, max_batch=8, batch_wait_ms=0.0)
+    requests = [_Request(["good one"]), _Request(["boom"]), _Request(["good two", "good three"])]
+    batcher._process(requests)
+    assert [record.get('corrected') for record in requests[0].results + requests[2].results] == \
+        ["GOOD ONE", "GOOD TWO", "GOOD THREE"], "a failing request took the rest of the batch with it"
+    assert 'error' in requests[1].results[0]
+
+    seen = []
+    batcher.process = lambda texts: seen.extend(texts) or process(texts)
+    late = _Request(["late"])
+    late.abandoned = True
+    batcher._process([late, _Request(["on time"])])
+    assert seen == ["on time"], f"abandoned request was processed: {seen}"
+    stats = batcher.stats()
+    print(f"[server_errors] {stats['failed_batches']} failed batches, {stats['failed_requests']} failed requests, "
+          f"{stats['abandoned']} abandoned")
+
+    batcher.start()
+    server = PipelineServer(("127.0.0.1", 0), batcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        statuses = []
+        for length in ("abc", "-1"):
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+            connection.putrequest("POST", "/process")
+            connection.putheader("Content-Length", length)
+            connection.endheaders()
+            statuses.append(connection.getresponse().status)
+            connection.close()
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        connection.request("POST", "/process", json.dumps({'texts': ["many"] * (batcher.max_batch + 1)}))
+        statuses.append(connection.getresponse().status)
+        connection.close()
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        connection.request("POST", "/process", json.dumps({'text': "fine"}))
+        response = connection.getresponse()
+        statuses.append(response.status)
+        assert json.loads(response.read())['results'][0]['corrected'] == "FINE"
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+    print(f"  bad Content-Length -> {statuses[0]}, {statuses[1]}; {batcher.max_batch + 1} texts -> {statuses[2]}; "
+          f"valid request -> {statuses[3]}")
+    assert statuses == [400, 400, 413, 200], statuses
+
+
+_COLD_START = """
+import sys, time
+start = time.perf_counter()
+if sys.argv[1] == 'nltk':
+    from nltk.tag import PerceptronTagger
+    from nltk.stem import WordNetLemmatizer
+    tagger, lemmatizer = PerceptronTagger(), WordNetLemmatizer()
+else:
+    from src.nltk_snapshot import NLTKSnapshot
+    snapshot = NLTKSnapshot(sys.argv[2])
+    tagger, lemmatizer = snapshot.tagger(), snapshot.lemmatizer()
+tagger.tag("the quick brown foxes were jumping".split())
+lemmatizer.lemmatize("foxes", "n")
+print(time.perf_counter() - start)
+"""
+
+
+def bench_nltk_snapshot(n_sentences=2000, repeat=3):
+    # Binary snapshot των NLTK resources: cold start (νέο process μέχρι το πρώτο tag + lemmatize) με το NLTK και
+    # με το snapshot, parity (ίδια tags και lemmas) και throughput του tagging
+    import tempfile
+    from nltk.tag import PerceptronTagger
+    from nltk.stem import WordNetLemmatizer
+    from src.nltk_snapshot import build_snapshot, NLTKSnapshot
+    from src.preprocessing import normalize_text, tokenize_text, get_wordnet_pos
+
+    sentences = load_sample_sentences()[:-1]
+    sentences += [synthetic_document(200, seed=k) for k in range(n_sentences)]
+    token_lists = [tokenize_text(normalize_text(sentence)) for sentence in sentences]
+    token_lists += [sentence.split() for sentence in sentences[:50]]  # με κεφαλαία και στίξη
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "nltk_snapshot.bin")
+        t_build, _ = timed(build_snapshot, path, repeat=1)
+        cwd = os.path.dirname(os.path.abspath(__file__))
+
+        def cold_start(kind):
+            output = subprocess.run([sys.executable, '-c', _COLD_START, kind, path], cwd=cwd,
+                                    capture_output=True, text=True, check=True).stdout
+            return float(output)
+
+        t_cold_nltk = min(cold_start('nltk') for _ in range(repeat))
+        t_cold_snapshot = min(cold_start('snapshot') for _ in range(repeat))
+
+        snapshot = NLTKSnapshot(path)
+        tagger, lemmatizer = PerceptronTagger(), WordNetLemmatizer()
+        snapshot_tagger, snapshot_lemmatizer = snapshot.tagger(), snapshot.lemmatizer()
+        t_nltk, expected = timed(tagger.tag_sents, token_lists, repeat=1)
+        t_first, tagged = timed(snapshot_tagger.tag_sents, token_lists, repeat=1)
+        t_warm, tagged = timed(snapshot_tagger.tag_sents, token_lists, repeat=1)
+        assert tagged == expected
+        pairs = {(word, get_wordnet_pos(tag)) for sentence in expected for word, tag in sentence}
+        for word, pos in pairs:
+            assert snapshot_lemmatizer.lemmatize(word, pos) == lemmatizer.lemmatize(word, pos), (word, pos)
+        stats = snapshot.stats()
+
+    n_tokens = sum(map(len, token_lists))
+    print(f"[nltk_snapshot] {stats['bytes'] / 1e6:.1f} MB, built in {t_build:.1f}s, entries {stats['entries']}")
+    print(f"  cold start (new process -> first tag + lemma): NLTK {t_cold_nltk * 1000:.0f}ms, "
+          f"snapshot {t_cold_snapshot * 1000:.1f}ms (x{t_cold_nltk / t_cold_snapshot:.0f})")
+    print(f"  tagging {n_tokens} tokens: NLTK {t_nltk:.3f}s, snapshot {t_first:.3f}s (first pass), {t_warm:.3f}s (warm)")
+    print(f"  parity: {len(token_lists)} sentences and {len(pairs)} (word, pos) lemmas identical")
+
+
+def bench_batch_tagger(n_sentences=2000, batch_sizes=(1, 16, 256)):
+    # Tagger engine 'numpy' (nlp_common/batch_tagger.py) vs ο PerceptronTagger του NLTK (ό,τι τρέχει το nltk.pos_tag):
+    # ποσοστό ίδιων tags (guard: BATCH_TAGGER_MIN_AGREEMENT) και throughput ανά μέγεθος batch
+    from nltk.tag import PerceptronTagger
+    from nlp_common.batch_tagger import BatchTagger
+    from src.preprocessing import normalize_text, tokenize_text
+
+    sentences = load_sample_sentences()[:-1]
+    sentences += [synthetic_document(200, seed=k) for k in range(n_sentences)]
+    token_lists = [tokenize_text(normalize_text(sentence)) for sentence in sentences]
+    token_lists += [tokenize_text(sentence) for sentence in sentences[:200]]  # με κεφαλαία και στίξη
+
+    tagger = PerceptronTagger()
+    t_load, batch_tagger = timed(BatchTagger, tagger, repeat=1)
+    t_nltk, expected = timed(lambda: [tagger.tag(tokens) for tokens in token_lists], repeat=1)
+    tagged = batch_tagger.tag_sents(token_lists)
+    n_tokens = sum(map(len, token_lists))
+    agreement = sum(a == b for sentence_a, sentence_b in zip(expected, tagged)
+                    for a, b in zip(sentence_a, sentence_b)) / n_tokens
+
+    print(f"[batch_tagger] {len(token_lists)} sentences, {n_tokens} tokens (loaded in {t_load:.2f}s)")
+    print(f"  agreement with pos_tag: {agreement:.4%} (min {BATCH_TAGGER_MIN_AGREEMENT:.1%})")
+    print(f"  nltk (per sentence) : {n_tokens / t_nltk:10.0f} tokens/s")
+    for batch_size in batch_sizes:
+        batch_tagger.batch_sentences = batch_size
+        t_batch, _ = timed(batch_tagger.tag_sents, token_lists)
+        print(f"  numpy batch {batch_size:<7} : {n_tokens / t_batch:10.0f} tokens/s (x{t_nltk / t_batch:.1f})")
+    assert agreement >= BATCH_TAGGER_MIN_AGREEMENT, f"agreement {agreement:.4%} under {BATCH_TAGGER_MIN_AGREEMENT:.1%}"
+
+
+BENCHMARKS = {
+    'normalization': bench_normalization,
+    'preprocess_memory': bench_preprocess_memory,
+    'parallel_scaling': bench_parallel_scaling,
+    'tagged_memory': bench_tagged_memory,
+    'analysis_scans': bench_analysis_scans,
+    'span_scaling': bench_span_scaling,
+    'fix_scaling': bench_fix_scaling,
+    'pattern_scan': bench_pattern_scan,
+    'leading_conjunction': bench_leading_conjunction,
+    'plan_cache': bench_plan_cache,
+    'spelling': bench_spelling,
+    'symspell': bench_symspell,
+    'symspell_pipeline': bench_symspell_pipeline,
+    'retagging': bench_retagging,
+    'postprocessing': bench_postprocessing,
+    'grammar_rules': bench_grammar_rules,
+    'result_cache': bench_result_cache,
+    'correction_cache': bench_correction_cache,
+    'startup': bench_startup,
+    'server': bench_server,
+    'server_errors': bench_server_errors,
+    'nltk_snapshot': bench_nltk_snapshot,
+    'batch_tagger': bench_batch_tagger,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[name]()
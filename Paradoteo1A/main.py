@@ -3,9 +3,14 @@
 
 import os
 import sys
-from src.preprocessing import preprocess_pipeline
+import json
+import argparse
+from collections import deque
+from src.preprocessing import preprocess_pipeline, set_tagger_engine, TAGGER_ENGINES, DEFAULT_TAGGER_ENGINE
 from src.syntactic_analysis import syntactic_analysis_pipeline
 from src.grammatical_correction import grammatical_correction_pipeline
+# Τα modules των υπόλοιπων modes (corpus runners, result cache, checkpoint, server) γίνονται import μέσα στο mode
+# που τα χρησιμοποιεί: το demo δεν φορτώνει concurrent.futures / multiprocessing, sqlite3 και http.server
 
 # Paths
 BASE_DIR = "data"
@@ -29,6 +34,129 @@ def load_sentence_from_file(filepath):
         sentence = f.read().strip()
     return sentence
 
+def load_corpus_records(filepath, sources, resume_after=None):
+    # Streaming ανάγνωση του corpus (memory-mapped, text ή JSONL, ή φάκελος με αρχεία) - επιστρέφει μόνο τα κείμενα
+    # και κρατάει (id, path, line, offset, error) κάθε εγγραφής στο sources ώστε μια αποτυχία να εντοπίζεται στο αρχείο
+    # Μια εγγραφή που δεν διαβάζεται (π.χ. λάθος JSON) δεν σταματάει το run: μπαίνει μόνο στο sources με το error
+    # της και δεν περνάει από το pipeline (βλ. run_corpus_1a)
+    # resume_after: συνέχεια μετά από αυτή την εγγραφή (βλ. nlp_common/checkpoint.py)
+    from nlp_common.readers import iter_path_records
+    for record in iter_path_records(filepath, errors='keep', resume_after=resume_after):
+        sources.append((record.id, record.path, record.line, record.offset, record.error))
+        if record.error is None:
+            yield record.text
+
+# ============================== CORPUS EXECUTION FUNCTION ==============================
+
+OUTPUT_FORMATS = ('jsonl', 'text')
+
+
+def given(**options):
+    # Μόνο τα options που δόθηκαν (όχι None): τα υπόλοιπα παίρνουν τα defaults του module που τα χρησιμοποιεί, ώστε
+    # το main να μη χρειάζεται τα modules των modes για τα defaults του CLI
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def format_corpus_record(record, record_id, output_format):
+    # Μία γραμμή εξόδου ανά εγγραφή: JSON object (jsonl) ή μόνο η διορθωμένη πρόταση (text, κενή γραμμή σε λάθος)
+    if output_format == 'text':
+        return record.get('corrected', '')
+    if 'error' in record:
+        result = {'id': record_id, 'original': record['original'], 'error': record['error']}
+    else:
+        result = {
+            'id': record_id,
+            'original': record['original'],
+            'reconstructed': record['reconstructed'],
+            'corrected': record['corrected'],
+            'problems_fixed': record['problems_fixed'],
+        }
+    return json.dumps(result, ensure_ascii=False)
+
+
+def run_corpus_1a(input_path, workers, chunk_size=None, stage_workers=None, queue_size=None,
+                  output=None, output_format='jsonl', cache_path=None, cache_max_bytes=None,
+                  checkpoint_every=None, resume=False, tagger_engine=DEFAULT_TAGGER_ENGINE):
+    # Εκτέλεση του pipeline σε όλο το corpus χωρίς verbose έξοδο - γράφει μία γραμμή ανά εγγραφή (ίδια σειρά με
+    # την είσοδο) στο output (αρχείο, ή stdout αν None) μόλις ολοκληρωθεί και στο τέλος το throughput στο stderr
+    # input_path: αρχείο text / JSONL ή φάκελος (βλ. nlp_common/readers.iter_path_records)
+    # stage_workers: pipelined mode με ξεχωριστό pool ανά στάδιο αντί για chunks σε process pool
+    # cache_path: result cache ανά στάδιο (src/result_cache.py), None: χωρίς cache
+    # tagger_engine: 'perceptron' (ίδιο με το nltk.pos_tag) ή 'numpy' (vectorized batch tagger, nlp_common/batch_tagger.py)
+    # Με output αρχείο γράφεται και manifest με checkpoints κάθε checkpoint_every εγγραφές (nlp_common/checkpoint.py):
+    # resume=True συνεχίζει ένα run που διακόπηκε στο ίδιο output, χωρίς διπλές γραμμές
+    # chunk_size, queue_size, cache_max_bytes, checkpoint_every: None για τα defaults των αντίστοιχων modules
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format} (available: {OUTPUT_FORMATS})")
+    if resume and not output:
+        raise ValueError("resume needs an output file")
+    writer = None
+    if output:
+        from nlp_common.checkpoint import CheckpointWriter
+        writer = CheckpointWriter(output, input_path, resume=resume, **given(every=checkpoint_every))
+    if writer is not None and writer.resumed_records:
+        print(f"Resuming after {writer.resumed_records} records ({writer.manifest_path})", file=sys.stderr)
+
+    stats = {}
+    sources = deque()  # μία εγγραφή ανά κείμενο σε πτήση - τα αποτελέσματα έρχονται με τη σειρά της εισόδου
+    texts = load_corpus_records(input_path, sources, writer.resume_after if writer else None)
+    if stage_workers:
+        from src.staged_runner import run_pipelined, format_stage_stats
+        records = run_pipelined(texts, stage_workers=stage_workers, stats=stats, cache_path=cache_path,
+                                tagger_engine=tagger_engine,
+                                **given(queue_size=queue_size, cache_max_bytes=cache_max_bytes))
+        workers = sum(stage_workers)
+    else:
+        from src.corpus_runner import run_corpus
+        records = run_corpus(texts, workers=workers, stats=stats, cache_path=cache_path, tagger_engine=tagger_engine,
+                             **given(chunk_size=chunk_size, cache_max_bytes=cache_max_bytes))
+
+    complete = False
+    failed = 0
+    unreadable = 0
+
+    def emit(record, source):
+        nonlocal failed
+        record_id, path, line, offset, _ = source
+        if 'error' in record:
+            failed += 1
+            print(f"[error] record {record_id} ({path}:{line}, byte {offset}): {record['error']}", file=sys.stderr)
+        formatted = format_corpus_record(record, record_id, output_format)
+        if writer is not None:
+            writer.write(formatted, record_id, path, offset, line)
+        else:
+            sys.stdout.write(formatted + "\n")
+            sys.stdout.flush()  # κάθε αποτέλεσμα γράφεται μόλις ολοκληρωθεί (π.χ. για pipe)
+
+    def emit_unreadable():
+        # Οι εγγραφές που δεν διαβάστηκαν και βρίσκονται πριν από το επόμενο αποτέλεσμα του pipeline, ώστε η έξοδος
+        # να μένει στη σειρά της εισόδου
+        nonlocal unreadable
+        while sources and sources[0][4] is not None:
+            source = sources.popleft()
+            unreadable += 1
+            emit({'original': None, 'error': source[4]}, source)
+
+    try:
+        for record in records:
+            emit_unreadable()
+            emit(record, sources.popleft())
+        emit_unreadable()  # στο τέλος του αρχείου
+        complete = True
+    finally:
+        if writer is not None:
+            writer.close(complete=complete)
+
+    print(
+        f"✓ {stats.get('records', 0)} records in {stats.get('elapsed', 0.0):.2f}s "
+        f"({stats.get('records_per_sec', 0.0):.1f} records/sec, {workers} workers, "
+        f"{failed} failed records ({unreadable} unreadable), {stats.get('failed_chunks', 0)} failed chunks)",
+        file=sys.stderr
+    )
+    if stage_workers:
+        print(format_stage_stats(stats), file=sys.stderr)
+    return stats
+
 # ============================== MAIN EXECUTION FUNCTION ==============================
 
 def run_deliverable_1a():    
@@ -72,7 +200,7 @@ def run_deliverable_1a():
         print("\n" + "▼"*82)
         print("Sentence 1: Grammatical Correction")
         
-        corrected1 = grammatical_correction_pipeline( syntax_results1['reconstructed'], verbose=True )
+        corrected1 = grammatical_correction_pipeline( syntax_results1['reconstructed'], verbose=True, stream=syntax_results1['reconstructed_stream'] )
         
         print("\n" + "="*82)
         print("✓ Sentence 1 Grammatical Correction complete")
@@ -105,7 +233,7 @@ def run_deliverable_1a():
         print("\n" + "▼"*82)
         print("Sentence 2: Grammatical Correction")
         
-        corrected2 = grammatical_correction_pipeline( syntax_results2['reconstructed'], verbose=True )
+        corrected2 = grammatical_correction_pipeline( syntax_results2['reconstructed'], verbose=True, stream=syntax_results2['reconstructed_stream'] )
         
         print("\n" + "="*82)
         print("✓ Sentence 2: Grammatical Correction complete")
@@ -154,9 +282,58 @@ def run_deliverable_1a():
         traceback.print_exc()
         sys.exit(1)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="NLP Assignment 2025 - Deliverable 1A")
+    parser.add_argument("--input", help="corpus: μία πρόταση ανά γραμμή, JSONL με πεδίο 'text' ή φάκελος με αρχεία (χωρίς --input τρέχει το demo με sentence1/sentence2)")
+    parser.add_argument("--output", help="αρχείο εξόδου για το corpus mode (default: stdout)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default='jsonl', help="jsonl: ένα JSON αποτέλεσμα ανά γραμμή, text: μόνο η διορθωμένη πρόταση")
+    parser.add_argument("--workers", type=int, default=1, help="αριθμός worker processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, help="προτάσεις ανά chunk για κάθε worker (default: DEFAULT_CHUNK_SIZE του src/corpus_runner.py)")
+    parser.add_argument("--stage-workers", help="pipelined mode: workers ανά στάδιο preprocess,syntactic,correction (π.χ. 4,1,8)")
+    parser.add_argument("--cache", nargs='?', const=True, help="result cache (SQLite) ανά στάδιο - χωρίς τιμή: DEFAULT_RESULT_CACHE του src/result_cache.py")
+    parser.add_argument("--cache-max-mb", type=float, help="όριο μεγέθους της result cache σε MB, με eviction των λιγότερο πρόσφατων (default: DEFAULT_MAX_BYTES του src/result_cache.py)")
+    parser.add_argument("--checkpoint-every", type=int, help="checkpoint στο <output>.ckpt κάθε τόσες εγγραφές, corpus mode με --output (default: DEFAULT_CHECKPOINT_EVERY του nlp_common/checkpoint.py)")
+    parser.add_argument("--resume", action="store_true", help="συνέχεια ενός run που διακόπηκε, στο ίδιο --output")
+    parser.add_argument("--queue-size", type=int, help="μέγεθος ουράς ανάμεσα στα στάδια, pipelined mode (default: DEFAULT_QUEUE_SIZE του src/staged_runner.py)")
+    parser.add_argument("--serve", action="store_true", help="τοπικός HTTP server με warm resources (POST /process, GET /stats) - το --chunk-size είναι το μέγιστο batch και το μέγιστο πλήθος κειμένων ανά request")
+    parser.add_argument("--host", help="διεύθυνση του server (default: μόνο localhost)")
+    parser.add_argument("--port", type=int, help="port του server (default: DEFAULT_PORT του src/server.py)")
+    parser.add_argument("--batch-wait-ms", type=float, help="πόσο περιμένει ο server για να γεμίσει ένα batch (default: DEFAULT_BATCH_WAIT_MS του src/server.py)")
+    parser.add_argument("--max-queue", type=int, help="requests σε αναμονή πριν ο server απαντά 503 (default: DEFAULT_MAX_QUEUE του src/server.py)")
+    parser.add_argument("--tagger", choices=TAGGER_ENGINES, default=DEFAULT_TAGGER_ENGINE, help="POS tagger engine: perceptron (ίδιο με το nltk.pos_tag) ή numpy (vectorized tagging ανά batch, >= 99.9%% ίδια tags)")
+    args = parser.parse_args()
+    if args.serve and args.input:
+        parser.error("--serve and --input are separate modes")
+    if args.resume and not (args.input and args.output):
+        parser.error("--resume needs --input and --output")
+    if args.stage_workers:
+        try:
+            args.stage_workers = tuple(int(n) for n in args.stage_workers.split(','))
+        except ValueError:
+            parser.error("--stage-workers expects comma-separated integers, e.g. 4,1,8")
+    if args.cache is True:
+        # --cache χωρίς τιμή - το result_cache (sqlite3) φορτώνεται μόνο όταν ζητηθεί cache
+        from src.result_cache import DEFAULT_RESULT_CACHE
+        args.cache = DEFAULT_RESULT_CACHE
+    return args
+
 # Σημείο εκκίνησης του προγράμματος
 if __name__ == "__main__":
-    results = run_deliverable_1a()
+    args = parse_args()
+    cache_max_bytes = int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb is not None else None
+    if args.serve:
+        from src.server import serve
+        serve(cache_path=args.cache, tagger_engine=args.tagger,
+              **given(host=args.host, port=args.port, max_batch=args.chunk_size, batch_wait_ms=args.batch_wait_ms,
+                      max_queue=args.max_queue, cache_max_bytes=cache_max_bytes))
+    elif args.input:
+        run_corpus_1a(args.input, args.workers, args.chunk_size, args.stage_workers, args.queue_size,
+                      output=args.output, output_format=args.output_format,
+                      cache_path=args.cache, cache_max_bytes=cache_max_bytes,
+                      checkpoint_every=args.checkpoint_every, resume=args.resume, tagger_engine=args.tagger)
+    else:
+        set_tagger_engine(args.tagger)
+        results = run_deliverable_1a()
     
     # Optional: Save results for next steps
     # You can access:
@@ -40,6 +40,15 @@ def download_nltk_data():
         except Exception as e:
             print(f"❌ Error: {e}")
     
+    # Binary snapshot (tagger + WordNet morphology) για γρήγορο cold start - βλ. src/nltk_snapshot.py
+    print("📦 Binary snapshot (data/nltk_snapshot.bin)...", end=" ")
+    try:
+        from src.nltk_snapshot import build_snapshot
+        build_snapshot()
+        print("✓")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    
     print("\n" + "="*60)
     print("✓ NLTK setup complete!")
     print("="*60 + "\n")
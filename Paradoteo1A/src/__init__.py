@@ -1 +1,9 @@
-#NLP Assignment 2025 - source package
\ No newline at end of file
+#NLP Assignment 2025 - source package
+# Τα modules που μοιράζονται τα δύο παραδοτέα (readers, checkpoint, symspell, postprocessing, batch_tagger)
+# είναι στο κοινό package nlp_common, στον φάκελο του repo: προστίθεται εδώ στο sys.path
+import os
+import sys
+
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_DIR not in sys.path:
+    sys.path.append(_REPO_DIR)
@@ -0,0 +1,216 @@
+# Εκτέλεση ολόκληρου του Deliverable 1A (preprocessing → syntactic reconstruction → grammatical correction)
+# πάνω σε corpus από προτάσεις, σειριακά ή με process pool σε πολλούς πυρήνες.
+# Το corpus χωρίζεται σε chunks, κάθε worker φορτώνει τα NLTK resources μία φορά (initializer)
+# και τα αποτελέσματα επιστρέφονται με τη σειρά της εισόδου.
+# Αν ένας worker καταρρεύσει, αποτυγχάνει μόνο το δικό του chunk και όχι όλο το run.
+# Με cache_path τα αποτελέσματα κάθε σταδίου διαβάζονται / γράφονται στη result cache (src/result_cache.py).
+
+import os
+import time
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from .preprocessing import preprocess_stream, warm_up, set_tagger_engine, tagger_cache_config, DEFAULT_TAGGER_ENGINE
+from .grammatical_correction import grammatical_correction_pipeline
+from .result_cache import get_result_cache, configure_result_cache, cached_batch, correction_payload, DEFAULT_MAX_BYTES
+
+DEFAULT_CHUNK_SIZE = 64
+
+# ============================== SINGLE CHUNK ==============================
+
+def process_chunk(texts):
+    # Όλο το pipeline για ένα chunk - το tagging του preprocessing γίνεται μία φορά για όλο το chunk
+    # Επιστρέφει λίστα με ένα record ανά πρόταση
+    # Αν το chunk αποτύχει, κάθε πρόταση ξανατρέχει μόνη της: error παίρνουν μόνο οι προτάσεις που αποτυγχάνουν,
+    # όχι όλο το chunk (ένα chunk μίας πρότασης που αποτυγχάνει σηκώνει το exception)
+    try:
+        return _process_texts(texts)
+    except Exception:
+        if len(texts) <= 1:
+            raise
+    records = []
+    for text in texts:
+        try:
+            records += _process_texts([text])
+        except Exception as e:
+            records += failed_chunk([text], e)
+    return records
+
+
+def _process_texts(texts):
+    # Το syntactic stage ελέγχει τα προβληματικά μοτίβα για όλο το chunk μαζί (pattern_scan)
+    # Με result cache κάθε στάδιο τρέχει μόνο για τις εισόδους που δεν βρέθηκαν στην cache
+    cache = get_result_cache()
+    tagger_config = tagger_cache_config()
+    pos_tags_list = cached_batch(cache, 'preprocess', texts, lambda batch: [
+        result['pos_tags'] for result in preprocess_stream(batch, batch_size=len(batch) or 1)
+    ], config=tagger_config)
+    syntax_list = cached_batch(cache, 'syntactic', pos_tags_list, _syntactic_batch)
+    corrected_list = cached_batch(cache, 'correction', syntax_list, lambda batch: [
+        grammatical_correction_pipeline(syntax['reconstructed'], False, stream=syntax['reconstructed_stream'])
+        for syntax in batch
+    ], config=tagger_config, key=correction_payload)
+
+    records = []
+    for text, syntax, corrected in zip(texts, syntax_list, corrected_list):
+        records.append({
+            'original': text,
+            'reconstructed': syntax['reconstructed'],
+            'corrected': corrected,
+            'problems_fixed': syntax['problems_fixed'],
+        })
+    return records
+
+
+def _syntactic_batch(pos_tags_list):
+    # Το pattern_scan (numpy) γίνεται import μόνο όταν το syntactic stage τρέξει πραγματικά - όχι π.χ. σε run
+    # που βρίσκει όλο το stage στη result cache
+    from .pattern_scan import syntactic_analysis_batch
+    return syntactic_analysis_batch(pos_tags_list, details=False)
+
+
+def failed_chunk(texts, error):
+    # Records για chunk που απέτυχε - κρατάμε ένα record ανά πρόταση ώστε η έξοδος να μένει ευθυγραμμισμένη
+    message = f"{type(error).__name__}: {error}"
+    return [{'original': text, 'error': message} for text in texts]
+
+
+def _configure_process(cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES, tagger_engine=DEFAULT_TAGGER_ENGINE):
+    configure_result_cache(cache_path, cache_max_bytes)
+    set_tagger_engine(tagger_engine)
+
+
+def _init_worker(*config):
+    # initializer του process pool: NLTK resources φορτώνονται μία φορά ανά worker, κάθε worker ανοίγει
+    # τη δική του σύνδεση στη result cache
+    _configure_process(*config)
+    warm_up()
+
+
+def _new_executor(workers, config=(None, DEFAULT_MAX_BYTES, DEFAULT_TAGGER_ENGINE)):
+    # config: (cache_path, cache_max_bytes, tagger_engine) για κάθε worker
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=config)
+
+
+def _run_isolated(texts, config):
+    # Επανεκτέλεση ύποπτου chunk σε δικό του process μετά από crash του pool
+    # Αν καταρρεύσει ξανά, το chunk δηλώνεται αποτυχημένο
+    with _new_executor(1, config) as executor:
+        try:
+            return executor.submit(process_chunk, texts).result()
+        except Exception as e:
+            return failed_chunk(texts, e)
+
+# ============================== CORPUS EXECUTION ==============================
+
+def iter_chunks(texts, chunk_size):
+    iterator = iter(texts)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_sequential(chunks, stats, config):
+    # Χωρίς warm_up: στο τρέχον process τα NLTK resources φορτώνονται όταν τα χρειαστεί πρώτη φορά ένα στάδιο
+    _configure_process(*config)
+    for texts in chunks:
+        try:
+            records = process_chunk(texts)
+        except Exception as e:
+            records = failed_chunk(texts, e)
+            stats['failed_chunks'] += 1
+        yield from records
+
+
+def _run_parallel(chunks, workers, stats, config):
+    # Τα chunks υποβάλλονται σταδιακά (το πολύ 4 x workers σε πτήση/αναμονή) ώστε η μνήμη να μένει σταθερή
+    max_buffered = 4 * workers
+    chunks = enumerate(chunks)
+    pending = {}  # chunk_id -> (future, texts)
+    ready = {}    # chunk_id -> records (ολοκληρωμένα, περιμένουν τη σειρά τους)
+    next_id = 0
+    exhausted = False
+    executor = _new_executor(workers, config)
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(ready) < max_buffered:
+                try:
+                    chunk_id, texts = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[chunk_id] = (executor.submit(process_chunk, texts), texts)
+
+            if not pending and not ready:
+                break
+
+            if pending:
+                wait([future for future, _ in pending.values()], return_when=FIRST_COMPLETED)
+
+            suspects = []
+            for chunk_id, (future, texts) in list(pending.items()):
+                if not future.done():
+                    continue
+                del pending[chunk_id]
+                try:
+                    ready[chunk_id] = future.result()
+                except BrokenProcessPool:
+                    suspects.append((chunk_id, texts))
+                except Exception as e:
+                    ready[chunk_id] = failed_chunk(texts, e)
+                    stats['failed_chunks'] += 1
+
+            if suspects:
+                # Ένας worker κατέρρευσε: όλα τα chunks σε πτήση χάθηκαν μαζί με το pool
+                # Ξανατρέχουν ένα-ένα σε δικό τους process για να απομονωθεί αυτό που προκαλεί το crash
+                suspects += [(chunk_id, texts) for chunk_id, (_, texts) in pending.items()]
+                pending.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                for chunk_id, texts in sorted(suspects, key=lambda item: item[0]):
+                    records = _run_isolated(texts, config)
+                    if records and 'error' in records[0]:
+                        stats['failed_chunks'] += 1
+                    ready[chunk_id] = records
+                executor = _new_executor(workers, config)
+
+            # Επιστροφή με τη σειρά της εισόδου
+            while next_id in ready:
+                yield from ready.pop(next_id)
+                next_id += 1
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_corpus(texts, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, stats=None,
+               cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES, tagger_engine=DEFAULT_TAGGER_ENGINE):
+    # Generator: εκτελεί το pipeline σε κάθε κείμενο και επιστρέφει records με τη σειρά της εισόδου
+    # workers <= 1: σειριακά στο τρέχον process, αλλιώς process pool
+    # cache_path: αρχείο της result cache (None: χωρίς cache)
+    # tagger_engine: 'perceptron' ή 'numpy' (preprocessing.TAGGER_ENGINES)
+    # stats (dict, προαιρετικό): συμπληρώνεται με records, failed_chunks, elapsed, records_per_sec
+    if stats is None:
+        stats = {}
+    stats.update({'records': 0, 'failed_chunks': 0, 'workers': max(1, workers)})
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+    chunks = iter_chunks(texts, chunk_size)
+    config = (cache_path, cache_max_bytes, tagger_engine)
+    records = _run_sequential(chunks, stats, config) if workers <= 1 else _run_parallel(chunks, workers, stats, config)
+
+    start = time.perf_counter()
+    for record in records:
+        stats['records'] += 1
+        yield record
+
+    elapsed = time.perf_counter() - start
+    stats['elapsed'] = elapsed
+    stats['records_per_sec'] = stats['records'] / elapsed if elapsed > 0 else 0.0
+
+
+def default_workers():
+    return os.cpu_count() or 1
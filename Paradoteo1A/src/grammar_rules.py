@@ -0,0 +1,231 @@
+# Επιφανειακοί γραμματικοί κανόνες (Step 2 του grammatical correction) ως πίνακας
+# Κάθε κανόνας δηλώνεται με: όνομα, tags του τρέχοντος token που τον ενεργοποιούν (None = όλα),
+# συνθήκη και ενέργεια. Η συνθήκη είναι predicate πάνω στη θέση (βλ. RULE VOCABULARY), με lookahead το πολύ 1
+# token, και η ενέργεια ένα όνομα του ACTIONS. Ο πίνακας γίνεται compile (μία φορά ανά engine) σε ένα πέρασμα
+# αριστερά προς δεξιά: κάθε κανόνας γίνεται ένα closure (συνθήκη + μετρητές + ενέργεια) και ανά θέση γίνεται ένα
+# dispatch στο tag (dict tag -> closures των κανόνων του, με τη σειρά του πίνακα) - ελέγχονται μόνο οι κανόνες
+# αυτού του tag, οπότε ένας νέος κανόνας για επίθετα δεν καθυστερεί τα ουσιαστικά.
+# Το μήκος ακολουθίας επιθέτων από κάθε θέση υπολογίζεται μία φορά ανά πρόταση (πέρασμα από το τέλος) -
+# πριν κάθε επίθετο ξαναμετρούσε τα επόμενα επίθετα.
+# Κάθε κανόνας μετράει hits. Με timed=True μετράει επίσης checks και τον χρόνο που ξοδεύει
+# (perf_counter σε κάθε έλεγχο - γι' αυτό δεν είναι ενεργό by default). Βλ. RuleEngine.stats
+
+import time
+import hashlib
+import threading
+
+ADJECTIVE_TAGS = ('JJ', 'JJR', 'JJS')
+
+# ============================== RULE VOCABULARY ==============================
+# Οι συνθήκες και οι ενέργειες δέχονται τη θέση p (RulePosition) με:
+#   p.i, p.n                 θέση του τρέχοντος token, μήκος πρότασης
+#   p.token, p.tag, p.word   το τρέχον token, το tag του και η πεζή μορφή του
+#   p.next_tag, p.next_word  tag και πεζή μορφή του επόμενου token (None στο τέλος της πρότασης)
+#   p.runs                   runs[i] = πόσα διαδοχικά επίθετα ξεκινούν από τη θέση i (υπολογίζεται μόνο αν χρειαστεί)
+# Ενέργεια: κρατάει (p.keep(token)) ή όχι το τρέχον token και επιστρέφει την επόμενη θέση
+
+
+class RulePosition:
+    __slots__ = ('pos_tags', 'i', 'n', 'token', 'tag', 'word', 'next_tag', 'next_word', 'keep', '_runs')
+
+    def __init__(self, pos_tags, keep):
+        self.pos_tags = pos_tags
+        self.n = len(pos_tags)
+        self.keep = keep
+        self._runs = None
+
+    @property
+    def runs(self):
+        if self._runs is None:
+            self._runs = adjective_runs(self.pos_tags)
+        return self._runs
+
+
+def drop(p):
+    return p.i + 1
+
+
+def keep_and_skip_next(p):
+    p.keep(p.token)
+    return p.i + 2
+
+
+def trim_adjectives(p):
+    # Από μια ακολουθία επιθέτων μένουν τα δύο τελευταία
+    return p.i + p.runs[p.i] - 2
+
+
+ACTIONS = {
+    'drop': drop,
+    'keep_and_skip_next': keep_and_skip_next,
+    'trim_adjectives': trim_adjectives,
+}
+
+# ============================== RULE TABLE ==============================
+
+# Η σειρά μετράει: σε κάθε θέση εφαρμόζεται ο πρώτος κανόνας που ταιριάζει
+GRAMMAR_RULES = (
+    # Rule 1: αφαίρεση διπλών προσδιορισμών (the the, a a)
+    ('duplicate_determiner', ('DT',), lambda p: p.next_tag == 'DT' and p.word == p.next_word, 'drop'),
+    # Rule 2: αφαίρεση "ορφανών" επιθέτων στο τέλος (επίθετο που δεν ακολουθείται από ουσιαστικό)
+    ('trailing_adjective', ADJECTIVE_TAGS, lambda p: p.i == p.n - 1, 'drop'),
+    # Rule 3: επιφανειακός έλεγχος για διπλότυπες λέξεις -> διατήρηση μιας
+    ('duplicate_word', None, lambda p: p.word == p.next_word, 'keep_and_skip_next'),
+    # Rule 4: αφαίρεση ορφανών προσδιοριστών στο τέλος
+    ('trailing_determiner', ('DT',), lambda p: p.i == p.n - 1, 'drop'),
+    # Rule 5: αφαίρεση υπερβολικών διαδοχικών επιθέτων (σφάλμα ανακατασκευής) - από >3 μένουν 2
+    ('adjective_run', ADJECTIVE_TAGS, lambda p: p.runs[p.i] > 3, 'trim_adjectives'),
+    # Rule 6: αφαίρεση ορφανών προθέσεων στο τέλος
+    ('trailing_preposition', ('IN',), lambda p: p.i == p.n - 1, 'drop'),
+    # Rule 7: διαδοχικές προθέσεις (in to with) -> κράτα την πρώτη
+    ('consecutive_prepositions', ('IN',), lambda p: p.next_tag == 'IN', 'keep_and_skip_next'),
+)
+
+# ============================== COMPILER ==============================
+
+def adjective_runs(pos_tags):
+    runs = [0] * (len(pos_tags) + 1)
+    for i in range(len(pos_tags) - 1, -1, -1):
+        if pos_tags[i][1] in ADJECTIVE_TAGS:
+            runs[i] = runs[i + 1] + 1
+    return runs
+
+
+def _code_fingerprint(code):
+    # Ο bytecode μιας συνάρτησης (και των nested), χωρίς διευθύνσεις μνήμης όπως το repr της
+    consts = tuple(_code_fingerprint(const) if hasattr(const, 'co_code') else repr(const) for const in code.co_consts)
+    return repr((code.co_code, consts, code.co_names))
+
+
+def rules_fingerprint(rules=GRAMMAR_RULES, actions=ACTIONS):
+    # Hash του πίνακα (ονόματα, tags, κώδικας συνθηκών / ενεργειών) για το result cache
+    parts = [(name, tags, _code_fingerprint(condition.__code__),
+              _code_fingerprint(actions.get(action, action).__code__)) for name, tags, condition, action in rules]
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def compile_rules(rules, timed=False):
+    # Επιστρέφει τη συνάρτηση του περάσματος apply(pos_tags, hits, checks, spent) -> tokens που μένουν
+    # Κάθε κανόνας γίνεται (k, συνθήκη, ενέργεια) - dispatch: tag -> οι κανόνες που το αφορούν (με τη σειρά του
+    # πίνακα), generic: οι κανόνες χωρίς tags, για τα υπόλοιπα tags
+    compiled = [(k, rule[2], ACTIONS.get(rule[3], rule[3])) for k, rule in enumerate(rules)]
+    generic = tuple(entry for entry, rule in zip(compiled, rules) if rule[1] is None)
+    dispatch = {
+        tag: tuple(entry for entry, rule in zip(compiled, rules) if rule[1] is None or tag in rule[1])
+        for tag in {tag for rule in rules if rule[1] is not None for tag in rule[1]}
+    }
+    rules_for = dispatch.get
+    clock = time.perf_counter
+
+    def apply(pos_tags, hits, checks, spent):
+        cleaned_tokens = []
+        keep = cleaned_tokens.append
+        p = RulePosition(pos_tags, keep)
+        n = p.n
+        i = 0
+        next_index = -1
+        next_token = next_tag = next_word = None
+        while i < n:
+            # το επόμενο token της προηγούμενης θέσης γίνεται το τρέχον χωρίς νέο lower()
+            if i == next_index:
+                token, tag, word = next_token, next_tag, next_word
+            else:
+                token, tag = pos_tags[i]
+                word = token.lower()
+            next_index = i + 1
+            if next_index < n:
+                next_token, next_tag = pos_tags[next_index]
+                next_word = next_token.lower()
+            else:
+                next_token = next_tag = next_word = None
+            p.i, p.token, p.tag, p.word, p.next_tag, p.next_word = i, token, tag, word, next_tag, next_word
+            for k, condition, action in rules_for(tag, generic):
+                if timed:
+                    checks[k] += 1
+                    start = clock()
+                    fired = condition(p)
+                    spent[k] += clock() - start
+                else:
+                    fired = condition(p)
+                if fired:
+                    hits[k] += 1
+                    i = action(p)
+                    break
+            else:
+                keep(token)
+                i += 1
+        return cleaned_tokens
+
+    return apply
+
+# ============================== ENGINE ==============================
+
+class RuleEngine:
+
+    def __init__(self, rules=GRAMMAR_RULES, timed=False):
+        self.rules = tuple(rules)
+        self.timed = timed
+        self._apply = compile_rules(self.rules, timed)
+        # Μετρητές ανά thread (hits, checks, time), χωρίς lock στο apply - το stats() τους αθροίζει
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = []
+
+    def _thread_counters(self):
+        counters = getattr(self._local, 'counters', None)
+        if counters is None:
+            n_rules = len(self.rules)
+            counters = self._local.counters = ([0] * n_rules, [0] * n_rules, [0.0] * n_rules)
+            with self._lock:
+                self._counters.append(counters)
+        return counters
+
+    def apply(self, pos_tags):
+        # Επιστρέφει τα tokens που μένουν μετά τους κανόνες
+        hits, checks, spent = self._thread_counters()
+        return self._apply(pos_tags, hits, checks, spent)
+
+    def stats(self):
+        # Ανά κανόνα: hits (πόσες φορές εφαρμόστηκε), checks (πόσες φορές ελέγχθηκε) και time (s) -
+        # τα δύο τελευταία μόνο με timed=True
+        with self._lock:
+            return {
+                rule[0]: {
+                    'checks': sum(checks[k] for _, checks, _ in self._counters),
+                    'hits': sum(hits[k] for hits, _, _ in self._counters),
+                    'time': sum(spent[k] for _, _, spent in self._counters),
+                }
+                for k, rule in enumerate(self.rules)
+            }
+
+    def clear(self):
+        with self._lock:
+            for hits, checks, spent in self._counters:
+                hits[:] = [0] * len(hits)
+                checks[:] = [0] * len(checks)
+                spent[:] = [0.0] * len(spent)
+
+
+def format_rule_stats(stats):
+    # Πίνακας ανά κανόνα για profiling
+    lines = [f"{'rule':<26}{'checks':>10}{'hits':>10}{'hit rate':>10}{'time(ms)':>10}"]
+    for name, entry in stats.items():
+        rate = entry['hits'] / entry['checks'] if entry['checks'] else 0.0
+        lines.append(f"{name:<26}{entry['checks']:>10}{entry['hits']:>10}{rate:>10.1%}{entry['time'] * 1000:>10.1f}")
+    return "\n".join(lines)
+
+# Lazy global: ο πίνακας γίνεται compile μία φορά ανά process
+_engine = None
+
+
+def get_rule_engine():
+    global _engine
+    if _engine is None:
+        _engine = RuleEngine()
+    return _engine
+
+
+def set_rule_engine(engine):
+    # Αντικατάσταση της engine του apply_surface_grammar_rules (π.χ. με timed=True ή άλλους κανόνες)
+    global _engine
+    _engine = engine
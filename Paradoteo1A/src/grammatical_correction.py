@@ -1,58 +1,26 @@
 import re
 
+from .grammar_rules import get_rule_engine
+from nlp_common.postprocessing import postprocess
+from .spelling import get_spelling_corrector
+from nlp_common.symspell import get_symspell
+
 # ============================== STEP 1: SPELLING CORRECTION ==============================
 
-def apply_spelling_correction(text):
+def apply_spelling_correction(text, corrector=None):
     # απλή ορθογραφική διόρθωση με χρήση dictionary.
-    # αντικατάσταση από προκαθορισμένο dictionary
-    
-    # Dictionary με κοινά ορθογραφικά → σωστές φόρμες (έχει μόνο πολύ συνηθισμένα λάθη)
-    spelling_corrections = {
-        # συχνά typos
-        r'\brecieve\b': 'receive',
-        r'\boccured\b': 'occurred',
-        r'\bseperate\b': 'separate',
-        r'\bdefinately\b': 'definitely',
-        r'\bwierd\b': 'weird',
-        r'\bneccessary\b': 'necessary',
-        r'\boccasion\b': 'occasion',
-        r'\bpublically\b': 'publicly',
-        r'\bthier\b': 'their',
-        r'\bbeleive\b': 'believe',
-        r'\bbeggining\b': 'beginning',
-        r'\bcommited\b': 'committed',
-        r'\bexistance\b': 'existence',
-        r'\bconsious\b': 'conscious',
-        r'\bfourty\b': 'forty',
-        r'\buntill\b': 'until',
-        
-        # συντομεύσεις χωρίς απόστροφο
-        r'\bcant\b': "can't",
-        r'\bdont\b': "don't",
-        r'\bdidnt\b': "didn't",
-        r'\bisnt\b': "isn't",
-        r'\barent\b': "aren't",
-        r'\bwasnt\b': "wasn't",
-        r'\bwerent\b': "weren't",
-        r'\bhasnt\b': "hasn't",
-        r'\bhavent\b': "haven't",
-        r'\bhadnt\b': "hadn't",
-        r'\bwont\b': "won't",
-        r'\bwouldnt\b': "wouldn't",
-        r'\bshouldnt\b': "shouldn't",
-        r'\bcouldnt\b': "couldn't",
-        
-        # πιο συγκεκριμένα
-        r'\balot\b': 'a lot',
-        r'\btheir are\b': 'there are',
-        r'\byour welcome\b': "you're welcome",
-    }
-    
-    corrected_text = text
-    for pattern, replacement in spelling_corrections.items():
-        corrected_text = re.sub(pattern, replacement, corrected_text, flags=re.IGNORECASE)
-    
-    return corrected_text
+    # αντικατάσταση από προκαθορισμένο dictionary (src/spelling.py) + εξωτερικό λεξικό αν υπάρχει
+    # Όλες οι καταχωρήσεις εφαρμόζονται σε ένα πέρασμα του κειμένου
+    if corrector is None:
+        corrector = get_spelling_corrector()
+    return corrector.correct(text)
+
+def apply_edit_distance_correction(text, symspell=None):
+    # Διόρθωση λέξεων που δεν υπάρχουν στο λεξικό συχνοτήτων με την κοντινότερη (απόσταση 1-2) - βλ. nlp_common/symspell.py
+    # Ο index χτίζεται offline: PYTHONPATH=.. python -m nlp_common.symspell [frequency_words.txt]
+    if symspell is None:
+        symspell = get_symspell()
+    return symspell.correct_text(text)
 
 # ============================== STEP 2: SURFACE GRAMMAR RULES ==============================
 
@@ -68,68 +36,10 @@ def apply_surface_grammar_rules(text, pos_tags):
     if pos_tags is None or len(pos_tags) == 0:
         return apply_string_level_cleanup(text)
     
-    tokens = pos_tags
-    cleaned_tokens = []
-    i = 0
-    
-    while i < len(tokens):
-        word, pos = tokens[i]
-        
-        # Rule 1: αφαίρεση διπλών προσδιορισμών (the the, a a)
-        if pos == 'DT' and i + 1 < len(tokens):
-            next_word, next_pos = tokens[i + 1]
-            if next_pos == 'DT' and word.lower() == next_word.lower():
-                # παράλειψη διπλότυπου προσδιοριστή
-                i += 1
-                continue
-        
-        # Rule 2: αφαίρεση "ορφανών" επιθέτων στο τέλος (επίθετο που δεν ακολουθείται από ουσιαστικό)
-        if pos in ['JJ', 'JJR', 'JJS'] and i == len(tokens) - 1:
-            i += 1 # τελευταία λέξη επίθετο -> αφαίρεση
-            continue
-        
-        # Rule 3: επιφανειακός έλεγχος για διπλότυπες λέξεις
-        if i + 1 < len(tokens):
-            next_word, _ = tokens[i + 1]
-            if word.lower() == next_word.lower():
-                cleaned_tokens.append(word) # Διπλύτυπη λέξη -> διατήρηση μιας
-                i += 2
-                continue
-        
-        # Rule 4: αφαίρεση ορφανών προσδιοριστών στο τέλος
-        if pos == 'DT' and i == len(tokens) - 1:
-            i += 1 # προσδιοριστική τελευταία λέξη -> αφαίρεση
-            continue
-        
-        # Rule 5: αφαίρεση υπερβολικών διαδοχικών επιθέτων (σφάλμα ανακατασκευής)
-        if pos in ['JJ', 'JJR', 'JJS']:
-            adj_count = 1
-            j = i + 1
-            while j < len(tokens) and tokens[j][1] in ['JJ', 'JJR', 'JJS']:
-                adj_count += 1
-                j += 1
-            
-            if adj_count > 3: # If >3 διαδοχικά επίθετα, κράτα 2
-                i += adj_count - 2
-                continue
-
-        # Rule 6: Remove orphan prepositions at end
-        if pos == 'IN' and i == len(tokens) - 1:
-            # Last word is preposition → remove
-            i += 1
-            continue
-        
-        # Rule 7: Remove consecutive prepositions (in to with → keep first)
-        if pos == 'IN' and i + 1 < len(tokens):
-            next_word, next_pos = tokens[i + 1]
-            if next_pos == 'IN':
-                # Two prepositions in a row → skip second
-                cleaned_tokens.append(word)
-                i += 2
-                continue
-        
-        cleaned_tokens.append(word)
-        i += 1
+    # Οι κανόνες 1-7 (διπλοί προσδιοριστές, ορφανά επίθετα/προσδιοριστές/προθέσεις στο τέλος, διπλότυπες λέξεις,
+    # υπερβολικά διαδοχικά επίθετα, διαδοχικές προθέσεις) είναι ο πίνακας GRAMMAR_RULES του src/grammar_rules.py,
+    # σε ένα πέρασμα με μετρητές ανά κανόνα
+    cleaned_tokens = get_rule_engine().apply(pos_tags)
     
     result = ' '.join(cleaned_tokens) # Ανακατασκευή κειμένου
     
@@ -154,34 +64,9 @@ def apply_string_level_cleanup(text):
 def apply_post_processing(text):    
     # Εφαρμογή βασικής μορφοποίησης κειμένου 
     # χρήση κανόνων μορφοποίησης κειμένου: Πρώτο γράμμα κεφαλαίο, προσθήκη τελείας στο τέλος, 
-    # καθαρισμός κενών και βασική στίξη  
-    
-    if not text:
-        return text
-    
-    text = re.sub(r'\s+', ' ', text.strip()) # αφαίρεση επιπλέων κενών (αν και ήδη έχει γίνει 3 φο΄ρες)
-    
-    # Διόρθωση κενών γύρω από τα σημεία στίξης και αφαίρεση τους πριν 
-    text = re.sub(r'\s+([.,!?;:])', r'\1', text)
-    
-    # προσθήκη κενού μετά τα σημεία στίξης αν λείπει
-    text = re.sub(r'([.,!?;:])([A-Za-z])', r'\1 \2', text)
-    
-    # Πρώτο γράμμα κεφαλαίο
-    if text: text = text[0].upper() + text[1:] if len(text) > 1 else text.upper()
-    
-    # πρόσθεσε τελεία αν λείπει και δενμ υπάρχει άλλο σημείο στίξης
-    if text and text[-1] not in '.!?': text += '.'
-    
-    # Διόρθωση πολλαπλών σημείων στίξης
-    text = re.sub(r'\.{2,}', '.', text)
-    text = re.sub(r'!{2,}', '!', text)
-    text = re.sub(r'\?{2,}', '?', text)
-    
-    # Καθαρισμός ειδικών χαρακτήρων
-    text = re.sub(r'\s+([.,!?])', r'\1', text)
-    
-    return text
+    # καθαρισμός κενών και βασική στίξη (κενά γύρω από τη στίξη, πολλαπλά σημεία στίξης)
+    # Σε ένα πέρασμα με το κοινό post-processing (nlp_common/postprocessing.py, profile 'grammar')
+    return postprocess(text, 'grammar')
 
 # ============================== STEP 4: PRINT FUNCTIONS ==============================
 
@@ -203,23 +88,94 @@ def print_correction_step(step_number, step_name, content):
 def retag_reconstructed_text(reconstructed_text):
     # Προσθήκη ετικετών POS στο νέο string η συνατκτική ανακατασκεύη αναδιατάσσει το κείμενο άρα οι ετικέτες του pre-processing δεν ταιριάζουν εδώ
     # δέχεται reconstructed_text(string) -> επιστρέφει New POS tags [(token, tag), ...]
-    from nltk.tokenize import word_tokenize
-    from nltk import pos_tag
+    # Πλήρες retagging - fallback όταν δεν υπάρχει (αξιόπιστο) token stream από το syntactic stage
+    from .preprocessing import get_tagger, tokenize_text
     
-    # Tokenize and tag the reconstructed text
-    tokens = word_tokenize(reconstructed_text)
-    new_pos_tags = pos_tag(tokens)
+    # Tokenize and tag the reconstructed text (ο κοινός tagger, όχι νέος σε κάθε κλήση όπως το nltk.pos_tag)
+    tokens = tokenize_text(reconstructed_text)
+    new_pos_tags = get_tagger().tag(tokens)
     
     return new_pos_tags
 
+# Incremental retagging: το syntactic stage μόνο μετακινεί tokens (+ ',' / '.' και κεφαλαίο πρώτο γράμμα),
+# οπότε δίνει το token stream του reconstructed με την αρχική θέση κάθε token (reconstructed_stream).
+# Ο averaged perceptron tagger αποφασίζει το tag της θέσης i μόνο από τη λέξη i, τις κανονικοποιημένες
+# λέξεις i-2..i+2 και τα δύο προηγούμενα tags. Αν είναι όλα ίδια με την αρχική θέση του token, το tag
+# του preprocessing ισχύει - ξαναυπολογίζονται μόνο οι θέσεις γύρω από μετακινήσεις.
+# Invalidation window: οι θέσεις με διαφορετικές λέξεις i-2..i+2 (δύο tokens γύρω από κάθε όριο μετακινημένου
+# span και από τα START / END) και οι HISTORY_WINDOW θέσεις μετά από αυτές, των οποίων τα tags i-1 / i-2 μπορεί
+# να άλλαξαν. Πιο μακριά το tag του preprocessing κρατιέται ακόμα κι αν το tag history διαφέρει, ώστε μια αλλαγή
+# tag να μην ξαναϋπολογίζει όλη την υπόλοιπη πρόταση - σε αυτές τις θέσεις το αποτέλεσμα μπορεί σπάνια να
+# διαφέρει από το tagger.tag (βλ. bench_retagging)
+
+SAFE_TOKEN = re.compile(r'[A-Za-z0-9]+')
+# λέξεις που το word_tokenize χωρίζει σε δύο tokens (cannot -> can not)
+TOKENIZER_SPLITS = {'cannot', 'gimme', 'gonna', 'gotta', 'lemme', 'wanna'}
+HISTORY_WINDOW = 2  # ο tagger κοιτάει δύο tags πίσω (i-1 tag, i-2 tag)
+
+
+def stream_matches_text(stream, text):
+    # Το stream είναι ό,τι θα έδινε το word_tokenize(text) μόνο αν κάθε token του syntactic stage
+    # μένει ένα token (λέξη/αριθμός) και τα σημεία στίξης είναι μόνο τα ',' / '.' της ανακατασκευής
+    for token, origin in zip(stream['tokens'], stream['origins']):
+        if origin is None:
+            if token not in (',', '.'):
+                return False
+        elif not SAFE_TOKEN.fullmatch(token) or token.lower() in TOKENIZER_SPLITS:
+            return False
+    return re.sub(r' ([.,])', r'\1', ' '.join(stream['tokens'])) == text
+
+
+def retag_stream(stream, tagger=None):
+    # Επιστρέφει (pos_tags, retagged): τα pos_tags του stream['tokens'] και πόσες θέσεις ξαναυπολογίστηκαν
+    if tagger is None:
+        from .preprocessing import get_tagger
+        tagger = get_tagger()
+    tokens = stream['tokens']
+    origins = stream['origins']
+    source_tokens = stream['source_tokens']
+    source_tags = stream['source_tags']
+
+    normalize = tagger.normalize
+    start = list(tagger.START)
+    context = start + [normalize(token) for token in tokens] + list(tagger.END)
+    source_context = start + [normalize(token) for token in source_tokens] + list(tagger.END)
+    # history[k + 1], history[k]: τα δύο tags πριν τη θέση k (prev, prev2 του tagger)
+    source_history = [start[1], start[0]] + source_tags
+    history = [start[1], start[0]]
+
+    pos_tags = []
+    retagged = 0
+    changed = -HISTORY_WINDOW - 1  # η τελευταία θέση με διαφορετικό token ή λέξεις i-2..i+2
+    for i, (token, origin) in enumerate(zip(tokens, origins)):
+        if (origin is None or token != source_tokens[origin]
+                or context[i:i + 5] != source_context[origin:origin + 5]):
+            changed = i
+        tag = tagger.tagdict.get(token)
+        if not tag:
+            if changed != i and (i - changed > HISTORY_WINDOW or (
+                    history[i + 1] == source_history[origin + 1] and history[i] == source_history[origin])):
+                tag = source_tags[origin]
+            else:
+                features = tagger._get_features(i, token, context, history[i + 1], history[i])
+                prediction = tagger.model.predict(features)
+                tag = prediction[0] if isinstance(prediction, tuple) else prediction  # νεότερα nltk: (tag, conf)
+                retagged += 1
+        pos_tags.append((token, tag))
+        history.append(tag)
+
+    return pos_tags, retagged
+
 # ============================== MAIN GRAMMATICAL CORRECTION PIPELINE ==============================
 
-def grammatical_correction_pipeline(text, verbose):
+def grammatical_correction_pipeline(text, verbose, symspell=False, stream=None):
     # Διαδικασία γραμματικής διόρθωσης. Κάνει σε σειρά τα εξής:
-    # 1. Διόρθωση ορθογραφίας
+    # 1. Διόρθωση ορθογραφίας (+ edit distance διόρθωση άγνωστων λέξεων αν symspell)
     # 2. εφαρμογή επιφανειακών γραμματικών κανόνων
     # 3. post-processing 
     # Δέχεται κείμενο, ετικέτες και το οκευ για να τυπώσει τα βήματα
+    # symspell: False (μόνο το λεξικό), True (index από το data/symspell_index.pkl) ή ένα SymSpell instance
+    # stream: το reconstructed_stream του syntactic stage - incremental retagging αντί για word_tokenize + pos_tag
 
     # Based on: Natural Language Processing Recipes
 
@@ -231,16 +187,32 @@ def grammatical_correction_pipeline(text, verbose):
         print("="*80)
         print_correction_step(0, "Input (Reconstructed Sentence)", text)
 
-    # Step 0.5: προσθήκη νέων ετικετών στο reconstructed
-    pos_tags = retag_reconstructed_text(text)
-    if verbose: print_correction_step(0.5,"Re-tagged for Grammar Rules", f"{len(pos_tags)} POS tags: {pos_tags[:5]}..." )
-
     # Step 1: διόρθωση ορθογραφικών
     corrected = apply_spelling_correction(text)
     if verbose:
         changes = "Changes applied" if corrected != text else "No changes"
         print_correction_step(1, "After Spelling Correction", f"{corrected}\n({changes})")
     
+    # Step 1.5: διόρθωση άγνωστων λέξεων με edit distance
+    if symspell is not False and symspell is not None:
+        before_symspell = corrected
+        corrected = apply_edit_distance_correction(corrected, None if symspell is True else symspell)
+        if verbose:
+            changes = "Changes applied" if corrected != before_symspell else "No changes"
+            print_correction_step(1.5, "After Edit-Distance Correction (SymSpell)", f"{corrected}\n({changes})")
+
+    # Step 1.8: προσθήκη νέων ετικετών στο διορθωμένο reconstructed
+    # Μετά τις διορθώσεις: οι κανόνες του Step 2 ξαναχτίζουν το κείμενο από τα tokens των pos_tags, οπότε tags
+    # του κειμένου πριν τη διόρθωση θα έσβηναν τις διορθώσεις. Το stream του syntactic stage περιγράφει το
+    # αδιόρθωτο κείμενο - αν άλλαξε κάτι, γίνεται πλήρες retagging
+    if stream is not None and corrected == text and stream_matches_text(stream, text):
+        pos_tags, retagged = retag_stream(stream)
+        retagging = f"incremental, {retagged}/{len(pos_tags)} positions retagged"
+    else:
+        pos_tags = retag_reconstructed_text(corrected)
+        retagging = "full"
+    if verbose: print_correction_step(1.8, "Re-tagged for Grammar Rules", f"{len(pos_tags)} POS tags ({retagging}): {pos_tags[:5]}..." )
+    
     # Step 2: επιφανειακοί γραμματικοί κανόνες
     before_grammar = corrected
     corrected = apply_surface_grammar_rules(corrected, pos_tags)
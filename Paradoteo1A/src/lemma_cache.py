@@ -0,0 +1,114 @@
+# Lemma lookup table και bounded LRU cache μπροστά από τον WordNetLemmatizer
+# Το WordNet morphy είναι αργό και καλείται ξανά και ξανά για τα ίδια (word, pos) ζεύγη.
+# - Offline: χτίζουμε πίνακα {wordnet_pos: {word: lemma}} για το vocabulary του corpus και τον
+#   αποθηκεύουμε με pickle (φορτώνει γρήγορα, τα ίδια strings αποθηκεύονται μία φορά)
+# - Runtime: lookup στον πίνακα, αλλιώς LRU cache περιορισμένου μεγέθους, αλλιώς WordNet
+# Ο πίνακας χτίζεται με τον ίδιο lemmatizer, άρα το αποτέλεσμα είναι ίδιο με το lemmatizer.lemmatize
+
+import os
+import sys
+import pickle
+from functools import lru_cache
+
+DEFAULT_LEMMA_TABLE = os.path.join("data", "lemma_table.pkl")
+DEFAULT_CACHE_SIZE = 100_000
+
+# ============== CACHED LEMMATIZER ==============
+
+class CachedLemmatizer:
+    # Ίδιο interface με τον WordNetLemmatizer (lemmatize(word, pos)) ώστε να είναι drop-in
+
+    def __init__(self, lemmatizer, table=None, maxsize=DEFAULT_CACHE_SIZE):
+        self.lemmatizer = lemmatizer
+        self.table = table if table is not None else {}
+        self.table_hits = 0
+        self._lemmatize_cached = lru_cache(maxsize=maxsize)(lemmatizer.lemmatize)
+
+    def lemmatize(self, word, pos='n'):
+        words = self.table.get(pos)
+        if words is not None:
+            lemma = words.get(word)
+            if lemma is not None:
+                self.table_hits += 1
+                return lemma
+        return self._lemmatize_cached(word, pos)
+
+    def stats(self):
+        # Μετρητές για profiling: hits του πίνακα και hits/misses του LRU
+        info = self._lemmatize_cached.cache_info()
+        return {
+            'table_entries': sum(len(words) for words in self.table.values()),
+            'table_hits': self.table_hits,
+            'cache_hits': info.hits,
+            'cache_misses': info.misses,
+            'cache_size': info.currsize,
+            'cache_maxsize': info.maxsize,
+        }
+
+    def clear_cache(self):
+        self._lemmatize_cached.cache_clear()
+        self.table_hits = 0
+
+# ============== TABLE I/O ==============
+
+def save_lemma_table(table, filepath):
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    with open(filepath, 'wb') as f:
+        pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_lemma_table(filepath):
+    with open(filepath, 'rb') as f:
+        return pickle.load(f)
+
+
+def load_cached_lemmatizer(lemmatizer, table_path=DEFAULT_LEMMA_TABLE, maxsize=DEFAULT_CACHE_SIZE):
+    # Φορτώνει τον πίνακα αν υπάρχει, αλλιώς μόνο LRU cache
+    table = load_lemma_table(table_path) if table_path and os.path.exists(table_path) else None
+    return CachedLemmatizer(lemmatizer, table, maxsize)
+
+# ============== OFFLINE TABLE BUILD ==============
+
+def build_lemma_table(pairs, lemmatizer):
+    # Δέχεται iterable από (word, wordnet_pos) και επιστρέφει {wordnet_pos: {word: lemma}}
+    table = {}
+    for word, pos in pairs:
+        words = table.setdefault(pos, {})
+        if word not in words:
+            words[word] = lemmatizer.lemmatize(word, pos)
+    return table
+
+
+def collect_vocabulary(texts, batch_size=256):
+    # Εξαγωγή των (word, wordnet_pos) ζευγών ενός corpus με το ίδιο preprocessing που τρέχει στο runtime
+    from .preprocessing import preprocess_stream, get_wordnet_pos
+
+    pairs = set()
+    for results in preprocess_stream(texts, batch_size=batch_size):
+        for word, tag in results['pos_tags']:
+            pairs.add((word, get_wordnet_pos(tag)))
+    return pairs
+
+
+def build_lemma_table_from_corpus(corpus_path, output_path=DEFAULT_LEMMA_TABLE):
+    # Corpus: ένα κείμενο ανά γραμμή
+    from nltk.stem import WordNetLemmatizer
+
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        texts = (line.strip() for line in f)
+        pairs = collect_vocabulary(text for text in texts if text)
+
+    table = build_lemma_table(sorted(pairs), WordNetLemmatizer())
+    save_lemma_table(table, output_path)
+    return table
+
+
+if __name__ == "__main__":
+    # Χρήση: python -m src.lemma_cache <corpus.txt> [output.pkl]
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.lemma_cache <corpus.txt> [output.pkl]")
+        sys.exit(1)
+    output = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_LEMMA_TABLE
+    table = build_lemma_table_from_corpus(sys.argv[1], output)
+    entries = sum(len(words) for words in table.values())
+    print(f"✓ Lemma table with {entries} entries saved to: {output}")
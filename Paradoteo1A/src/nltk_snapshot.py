@@ -0,0 +1,381 @@
+# Binary snapshot των NLTK resources που χρησιμοποιεί το 1A (tagger weights, tag dictionary, WordNet morphology)
+# Στο runtime το NLTK φορτώνει τον averaged perceptron από JSON και το WordNet από τα index/exception text αρχεία,
+# που κοστίζει δευτερόλεπτα σε κάθε process. Το build step (python -m src.nltk_snapshot build, ή στο τέλος του
+# setup_nltk.py) τα γράφει σε ένα αρχείο που διαβάζεται με mmap:
+# - δεν γίνεται parse τίποτα στο άνοιγμα (μόνο ένα μικρό JSON header), οπότε το cold start είναι σχεδόν μηδενικό
+# - οι σελίδες του αρχείου είναι κοινές στο page cache για όλα τα worker processes (όχι αντίγραφο ανά process)
+# - κάθε feature / λέξη αποκωδικοποιείται την πρώτη φορά που χρειάζεται (bounded LRU ανά process)
+# Αν το snapshot υπάρχει, τα get_tagger / get_lemmatizer του preprocessing το χρησιμοποιούν αντί για το NLTK.
+# Τα αποτελέσματα είναι ίδια με τα PerceptronTagger.tag και WordNetLemmatizer.lemmatize (ίδια weights με την ίδια
+# σειρά άθροισης, ίδιοι κανόνες morphy) - βλ. bench_nltk_snapshot.
+#
+# Μορφή: magic (8 bytes), μήκος header (u64), JSON header (classes, κανόνες morphy, offsets) και μετά τα sections,
+# στοιχισμένα στα 8 bytes.
+# Κάθε πίνακας (tagdict, weights, lemmas, exceptions) είναι string -> bytes ταξινομημένος κατά crc32 του key:
+#   <table>.hashes (u32), <table>.key_offsets (u64), <table>.keys (utf-8), <table>.value_offsets (u64), <table>.values
+# Lookup: bisect στα hashes και σύγκριση του key (οι συγκρούσεις του crc32 λύνονται με τη σύγκριση).
+
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import argparse
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+DEFAULT_SNAPSHOT = os.path.join("data", "nltk_snapshot.bin")
+DEFAULT_CACHE_SIZE = 200_000
+MAGIC = b"NLTKSNP1"
+FORMAT_VERSION = 1
+TABLES = ('tagdict', 'weights', 'lemmas', 'exceptions')
+
+# weights: ζεύγη (class id, weight) ανά feature, με τη σειρά του dict του NLTK
+_WEIGHT = struct.Struct('<Bd')
+
+# ============================== BUILD ==============================
+
+def _table_sections(name, items):
+    # items: (key str, value bytes) -> sections του πίνακα
+    entries = sorted(((zlib.crc32(key.encode('utf-8')), key.encode('utf-8'), value) for key, value in items),
+                     key=lambda entry: (entry[0], entry[1]))
+    hashes = array('I', (entry[0] for entry in entries))
+    key_offsets = array('Q', [0])
+    value_offsets = array('Q', [0])
+    keys = bytearray()
+    values = bytearray()
+    for _, key, value in entries:
+        keys += key
+        values += value
+        key_offsets.append(len(keys))
+        value_offsets.append(len(values))
+    return {
+        f"{name}.hashes": hashes.tobytes(),
+        f"{name}.key_offsets": key_offsets.tobytes(),
+        f"{name}.keys": bytes(keys),
+        f"{name}.value_offsets": value_offsets.tobytes(),
+        f"{name}.values": bytes(values),
+    }
+
+
+def build_snapshot(path=DEFAULT_SNAPSHOT, tagger=None, wordnet=None):
+    # tagger: PerceptronTagger (default: ο English tagger του NLTK), wordnet: WordNetCorpusReader
+    import nltk
+    if tagger is None:
+        from nltk.tag import PerceptronTagger
+        tagger = PerceptronTagger()
+    if wordnet is None:
+        from nltk.corpus import wordnet  # LazyCorpusLoader: φορτώνει στο πρώτο attribute access
+
+    classes = sorted(tagger.classes)
+    if len(classes) > 255:
+        raise ValueError(f"too many tagger classes for the snapshot format: {len(classes)}")
+    class_ids = {label: k for k, label in enumerate(classes)}
+
+    exception_map = wordnet._exception_map
+    lemma_map = wordnet._lemma_pos_offset_map
+    substitutions = wordnet.MORPHOLOGICAL_SUBSTITUTIONS
+    pos_list = sorted(set(exception_map) | set(substitutions) | {pos for poses in lemma_map.values() for pos in poses})
+    pos_bits = {pos: 1 << k for k, pos in enumerate(pos_list)}
+
+    sections = {}
+    sections.update(_table_sections('tagdict', (
+        (word, bytes([class_ids[label]])) for word, label in tagger.tagdict.items()
+    )))
+    sections.update(_table_sections('weights', (
+        (feature, b''.join(_WEIGHT.pack(class_ids[label], weight) for label, weight in weights.items()))
+        for feature, weights in tagger.model.weights.items()
+    )))
+    sections.update(_table_sections('lemmas', (
+        (lemma, bytes([sum(pos_bits[pos] for pos in poses)])) for lemma, poses in lemma_map.items() if poses
+    )))
+    sections.update(_table_sections('exceptions', (
+        (f"{pos} {form}", "\n".join(lemmas).encode('utf-8'))
+        for pos, forms in exception_map.items() for form, lemmas in forms.items()
+    )))
+
+    header = {
+        'version': FORMAT_VERSION,
+        'nltk': nltk.__version__,
+        'classes': classes,
+        'start': list(tagger.START),
+        'end': list(tagger.END),
+        'pos_bits': pos_bits,
+        'substitutions': {pos: [list(rule) for rule in rules] for pos, rules in substitutions.items()},
+        'sections': {},
+    }
+    # offsets από την αρχή της περιοχής δεδομένων (αμέσως μετά το header, στοιχισμένη στα 8 bytes)
+    offset = 0
+    for name, data in sections.items():
+        header['sections'][name] = [offset, len(data)]
+        offset = _align(offset + len(data))
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for name, data in sections.items():
+            f.write(b'\0' * (data_start + header['sections'][name][0] - f.tell()))
+            f.write(data)
+    os.replace(temporary, path)  # οι readers δεν βλέπουν ποτέ μισογραμμένο snapshot
+    return path
+
+
+def _align(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
+
+# ============================== READER ==============================
+
+class _Table:
+    # string -> bytes πάνω στο mmap, χωρίς αντίγραφο των δεδομένων
+
+    def __init__(self, snapshot, name):
+        self.hashes = snapshot.section(f"{name}.hashes").cast('I')
+        self.key_offsets = snapshot.section(f"{name}.key_offsets").cast('Q')
+        self.keys = snapshot.section(f"{name}.keys")
+        self.value_offsets = snapshot.section(f"{name}.value_offsets").cast('Q')
+        self.values = snapshot.section(f"{name}.values")
+        self.size = len(self.hashes)
+
+    def get(self, key):
+        data = key.encode('utf-8')
+        key_hash = zlib.crc32(data)
+        hashes = self.hashes
+        i = bisect_left(hashes, key_hash)
+        while i < self.size and hashes[i] == key_hash:
+            if self.keys[self.key_offsets[i]:self.key_offsets[i + 1]] == data:
+                return bytes(self.values[self.value_offsets[i]:self.value_offsets[i + 1]])
+            i += 1
+        return None
+
+    def __len__(self):
+        return self.size
+
+
+class NLTKSnapshot:
+
+    def __init__(self, path=DEFAULT_SNAPSHOT):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if self._view[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an NLTK snapshot")
+        header_size, = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        start = len(MAGIC) + 8
+        self.header = json.loads(bytes(self._view[start:start + header_size]))
+        self._data_start = _align(start + header_size)
+        if self.header['version'] != FORMAT_VERSION:
+            raise ValueError(f"{path}: snapshot format {self.header['version']}, expected {FORMAT_VERSION} - rebuild it")
+        self.tables = {name: _Table(self, name) for name in TABLES}
+
+    def section(self, name):
+        offset, length = self.header['sections'][name]
+        offset += self._data_start
+        return self._view[offset:offset + length]
+
+    def tagger(self, cache_size=DEFAULT_CACHE_SIZE):
+        return SnapshotTagger(self, cache_size)
+
+    def lemmatizer(self):
+        return SnapshotLemmatizer(self)
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'bytes': len(self._mmap),
+            'nltk': self.header['nltk'],
+            'classes': len(self.header['classes']),
+            'entries': {name: len(table) for name, table in self.tables.items()},
+        }
+
+# ============================== TAGGER ==============================
+
+def normalize(word):
+    # Ίδιο με το PerceptronTagger.normalize
+    if "-" in word and word[0] != "-":
+        return "!HYPHEN"
+    if word.isdigit() and len(word) == 4:
+        return "!YEAR"
+    if word and word[0].isdigit():
+        return "!DIGITS"
+    return word.lower()
+
+
+class _TagDict:
+    # tagdict.get(word) όπως το dict του PerceptronTagger
+
+    def __init__(self, lookup):
+        self.get = lookup
+
+
+class SnapshotTagger:
+    # Ίδιο interface (tag / tag_sents) και ίδια αποτελέσματα με τον PerceptronTagger του NLTK - εκθέτει και τα
+    # normalize, tagdict.get, _get_features και model.predict που χρησιμοποιεί το grammatical_correction.retag_stream
+    normalize = staticmethod(normalize)
+
+    def __init__(self, snapshot, cache_size=DEFAULT_CACHE_SIZE):
+        self.snapshot = snapshot
+        self.classes = snapshot.header['classes']
+        self.START = snapshot.header['start']
+        self.END = snapshot.header['end']
+        tagdict = snapshot.tables['tagdict']
+        weights = snapshot.tables['weights']
+        classes = self.classes
+
+        def load_tag(word):
+            value = tagdict.get(word)
+            return classes[value[0]] if value is not None else None
+
+        def load_weights(feature):
+            value = weights.get(feature)
+            if value is None:
+                return None
+            return tuple((classes[label], weight) for label, weight in _WEIGHT.iter_unpack(value))
+
+        self._tag_of = lru_cache(maxsize=cache_size)(load_tag)
+        self._weights_of = lru_cache(maxsize=cache_size)(load_weights)
+        self.tagdict = _TagDict(self._tag_of)
+        self.model = self
+
+    def _get_features(self, i, word, context, prev, prev2):
+        # Τα features του PerceptronTagger._get_features, με την ίδια σειρά
+        i += len(self.START)
+        features = {}
+        for feature in (
+            "bias",
+            "i suffix " + word[-3:],
+            "i pref1 " + (word[0] if word else ""),
+            "i-1 tag " + prev,
+            "i-2 tag " + prev2,
+            "i tag+i-2 tag " + prev + " " + prev2,
+            "i word " + context[i],
+            "i-1 tag+i word " + prev + " " + context[i],
+            "i-1 word " + context[i - 1],
+            "i-1 suffix " + context[i - 1][-3:],
+            "i-2 word " + context[i - 2],
+            "i+1 word " + context[i + 1],
+            "i+1 suffix " + context[i + 1][-3:],
+            "i+2 word " + context[i + 2],
+        ):
+            features[feature] = features.get(feature, 0) + 1
+        return features
+
+    def predict(self, features):
+        scores = {}
+        weights_of = self._weights_of
+        for feature, value in features.items():
+            weights = weights_of(feature)
+            if weights is None or value == 0:
+                continue
+            for label, weight in weights:
+                scores[label] = scores.get(label, 0.0) + value * weight
+        return max(self.classes, key=lambda label: (scores.get(label, 0.0), label))
+
+    def tag(self, tokens):
+        prev, prev2 = self.START
+        output = []
+        context = self.START + [normalize(word) for word in tokens] + self.END
+        tag_of = self._tag_of
+        for i, word in enumerate(tokens):
+            tag = tag_of(word)
+            if not tag:
+                tag = self.predict(self._get_features(i, word, context, prev, prev2))
+            output.append((word, tag))
+            prev2 = prev
+            prev = tag
+        return output
+
+    def tag_sents(self, sentences):
+        return [self.tag(sentence) for sentence in sentences]
+
+# ============================== LEMMATIZER ==============================
+
+class SnapshotLemmatizer:
+    # Ίδιο με WordNetLemmatizer.lemmatize (WordNet _morphy με exception lists) - μπαίνει πίσω από το
+    # CachedLemmatizer του lemma_cache όπως και ο WordNetLemmatizer
+
+    def __init__(self, snapshot):
+        self.lemmas = snapshot.tables['lemmas']
+        self.exceptions = snapshot.tables['exceptions']
+        self.pos_bits = snapshot.header['pos_bits']
+        self.substitutions = {pos: [tuple(rule) for rule in rules]
+                              for pos, rules in snapshot.header['substitutions'].items()}
+
+    def _has_lemma(self, form, bit):
+        value = self.lemmas.get(form)
+        return value is not None and value[0] & bit
+
+    def _morphy(self, form, pos):
+        if pos not in self.pos_bits:
+            raise KeyError(pos)
+        exceptions = self.exceptions.get(f"{pos} {form}")
+        if exceptions is not None:
+            forms = exceptions.decode('utf-8').split("\n") if exceptions else []
+        else:
+            forms = [form[:-len(old)] + new for old, new in self.substitutions.get(pos, ()) if form.endswith(old)]
+
+        bit = self.pos_bits[pos]
+        result = []
+        for candidate in [form] + forms:
+            if candidate not in result and self._has_lemma(candidate, bit):
+                result.append(candidate)
+        return result
+
+    def lemmatize(self, word, pos='n'):
+        lemmas = self._morphy(word, pos)
+        return min(lemmas, key=len) if lemmas else word
+
+# ============================== LOADER ==============================
+
+# Lazy global: το snapshot ανοίγει μία φορά ανά process (False: δεν υπάρχει / δεν ανοίγει)
+_snapshot = None
+
+
+def load_snapshot(path=DEFAULT_SNAPSHOT):
+    # Το snapshot ή None αν δεν υπάρχει - ένα χαλασμένο / παλιό snapshot αγνοείται με warning (fallback στο NLTK)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return NLTKSnapshot(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[nltk_snapshot] ignoring {path}: {e}", file=sys.stderr)
+        return None
+
+
+def get_snapshot():
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = load_snapshot() or False
+    return _snapshot or None
+
+
+def set_snapshot(snapshot):
+    # Αντικατάσταση του snapshot (None: χρήση του NLTK ακόμα κι αν υπάρχει το αρχείο)
+    global _snapshot
+    _snapshot = snapshot if snapshot is not None else False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Binary snapshot των NLTK resources του Deliverable 1A")
+    parser.add_argument("--path", default=DEFAULT_SNAPSHOT, help="αρχείο του snapshot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="χτίσιμο από τα δεδομένα του NLTK (tagger + WordNet)")
+    commands.add_parser("stats", help="μέγεθος και entries ανά πίνακα")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_snapshot(args.path)
+        print(f"✓ Snapshot written to {args.path} ({os.path.getsize(args.path) / 1e6:.1f} MB)")
+    else:
+        snapshot = load_snapshot(args.path)
+        if snapshot is None:
+            print(f"No snapshot at {args.path} (python -m src.nltk_snapshot build)")
+            sys.exit(1)
+        print(json.dumps(snapshot.stats(), indent=2))
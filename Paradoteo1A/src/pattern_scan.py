@@ -0,0 +1,99 @@
+# Batch εντοπισμός των προβληματικών μοτίβων του detect_and_fix_problems με NumPy
+# Πολλές προτάσεις πακετάρονται σε ένα array από tag masks (με τα όρια κάθε πρότασης)
+# και τα τρία μοτίβα ελέγχονται για όλο το corpus με vectorized πράξεις:
+# - Problem 1: IN + JJ* χωρίς NN* στην επόμενη θέση                     (ακριβές)
+# - Problem 2: ρήμα/modal στη θέση v >= 1 χωρίς NN*/PRP στις 3 προηγούμενες (υπερσύνολο: κάθε κύριο verb group
+#              ξεκινά από ρήμα ή modal, οπότε δεν χάνεται κανένα πρόβλημα)
+# - Problem 3: JJ/RB* στην αρχή χωρίς NN*/PRP μετά                          (ακριβές)
+# Μόνο οι προτάσεις με hit περνάνε από τους Python fixers - οι υπόλοιπες δεν έχουν σίγουρα προβλήματα.
+
+import numpy as np
+
+from .tagged_sentence import TaggedSentence, tag_id, NOUN, PRONOUN, ADJECTIVE, ADVERB, VERB, MODAL, PREPOSITION
+from .syntactic_analysis import syntactic_analysis_pipeline
+
+PATTERNS = ('preposition_adjective_no_noun', 'verb_without_subject', 'unusual_start')
+_JJ = tag_id('JJ')
+
+# ============================== PACKING ==============================
+
+def pack_sentences(sentences):
+    # sentences: TaggedSentence (ή λίστες από tuples)
+    # Επιστρέφει (tag_ids, masks, lengths): όλες οι προτάσεις σε συνεχόμενα arrays + μήκος κάθε πρότασης
+    sentences = [TaggedSentence.from_pos_tags(sentence) for sentence in sentences]
+    lengths = np.fromiter(map(len, sentences), dtype=np.int64, count=len(sentences))
+    tag_ids = np.frombuffer(b''.join([sentence.tag_ids.tobytes() for sentence in sentences]), dtype=np.uint8)
+    masks = np.frombuffer(b''.join([sentence.masks.tobytes() for sentence in sentences]), dtype=np.uint16)
+    return tag_ids, masks, lengths
+
+
+def _shifted(values, positions, lengths_at, k):
+    # values[i + k] εφόσον η θέση i + k είναι στην ίδια πρόταση, αλλιώς 0
+    shifted = np.zeros_like(values)
+    if k > 0:
+        shifted[:-k] = values[k:]
+        shifted[positions + k >= lengths_at] = 0
+    else:
+        shifted[-k:] = values[:k]
+        shifted[positions + k < 0] = 0
+    return shifted
+
+# ============================== SCAN ==============================
+
+def scan_patterns(sentences):
+    # Επιστρέφει dict: pattern -> bool array (ανά πρόταση) με τις προτάσεις που έχουν hit
+    tag_ids, masks, lengths = pack_sentences(sentences)
+    n_sentences = len(lengths)
+    if not len(masks):
+        return {pattern: np.zeros(n_sentences, dtype=bool) for pattern in PATTERNS}
+
+    sentence_of = np.repeat(np.arange(n_sentences), lengths)
+    starts = np.cumsum(lengths) - lengths
+    positions = np.arange(len(masks)) - starts[sentence_of]
+    lengths_at = lengths[sentence_of]
+    next1 = _shifted(masks, positions, lengths_at, 1)
+    next2 = _shifted(masks, positions, lengths_at, 2)
+
+    # Problem 1
+    p1 = (masks & PREPOSITION != 0) & (next1 & ADJECTIVE != 0) & (next2 & NOUN == 0)
+
+    # Problem 2
+    subject = NOUN | PRONOUN
+    has_subject = np.zeros(len(masks), dtype=bool)
+    for k in (1, 2, 3):
+        has_subject |= _shifted(masks, positions, lengths_at, -k) & subject != 0
+    p2 = (masks & (VERB | MODAL) != 0) & (positions >= 1) & ~has_subject
+
+    # Problem 3
+    first = positions == 0
+    p3 = first & ((tag_ids == _JJ) | (masks & ADVERB != 0)) & ((lengths_at < 3) | (next1 & subject == 0))
+
+    hits = {}
+    for pattern, found in zip(PATTERNS, (p1, p2, p3)):
+        flags = np.zeros(n_sentences, dtype=bool)
+        flags[sentence_of[found]] = True
+        hits[pattern] = flags
+    return hits
+
+
+def find_problem_sentences(sentences):
+    # bool array: True για τις προτάσεις που (ίσως) έχουν πρόβλημα - False σημαίνει σίγουρα κανένα
+    hits = scan_patterns(sentences)
+    return hits[PATTERNS[0]] | hits[PATTERNS[1]] | hits[PATTERNS[2]]
+
+# ============================== BATCH ANALYSIS ==============================
+
+def syntactic_analysis_batch(pos_tags_list, stats=None, details=True):
+    # Ίδια αποτελέσματα με syntactic_analysis_pipeline(pos_tags, False) για κάθε πρόταση,
+    # αλλά το detect_and_fix_problems τρέχει μόνο στις προτάσεις με hit
+    # stats (dict, προαιρετικό): sentences, flagged
+    # details: όπως στο syntactic_analysis_pipeline (False: μόνο reconstructed/problems_fixed μέσω plan cache)
+    sentences = [TaggedSentence.from_pos_tags(pos_tags) for pos_tags in pos_tags_list]
+    flagged = find_problem_sentences(sentences)
+    if stats is not None:
+        stats['sentences'] = stats.get('sentences', 0) + len(sentences)
+        stats['flagged'] = stats.get('flagged', 0) + int(flagged.sum())
+    return [
+        syntactic_analysis_pipeline(sentence, False, check_problems=bool(flag), details=details)
+        for sentence, flag in zip(sentences, flagged)
+    ]
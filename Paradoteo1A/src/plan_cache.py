@@ -0,0 +1,59 @@
+# Bounded LRU cache για τα reconstruction templates του syntactic stage
+# Η αναδιάταξη (handle_clauses) εξαρτάται σχεδόν μόνο από την ακολουθία των tags - οι μόνες λεξικές
+# εξαιρέσεις είναι but/and/or, οι δευτερεύοντες σύνδεσμοι, τα βοηθητικά ρήματα και τα σημεία στίξης.
+# Προτάσεις με το ίδιο signature (tag classes + λεξικές σημαίες) έχουν το ίδιο template, οπότε
+# επαναλαμβανόμενα templates προτάσεων δεν ξαναπερνούν από NP/VG/SVO ανάλυση.
+# Το signature υπολογίζεται στο syntactic_analysis (plan_signature) - εδώ μόνο η cache.
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_PLAN_CACHE_SIZE = 50_000
+
+
+class PlanCache:
+
+    def __init__(self, maxsize=DEFAULT_PLAN_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        # Το template για το key ή None
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, key, plan):
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            if len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+
+    def stats(self):
+        # Μετρητές για profiling: hits/misses, hit rate και μέγεθος
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._plans),
+                'maxsize': self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
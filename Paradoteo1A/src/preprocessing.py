@@ -1,10 +1,104 @@
 import re
 import string
-import contractions
-from nltk.tokenize import word_tokenize
-from nltk.tag import pos_tag
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet
+from itertools import islice
+from .lemma_cache import load_cached_lemmatizer
+from .nltk_snapshot import get_snapshot
+
+# ================ SHARED NLTK STATE ================
+# Κοινά αντικείμενα NLTK: δημιουργούνται μία φορά ανά process και ξαναχρησιμοποιούνται
+# σε κάθε κλήση (πριν φτιαχνόταν νέος lemmatizer/tagger σε κάθε πρόταση)
+# Τα nltk και contractions γίνονται import την πρώτη φορά που τα χρειάζεται ένα στάδιο και όχι στο import του
+# module (το import του nltk μόνο του κοστίζει ~0.4s) - έτσι π.χ. το --help ή ένα run από warm result cache
+# ξεκινάνε αμέσως
+# Αν υπάρχει το binary snapshot (data/nltk_snapshot.bin, βλ. src/nltk_snapshot.py) tagger και lemmatizer
+# διαβάζουν από αυτό με mmap αντί να φορτώσουν τα JSON / WordNet αρχεία του NLTK - ίδια αποτελέσματα
+# Tagger engine: 'perceptron' (ο averaged perceptron του NLTK / του snapshot, ίδια αποτελέσματα με το nltk.pos_tag)
+# ή 'numpy' (nlp_common/batch_tagger.py: τα ίδια weights σε πίνακες, vectorized tagging ανά batch - >= 99.9% ίδια tags)
+TAGGER_ENGINES = ('perceptron', 'numpy')
+DEFAULT_TAGGER_ENGINE = 'perceptron'
+
+_lemmatizer = None
+_tagger = None
+_tagger_engine = DEFAULT_TAGGER_ENGINE
+_word_tokenize = None
+_fix_contractions = None
+
+def get_lemmatizer():
+    # WordNetLemmatizer πίσω από lemma table (αν υπάρχει data/lemma_table.pkl) και LRU cache
+    global _lemmatizer
+    if _lemmatizer is None:
+        snapshot = get_snapshot()
+        if snapshot is not None:
+            _lemmatizer = load_cached_lemmatizer(snapshot.lemmatizer())
+        else:
+            from nltk.stem import WordNetLemmatizer
+            _lemmatizer = load_cached_lemmatizer(WordNetLemmatizer())
+    return _lemmatizer
+
+
+def get_tagger():
+    # Ο ίδιος averaged perceptron tagger που χρησιμοποιεί εσωτερικά το nltk.pos_tag για English
+    global _tagger
+    if _tagger is None:
+        snapshot = get_snapshot()
+        if snapshot is not None:
+            _tagger = snapshot.tagger()
+        else:
+            from nltk.tag import PerceptronTagger
+            _tagger = PerceptronTagger()
+        if _tagger_engine == 'numpy':
+            from nlp_common.batch_tagger import BatchTagger
+            _tagger = BatchTagger(_tagger)
+    return _tagger
+
+
+def set_tagger_engine(engine):
+    # Ο tagger ξαναφορτώνεται στην επόμενη κλήση του get_tagger αν αλλάξει το engine
+    global _tagger, _tagger_engine
+    if engine not in TAGGER_ENGINES:
+        raise ValueError(f"Unknown tagger engine: {engine} (available: {TAGGER_ENGINES})")
+    if engine != _tagger_engine:
+        _tagger = None
+    _tagger_engine = engine
+
+
+def tagger_cache_config():
+    # config της result cache για τα στάδια που κάνουν tagging: τα αποτελέσματα του 'numpy' engine δεν είναι
+    # εγγυημένα ίδια με του perceptron, οπότε δεν μοιράζονται entries (None: τα keys του default engine)
+    return None if _tagger_engine == DEFAULT_TAGGER_ENGINE else {'tagger': _tagger_engine}
+
+
+def get_word_tokenize():
+    global _word_tokenize
+    if _word_tokenize is None:
+        from nltk.tokenize import word_tokenize
+        _word_tokenize = word_tokenize
+    return _word_tokenize
+
+
+def get_fix_contractions():
+    global _fix_contractions
+    if _fix_contractions is None:
+        import contractions
+        _fix_contractions = contractions.fix
+    return _fix_contractions
+
+
+def warm_up():
+    # Φόρτωση όλων των NLTK resources (punkt, tagger, WordNet) εκ των προτέρων, π.χ. σε worker processes
+    apply_lemmatization(apply_pos_tagging(tokenize_text("warm up the taggers")))
+
+# Special characters to remove
+SPECIAL_CHARS = '—…''""'
+
+# WordNet POS (οι τιμές των nltk.corpus.wordnet.ADJ / VERB / NOUN / ADV, χωρίς import του WordNet)
+WORDNET_ADJ = 'a'
+WORDNET_VERB = 'v'
+WORDNET_NOUN = 'n'
+WORDNET_ADV = 'r'
+
+# Translation table: κάθε σημείο στίξης / ειδικός χαρακτήρας -> κενό
+PUNCTUATION_TABLE = str.maketrans({char: ' ' for char in string.punctuation + SPECIAL_CHARS})
 
 # ================ HELPER FUNCTIONS ================
 # βοηθητικές συναρτήσεις / βήματα του preprocessing
@@ -12,7 +106,7 @@ from nltk.corpus import wordnet
 def expand_contractions(text):
     # Ανάπτυξη των συντομευμένων λέξεων στην πλήρη μορφή τους με τη χρήση της contractions library
     # Επιστρέφει string με το κείμενο - Παράδειγμα "I didn't see it" -> "I did not see it"
-    return contractions.fix(text)
+    return (_fix_contractions or get_fix_contractions())(text)
 
 
 def apply_lowercasing(text): # Μετατροπή κειμένου σε πεζά 
@@ -21,19 +115,8 @@ def apply_lowercasing(text): # Μετατροπή κειμένου σε πεζά
 
 def remove_punctuation_and_special_chars(text):
     # Αφαίρεση σημείων στίξης - Επιστρέφει το κείμενο χωρίς σημεία στίξης και ειδικούς χαρακτήρες
-    
-    # Special characters to remove
-    special_chars = '—…''""'
-    
-    # Remove standard punctuation
-    for char in string.punctuation:
-        text = text.replace(char, ' ')
-    
-    # Remove special characters
-    for char in special_chars:
-        text = text.replace(char, ' ')
-    
-    return text
+    # Ένα πέρασμα με translation table αντί για ένα str.replace ανά χαρακτήρα
+    return text.translate(PUNCTUATION_TABLE)
 
 
 def clean_whitespace(text):
@@ -45,8 +128,16 @@ def clean_whitespace(text):
     return text
 
 
+def normalize_text(text):
+    # Fused Steps 2-4: πεζά, αφαίρεση στίξης/ειδικών χαρακτήρων και καθαρισμός κενών σε ένα πέρασμα
+    # Ίδιο αποτέλεσμα με clean_whitespace(remove_punctuation_and_special_chars(apply_lowercasing(text)))
+    # χωρίς τα ενδιάμεσα αντίγραφα, οπότε το κόστος μένει γραμμικό και για κείμενα πολλών MB
+    # (το str.split() χωρίζει στους ίδιους χαρακτήρες με το \s του re)
+    return ' '.join(text.lower().translate(PUNCTUATION_TABLE).split())
+
+
 def tokenize_text(text): # Tokenization με NLTK - Επιστρέφει λίστα με tokens
-    tokens = word_tokenize(text)
+    tokens = (_word_tokenize or get_word_tokenize())(text)
     return tokens
 
 
@@ -56,26 +147,32 @@ def get_wordnet_pos(treebank_tag):
     # επιστρέφει: str: WordNet POS tag
     
     if treebank_tag.startswith('J'):
-        return wordnet.ADJ
+        return WORDNET_ADJ
     elif treebank_tag.startswith('V'):
-        return wordnet.VERB
+        return WORDNET_VERB
     elif treebank_tag.startswith('N'):
-        return wordnet.NOUN
+        return WORDNET_NOUN
     elif treebank_tag.startswith('R'):
-        return wordnet.ADV
+        return WORDNET_ADV
     else:
-        return wordnet.NOUN
+        return WORDNET_NOUN
 
 #Part-Of-Speech (POS) tagging σε tokens 
 def apply_pos_tagging(tokens): 
     # Δέχεται tokens (list) -> επιστρέφει List of (token, pos_tag) tuples
-    pos_tags = pos_tag(tokens)
+    pos_tags = get_tagger().tag(tokens)
     return pos_tags
 
+
+def apply_pos_tagging_batch(token_lists):
+    # POS tagging για πολλές προτάσεις με μία κλήση (pos_tag_sents style)
+    # Δέχεται λίστα από λίστες tokens -> επιστρέφει λίστα από λίστες (token, pos_tag)
+    return get_tagger().tag_sents(token_lists)
+
 # Lemmatization σε tokens με POS tags.
 def apply_lemmatization(pos_tags):
     # Δέχεται pos_tags (list): List of (token, pos_tag) tuples -> επιστρέφει List of lemmatized tokens
-    lemmatizer = WordNetLemmatizer()
+    lemmatizer = get_lemmatizer()
     
     lemmatized_tokens = [
         lemmatizer.lemmatize(word, get_wordnet_pos(tag))
@@ -102,63 +199,138 @@ def print_step(step_number, step_name, content):
 
 # ================ MAIN PREPROCESSING PIPELINE ================
 
-def preprocess_pipeline(text, verbose):        
-    # Επιστρέφει Dictionary που περιέχει:
-    # - 'original': προτότυπο κείμενο
-    # - 'after_contractions': διευρημένες συντομογραφίες
-    # - 'after_lowercasing': όλα πεζά
-    # - 'after_punctuation': χωρίς σημεία στίξης
-    # - 'after_whitespace': καθαρισμένα κενά
-    # - 'tokens': tokenization
-    # - 'pos_tags': ετικέτες Part-Of-Speech
-    # - 'lemmatized_tokens': Final lemmatized tokens
-    
+# Όλα τα στάδια που μπορεί να αποθηκεύσει το results dictionary
+PIPELINE_STAGES = (
+    'original', 'after_contractions', 'after_lowercasing', 'after_punctuation',
+    'after_whitespace', 'tokens', 'pos_tags', 'lemmatized_tokens',
+)
+
+# Lean mode: μόνο ό,τι χρειάζεται το syntactic_analysis_pipeline
+LEAN_STAGES = ('pos_tags',)
+
+# Ενδιάμεσα στάδια των Steps 2-4 - αν δεν ζητηθεί κανένα, τρέχει το fused normalize_text
+_NORMALIZATION_STAGES = ('after_lowercasing', 'after_punctuation', 'after_whitespace')
+
+
+def resolve_keep(keep):
+    # keep=None -> όλα τα στάδια, αλλιώς iterable με ονόματα από το PIPELINE_STAGES
+    if keep is None:
+        return frozenset(PIPELINE_STAGES)
+    keep = frozenset(keep)
+    unknown = keep - frozenset(PIPELINE_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown preprocessing stages: {sorted(unknown)} (available: {PIPELINE_STAGES})")
+    return keep
+
+
+def _preprocess_until_tokens(text, keep, verbose):
+    # Steps 0-5 - αποθηκεύει στο results μόνο τα στάδια που ζητούνται στο keep
     results = {}
-    
+
     # αποθήκευση πρωτότυπου
-    results['original'] = text
+    if 'original' in keep: results['original'] = text
     if verbose: print_step(0, "Original Text", text)
-    
+
     # Step 1: διεύρυνση contractions
     text = expand_contractions(text)
-    results['after_contractions'] = text
+    if 'after_contractions' in keep: results['after_contractions'] = text
     if verbose: print_step(1, "After Expanding Contractions", text)
-    
-    # Step 2: πεζά
-    text = apply_lowercasing(text)
-    results['after_lowercasing'] = text
-    if verbose: print_step(2, "After Lowercasing", text)
-    
-    # Step 3: αφαίρεση σημείων στίξης και ειδικών χαρακτήρων
-    text = remove_punctuation_and_special_chars(text)
-    results['after_punctuation'] = text
-    if verbose: print_step(3, "After Removing Punctuation", text)
-    
-    # Step 4: καθαρισμός κενών
-    text = clean_whitespace(text)
-    results['after_whitespace'] = text
-    if verbose: print_step(4, "After Cleaning Whitespace", text)
-    
+
+    if verbose or not keep.isdisjoint(_NORMALIZATION_STAGES):
+        # Step 2: πεζά
+        text = apply_lowercasing(text)
+        if 'after_lowercasing' in keep: results['after_lowercasing'] = text
+        if verbose: print_step(2, "After Lowercasing", text)
+
+        # Step 3: αφαίρεση σημείων στίξης και ειδικών χαρακτήρων
+        text = remove_punctuation_and_special_chars(text)
+        if 'after_punctuation' in keep: results['after_punctuation'] = text
+        if verbose: print_step(3, "After Removing Punctuation", text)
+
+        # Step 4: καθαρισμός κενών
+        text = clean_whitespace(text)
+        if 'after_whitespace' in keep: results['after_whitespace'] = text
+        if verbose: print_step(4, "After Cleaning Whitespace", text)
+    else:
+        # Steps 2-4 σε ένα πέρασμα, χωρίς ενδιάμεσα αντίγραφα
+        text = normalize_text(text)
+
     # Step 5: Tokenization
     tokens = tokenize_text(text)
-    results['tokens'] = tokens
+    if 'tokens' in keep: results['tokens'] = tokens
     if verbose: print_step(5, "After Tokenization", tokens)
+
+    return results, tokens
+
+
+def preprocess_pipeline(text, verbose, keep=None):        
+    # Επιστρέφει Dictionary που περιέχει:
+    # - 'original': προτότυπο κείμενο
+    # - 'after_contractions': διευρημένες συντομογραφίες
+    # - 'after_lowercasing': όλα πεζά
+    # - 'after_punctuation': χωρίς σημεία στίξης
+    # - 'after_whitespace': καθαρισμένα κενά
+    # - 'tokens': tokenization
+    # - 'pos_tags': ετικέτες Part-Of-Speech
+    # - 'lemmatized_tokens': Final lemmatized tokens
+    # keep: ποια από τα παραπάνω να κρατηθούν (None = όλα, LEAN_STAGES = μόνο pos_tags)
+    # Στάδια που δεν ζητούνται δεν αποθηκεύονται και το lemmatization παραλείπεται αν δεν χρειάζεται
+    keep = resolve_keep(keep)
+
+    results, tokens = _preprocess_until_tokens(text, keep, verbose)
     
     # Step 6: POS tagging
     pos_tags = apply_pos_tagging(tokens)
-    results['pos_tags'] = pos_tags
+    if 'pos_tags' in keep: results['pos_tags'] = pos_tags
     if verbose:
         print_step(6, "After POS Tagging", pos_tags[:10])
         if len(pos_tags) > 10:
             print(f"... and {len(pos_tags) - 10} more")
     
     # Step 7: Lemmatization
-    lemmatized_tokens = apply_lemmatization(pos_tags)
-    results['lemmatized_tokens'] = lemmatized_tokens
-    if verbose: print_step(7, "After Lemmatization (FINAL)", lemmatized_tokens)
+    if verbose or 'lemmatized_tokens' in keep:
+        lemmatized_tokens = apply_lemmatization(pos_tags)
+        if 'lemmatized_tokens' in keep: results['lemmatized_tokens'] = lemmatized_tokens
+        if verbose: print_step(7, "After Lemmatization (FINAL)", lemmatized_tokens)
     
     return results
 
 
+# ================ STREAMING / BATCH PREPROCESSING ================
+
+def preprocess_stream(texts, batch_size=256, keep=LEAN_STAGES):
+    # Generator για μεγάλα corpora: δέχεται οποιοδήποτε iterable από κείμενα και επιστρέφει
+    # lazily ένα results dictionary ανά κείμενο (ίδια μορφή με το preprocess_pipeline)
+    # Τα κείμενα διαβάζονται ανά batch_size, οπότε η μνήμη μένει σταθερή ανεξάρτητα από το μέγεθος του corpus
+    # Lemmatizer και tagger είναι κοινοί για όλο το stream, το tagging γίνεται μία φορά ανά batch
+    # Default keep: lean mode (μόνο pos_tags) - keep=None για όλα τα στάδια
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    keep = resolve_keep(keep)
+
+    iterator = iter(texts)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+
+        # Steps 1-5 ανά κείμενο
+        batch_results = []
+        batch_tokens = []
+        for text in batch:
+            results, tokens = _preprocess_until_tokens(text, keep, False)
+            batch_results.append(results)
+            batch_tokens.append(tokens)
+
+        # Step 6: POS tagging για όλο το batch
+        tagged = apply_pos_tagging_batch(batch_tokens)
+
+        for results, pos_tags in zip(batch_results, tagged):
+            if 'pos_tags' in keep: results['pos_tags'] = pos_tags
+            # Step 7: Lemmatization
+            if 'lemmatized_tokens' in keep: results['lemmatized_tokens'] = apply_lemmatization(pos_tags)
+            yield results
+
+
 def preprocess_simple(text): # απλοποιημένο preprocessing που επιστρέφει μόνο τα τελικά tokens
     return preprocess_pipeline(text)['lemmatized_tokens']
\ No newline at end of file
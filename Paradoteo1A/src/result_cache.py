@@ -0,0 +1,305 @@
+# Content-addressed cache στον δίσκο (SQLite) για τα αποτελέσματα των σταδίων του Deliverable 1A
+# Οι ίδιες προτάσεις επανέρχονται στα feeds - εδώ κάθε στάδιο (preprocess, syntactic, correction) κρατάει
+# ξεχωριστά τα αποτελέσματά του με key = hash(στάδιο, fingerprint του σταδίου, είσοδος του σταδίου):
+# - preprocess: κείμενο -> pos_tags
+# - syntactic:  pos_tags -> αποτέλεσμα του syntactic_analysis_pipeline (details=False)
+# - correction: reconstructed κείμενο + token stream του syntactic stage -> διορθωμένο κείμενο (βλ. correction_payload)
+# Το fingerprint είναι η έκδοση του σταδίου (STAGE_VERSIONS - αλλάζει όταν αλλάζει η έξοδός του) και για το
+# correction και ένα hash του πίνακα GRAMMAR_RULES, οπότε μια αλλαγή στους κανόνες ακυρώνει μόνο το correction.
+# Eviction με βάση το μέγεθος: όταν τα δεδομένα ξεπεράσουν το max_bytes, σβήνονται τα λιγότερο πρόσφατα
+# χρησιμοποιημένα μέχρι το PRUNE_TARGET του ορίου. Lookups / inserts γίνονται ανά batch (ένα transaction ανά chunk).
+# Η ίδια βάση μοιράζεται ανάμεσα στα worker processes (WAL mode) - κάθε process ανοίγει τη δική του σύνδεση.
+# CLI: python -m src.result_cache [--path P] stats | prune --max-mb N | clear [--stage S]
+
+import os
+import sys
+import time
+import pickle
+import sqlite3
+import hashlib
+import argparse
+import threading
+
+DEFAULT_RESULT_CACHE = os.path.join("data", "result_cache.sqlite")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+PRUNE_TARGET = 0.9     # μετά το eviction η cache πέφτει στο 90% του ορίου
+BUSY_TIMEOUT = 30.0    # δευτερόλεπτα αναμονής όταν άλλο process γράφει
+
+# Αλλάζει όταν αλλάζει η έξοδος του σταδίου (ακυρώνει μόνο τα entries αυτού του σταδίου)
+STAGE_VERSIONS = {
+    'preprocess': '1',
+    'syntactic': '1',
+    'correction': '3',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    stage TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO totals VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results
+    BEGIN UPDATE totals SET bytes = bytes + new.size; END;
+CREATE TRIGGER IF NOT EXISTS results_update AFTER UPDATE OF size ON results
+    BEGIN UPDATE totals SET bytes = bytes + new.size - old.size; END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results
+    BEGIN UPDATE totals SET bytes = bytes - old.size; END;
+"""
+
+# ============================== KEYS ==============================
+
+def stage_fingerprint(stage, config=None):
+    # Έκδοση του σταδίου + ό,τι επηρεάζει την έξοδό του (config: π.χ. {'symspell': True})
+    if stage not in STAGE_VERSIONS:
+        raise ValueError(f"Unknown stage: {stage} (available: {tuple(STAGE_VERSIONS)})")
+    parts = [STAGE_VERSIONS[stage]]
+    if stage == 'correction':
+        from .grammar_rules import rules_fingerprint
+        parts.append(rules_fingerprint())
+    if config:
+        parts.append(repr(sorted(config.items())))
+    return ':'.join(parts)
+
+
+def correction_payload(syntax):
+    # Το key του correction stage: το reconstructed κείμενο και το token stream του syntactic stage - το incremental
+    # retagging κρατάει tags της αρχικής πρότασης, οπότε το ίδιο κείμενο από άλλη πρόταση (ή σειρά) μπορεί να δώσει
+    # άλλη διόρθωση
+    stream = syntax.get('reconstructed_stream')
+    if stream is None:
+        return syntax['reconstructed']
+    return repr((syntax['reconstructed'], stream['tokens'], stream['origins'], stream['source_tokens'],
+                 stream['source_tags']))
+
+
+def stage_key(stage, fingerprint, payload):
+    # payload: η είσοδος του σταδίου (str, ή pos_tags ως λίστα από (token, tag))
+    if not isinstance(payload, str):
+        payload = repr([tuple(item) for item in payload])
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{stage}\0{fingerprint}\0".encode('utf-8'))
+    digest.update(payload.encode('utf-8', 'surrogatepass'))
+    return digest.digest()
+
+# ============================== CACHE ==============================
+
+class ResultCache:
+
+    def __init__(self, path=DEFAULT_RESULT_CACHE, max_bytes=DEFAULT_MAX_BYTES):
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be >= 1, got {max_bytes}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def fingerprint(self, stage, config=None):
+        key = (stage, repr(sorted(config.items())) if config else None)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            fingerprint = self._fingerprints[key] = stage_fingerprint(stage, config)
+        return fingerprint
+
+    def keys(self, stage, payloads, config=None):
+        fingerprint = self.fingerprint(stage, config)
+        return [stage_key(stage, fingerprint, payload) for payload in payloads]
+
+    def get_many(self, keys):
+        # dict key -> αποτέλεσμα για τα keys που υπάρχουν (ενημερώνει και το last_used τους)
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), 500):  # όριο παραμέτρων του SQLite
+                batch = unique[start:start + 500]
+                marks = ','.join('?' * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({marks})", batch
+                ).fetchall()
+                for key, value in rows:
+                    found[bytes(key)] = pickle.loads(value)
+                if rows:
+                    self._connection.execute(
+                        f"UPDATE results SET last_used = ? WHERE key IN ({marks})", [time.time()] + batch
+                    )
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, stage, items):
+        # items: iterable από (key, αποτέλεσμα) - ένα transaction, μετά eviction αν ξεπεράστηκε το όριο
+        now = time.time()
+        rows = []
+        for key, value in items:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, stage, blob, len(blob) + len(key), now))
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "INSERT INTO results (key, stage, value, size, last_used) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                    "last_used = excluded.last_used",
+                    rows,
+                )
+                if self._total_bytes() > self.max_bytes:
+                    self._evict(int(self.max_bytes * PRUNE_TARGET))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _total_bytes(self):
+        return self._connection.execute("SELECT bytes FROM totals").fetchone()[0]
+
+    def _evict(self, target_bytes):
+        # Σβήνει τα λιγότερο πρόσφατα χρησιμοποιημένα entries μέχρι τα δεδομένα να χωρούν στο target_bytes
+        excess = self._total_bytes() - target_bytes
+        if excess <= 0:
+            return 0
+        victims = []
+        for key, size in self._connection.execute("SELECT key, size FROM results ORDER BY last_used"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._connection.executemany("DELETE FROM results WHERE key = ?", victims)
+        return len(victims)
+
+    def prune(self, max_bytes=None):
+        # Eviction μέχρι max_bytes (default: το όριο της cache) - επιστρέφει πόσα entries σβήστηκαν
+        target = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                removed = self._evict(target)
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        if removed:
+            self._compact()
+        return removed
+
+    def clear(self, stage=None):
+        # Σβήνει όλα τα entries (ή μόνο ενός σταδίου)
+        with self._lock:
+            if stage is None:
+                cursor = self._connection.execute("DELETE FROM results")
+            else:
+                cursor = self._connection.execute("DELETE FROM results WHERE stage = ?", (stage,))
+        self._compact()
+        return cursor.rowcount
+
+    def _compact(self):
+        # Επιστροφή του χώρου στο filesystem μετά από μαζικό σβήσιμο
+        with self._lock:
+            self._connection.execute("VACUUM")
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def stats(self):
+        # Ανά στάδιο: entries και bytes, συνολικά bytes, όριο, μέγεθος αρχείου και hits/misses αυτού του process
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT stage, COUNT(*), COALESCE(SUM(size), 0) FROM results GROUP BY stage"
+            ).fetchall()
+            total = self._total_bytes()
+        return {
+            'stages': {stage: {'entries': entries, 'bytes': size} for stage, entries, size in rows},
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'file_bytes': sum(os.path.getsize(self.path + suffix)
+                              for suffix in ('', '-wal') if os.path.exists(self.path + suffix)),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def cached_batch(cache, stage, payloads, compute, config=None, key=None):
+    # Αποτελέσματα ενός σταδίου για μια λίστα από εισόδους: από την cache όσα υπάρχουν, compute(εισόδοι)
+    # για τα υπόλοιπα (με τη σειρά τους) - τα νέα αποθηκεύονται. cache=None: compute για όλα
+    # key: είσοδος -> payload του key (str ή pos_tags), αν η είσοδος δεν είναι ήδη τέτοια (π.χ. correction_payload)
+    if cache is None:
+        return list(compute(payloads))
+    keys = cache.keys(stage, payloads if key is None else [key(payload) for payload in payloads], config)
+    found = cache.get_many(keys)
+    missing = []  # θέση της πρώτης εμφάνισης κάθε key που λείπει (οι επαναλήψεις υπολογίζονται μία φορά)
+    pending = set()
+    for k, key in enumerate(keys):
+        if key not in found and key not in pending:
+            pending.add(key)
+            missing.append(k)
+    if missing:
+        computed = list(compute([payloads[k] for k in missing]))
+        cache.put_many(stage, ((keys[k], result) for k, result in zip(missing, computed)))
+        for k, result in zip(missing, computed):
+            found[keys[k]] = result
+    return [found[key] for key in keys]
+
+
+def format_cache_stats(stats):
+    lines = [f"{'stage':<12}{'entries':>10}{'MB':>10}"]
+    for stage, entry in sorted(stats['stages'].items()):
+        lines.append(f"{stage:<12}{entry['entries']:>10}{entry['bytes'] / 1e6:>10.3f}")
+    lines.append(f"total {stats['bytes'] / 1e6:.3f} MB (file {stats['file_bytes'] / 1e6:.3f} MB)")
+    return "\n".join(lines)
+
+# Lazy global: μία σύνδεση ανά process (None = χωρίς cache)
+_cache = None
+
+
+def get_result_cache():
+    return _cache
+
+
+def set_result_cache(cache):
+    global _cache
+    _cache = cache
+
+
+def configure_result_cache(path, max_bytes=DEFAULT_MAX_BYTES):
+    # Για initializers των worker processes: ανοίγει (ή κλείνει με path=None) την cache του process
+    set_result_cache(ResultCache(path, max_bytes) if path else None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Result cache του Deliverable 1A")
+    parser.add_argument("--path", default=DEFAULT_RESULT_CACHE, help="αρχείο SQLite της cache")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="entries και μέγεθος ανά στάδιο")
+    prune_parser = commands.add_parser("prune", help="eviction των λιγότερο πρόσφατων μέχρι το όριο")
+    prune_parser.add_argument("--max-mb", type=float, required=True, help="μέγιστο μέγεθος δεδομένων σε MB")
+    clear_parser = commands.add_parser("clear", help="σβήσιμο όλων των entries")
+    clear_parser.add_argument("--stage", choices=tuple(STAGE_VERSIONS), help="μόνο αυτό το στάδιο")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"Result cache not found: {args.path}")
+        sys.exit(1)
+    cache = ResultCache(args.path)
+    if args.command == "prune":
+        removed = cache.prune(int(args.max_mb * 1024 * 1024))
+        print(f"✓ {removed} entries removed")
+    elif args.command == "clear":
+        removed = cache.clear(args.stage)
+        print(f"✓ {removed} entries removed")
+    print(format_cache_stats(cache.stats()))
+    cache.close()
@@ -0,0 +1,336 @@
+# Τοπικός server για το Deliverable 1A (HTTP στο localhost)
+# Κάθε κλήση του CLI ξαναφορτώνει tagger, WordNet και contractions, οπότε για άλλα services η latency ανά κλήση
+# είναι σχεδόν όλη cold start. Ο server φορτώνει τα resources μία φορά (warm_up) και τα κρατάει warm.
+# API (JSON):
+#   POST /process  {"text": "..."} ή {"texts": ["...", ...]} -> {"results": [record, ...]} (records όπως στο
+#                  corpus_runner.process_chunk: original, reconstructed, corrected, problems_fixed ή error)
+#   GET  /stats    latency percentiles (p50/p90/p99/max σε ms), batches, απορρίψεις
+#   GET  /health
+# Micro-batching: τα requests μπαίνουν σε bounded ουρά και ένα thread τα μαζεύει σε batches (μέχρι max_batch
+# κείμενα ή batch_wait_ms από το πρώτο request του batch), ώστε το tagging να γίνεται μία φορά για όλο το batch
+# (process_chunk). Load shedding: όταν η ουρά είναι γεμάτη το request απορρίπτεται αμέσως με 503 + Retry-After,
+# αντί να μεγαλώνει η αναμονή όλων. Ένα request με περισσότερα από max_batch κείμενα απορρίπτεται με 413 (θα
+# κρατούσε μόνο του το thread του batcher) - ο client το στέλνει σε μικρότερα requests.
+
+import sys
+import json
+import math
+import time
+import queue
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from .preprocessing import warm_up, set_tagger_engine, DEFAULT_TAGGER_ENGINE
+from .corpus_runner import process_chunk, failed_chunk, DEFAULT_CHUNK_SIZE
+from .result_cache import configure_result_cache, DEFAULT_MAX_BYTES
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_WAIT_MS = 5.0
+DEFAULT_MAX_QUEUE = 256          # requests σε αναμονή - πάνω από αυτά 503
+REQUEST_TIMEOUT = 60.0           # s μέχρι 504
+MAX_BODY_BYTES = 8 * 1024 * 1024
+LATENCY_WINDOW = 10_000          # δείγματα ανά μετρική για τα percentiles
+PERCENTILES = (50, 90, 99)
+
+
+class Overloaded(Exception):
+    # Η ουρά του batcher είναι γεμάτη
+    pass
+
+
+class TooManyTexts(Exception):
+    # Request με περισσότερα κείμενα από ένα batch - θα κρατούσε το thread του batcher για όλους τους clients
+    pass
+
+# ============================== LATENCY ==============================
+
+def percentile(sorted_values, p):
+    # Nearest rank
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(1, math.ceil(p / 100 * len(sorted_values))) - 1]
+
+
+class LatencyTracker:
+    # Τα τελευταία `window` δείγματα (ms) ανά μετρική
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def add(self, name, ms):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(ms)
+
+    def summary(self):
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+        summary = {}
+        for name, values in snapshot.items():
+            entry = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+            entry['max'] = values[-1] if values else 0.0
+            entry['count'] = len(values)
+            summary[name] = entry
+        return summary
+
+# ============================== MICRO-BATCHER ==============================
+
+class _Request:
+    __slots__ = ('texts', 'received', 'started', 'results', 'done', 'abandoned')
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.received = time.perf_counter()
+        self.started = None
+        self.results = None
+        self.done = threading.Event()
+        self.abandoned = False  # ο client πήρε ήδη 504 - ο batcher το παραλείπει
+
+
+class MicroBatcher:
+    # process(texts) -> records (ένα ανά κείμενο, ίδια σειρά) - τρέχει πάντα στο thread του batcher
+
+    def __init__(self, process=process_chunk, max_batch=DEFAULT_CHUNK_SIZE, batch_wait_ms=DEFAULT_BATCH_WAIT_MS,
+                 max_queue=DEFAULT_MAX_QUEUE, latency=None):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+        self.process = process
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait_ms / 1000
+        self.latency = latency if latency is not None else LatencyTracker()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self.counters = {'requests': 0, 'texts': 0, 'rejected': 0, 'batches': 0, 'failed_batches': 0,
+                         'failed_requests': 0, 'abandoned': 0}
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def submit(self, texts):
+        # Επιστρέφει το request (περιμένει κανείς το request.done) ή σηκώνει Overloaded / TooManyTexts
+        if len(texts) > self.max_batch:
+            self._count('rejected')
+            raise TooManyTexts(f"{len(texts)} texts in one request (max {self.max_batch})")
+        request = _Request(texts)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            self._count('rejected')
+            raise Overloaded(f"queue full ({self._queue.maxsize} requests)")
+        return request
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            size = len(first.texts)
+            stop = False
+            # Μαζεύουμε όσα requests φτάσουν μέσα σε batch_wait από το πρώτο, μέχρι max_batch κείμενα
+            deadline = first.received + self.batch_wait
+            while size < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch):
+        # Τα requests που έληξαν (504) όσο περίμεναν στην ουρά δεν υπολογίζονται
+        abandoned = [request for request in batch if request.abandoned]
+        batch = [request for request in batch if not request.abandoned]
+        if abandoned:
+            self._count('abandoned', len(abandoned))
+            for request in abandoned:
+                request.done.set()
+        if not batch:
+            return
+        texts = [text for request in batch for text in request.texts]
+        started = time.perf_counter()
+        try:
+            records = self.process(texts)
+        except Exception:
+            # Το κοινό batch απέτυχε: κάθε request ξανά μόνο του, ώστε ένα κακό request να μην ρίχνει και τα
+            # υπόλοιπα του batch
+            self._count('failed_batches')
+            records = []
+            for request in batch:
+                try:
+                    records.extend(self.process(request.texts))
+                except Exception as e:
+                    records.extend(failed_chunk(request.texts, e))
+                    self._count('failed_requests')
+        self.latency.add('batch', (time.perf_counter() - started) * 1000)
+        with self._lock:
+            self.counters['batches'] += 1
+            self.counters['requests'] += len(batch)
+            self.counters['texts'] += len(texts)
+
+        position = 0
+        for request in batch:
+            request.started = started
+            request.results = records[position:position + len(request.texts)]
+            position += len(request.texts)
+            self.latency.add('queue', (started - request.received) * 1000)
+            request.done.set()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        counters['mean_batch_texts'] = counters['texts'] / counters['batches'] if counters['batches'] else 0.0
+        counters['queue_depth'] = self.queue_depth()
+        counters['max_queue'] = self._queue.maxsize
+        return dict(counters, latency_ms=self.latency.summary())
+
+# ============================== HTTP ==============================
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "Paradoteo1A"
+    protocol_version = "HTTP/1.1"  # keep-alive για clients που στέλνουν πολλά requests
+
+    def log_message(self, format, *args):
+        pass  # χωρίς γραμμή στο stderr ανά request
+
+    def _send_json(self, status, payload, headers=()):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.batcher.stats())
+        else:
+            self._send_json(404, {'error': f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/process":
+            self._send_json(404, {'error': f"unknown path {self.path}"})
+            return
+        received = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(f"invalid Content-Length {length}")
+        except ValueError as e:
+            self.close_connection = True  # χωρίς έγκυρο μήκος το body δεν διαβάζεται
+            self._send_json(400, {'error': str(e)})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True  # το body δεν διαβάζεται
+            self._send_json(413, {'error': f"body over {MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            texts = _parse_texts(json.loads(self.rfile.read(length) or b'null'))
+        except ValueError as e:  # και json.JSONDecodeError / UnicodeDecodeError
+            self._send_json(400, {'error': str(e)})
+            return
+
+        if not texts:
+            self._send_json(200, {'results': []})
+            return
+        batcher = self.server.batcher
+        try:
+            request = batcher.submit(texts)
+        except Overloaded as e:
+            self._send_json(503, {'error': str(e)}, headers=[("Retry-After", "1")])
+            return
+        except TooManyTexts as e:
+            self._send_json(413, {'error': str(e)})
+            return
+        if not request.done.wait(REQUEST_TIMEOUT):
+            request.abandoned = True
+            self._send_json(504, {'error': f"no result after {REQUEST_TIMEOUT:.0f}s"})
+            return
+        self._send_json(200, {'results': request.results})
+        batcher.latency.add('request', (time.perf_counter() - received) * 1000)
+
+
+def _parse_texts(payload):
+    # {"text": "..."} ή {"texts": [...]} -> λίστα από κείμενα
+    if isinstance(payload, dict) and isinstance(payload.get('text'), str):
+        return [payload['text']]
+    if isinstance(payload, dict) and isinstance(payload.get('texts'), list) \
+            and all(isinstance(text, str) for text in payload['texts']):
+        return payload['texts']
+    raise ValueError("expected {\"text\": \"...\"} or {\"texts\": [\"...\", ...]}")
+
+
+class PipelineServer(ThreadingHTTPServer):
+    # Ένα thread ανά σύνδεση για το HTTP, ένα thread (ο batcher) για το pipeline
+    daemon_threads = True
+    request_queue_size = 128  # backlog του listen() - με το default (5) οι ταυτόχρονες συνδέσεις παίρνουν reset
+
+    def __init__(self, address, batcher):
+        super().__init__(address, _Handler)
+        self.batcher = batcher
+
+
+def format_server_stats(stats):
+    # Πίνακας percentiles ανά μετρική: request (συνολικά στον server), queue (αναμονή για batch), batch (pipeline)
+    lines = [
+        f"{stats['requests']} requests, {stats['texts']} texts in {stats['batches']} batches "
+        f"({stats['mean_batch_texts']:.1f} texts/batch), {stats['rejected']} rejected, "
+        f"{stats['failed_batches']} failed batches ({stats['failed_requests']} failed requests), "
+        f"{stats['abandoned']} abandoned",
+        f"{'latency (ms)':<14}" + "".join(f"{f'p{p}':>9}" for p in PERCENTILES) + f"{'max':>9}{'count':>9}",
+    ]
+    for name, entry in stats['latency_ms'].items():
+        lines.append(f"{name:<14}" + "".join(f"{entry[f'p{p}']:>9.1f}" for p in PERCENTILES)
+                     + f"{entry['max']:>9.1f}{entry['count']:>9}")
+    return "\n".join(lines)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, max_batch=DEFAULT_CHUNK_SIZE, batch_wait_ms=DEFAULT_BATCH_WAIT_MS,
+          max_queue=DEFAULT_MAX_QUEUE, cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES,
+          tagger_engine=DEFAULT_TAGGER_ENGINE):
+    # Φορτώνει τα resources, ξεκινάει τον server και τρέχει μέχρι Ctrl+C - στο τέλος τυπώνει τα stats
+    configure_result_cache(cache_path, cache_max_bytes)
+    set_tagger_engine(tagger_engine)
+    print("Warming up NLTK resources...", file=sys.stderr)
+    warm_up()
+    batcher = MicroBatcher(max_batch=max_batch, batch_wait_ms=batch_wait_ms, max_queue=max_queue)
+    batcher.start()
+    server = PipelineServer((host, port), batcher)
+    print(f"✓ Serving on http://{host}:{server.server_address[1]} (POST /process, GET /stats)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        print(format_server_stats(batcher.stats()), file=sys.stderr)
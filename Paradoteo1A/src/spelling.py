@@ -0,0 +1,222 @@
+# Ορθογραφική διόρθωση με λεξικό λαθών (misspelling -> correction) σε ένα πέρασμα
+# Αντί για ένα re.sub ανά καταχώρηση, το λεξικό γίνεται compile μία φορά σε:
+# - dict για λέξεις (O(1) lookup ανά λέξη, ανεξάρτητα από το μέγεθος του λεξικού)
+# - trie σε επίπεδο λέξεων για φράσεις ("their are"), με κλειδί την πρώτη λέξη
+# Το κείμενο σαρώνεται μία φορά λέξη-λέξη (λέξη = \w+, όπως τα \b του regex), case-insensitive,
+# και σε κάθε θέση εφαρμόζεται η μεγαλύτερη φράση που ταιριάζει, αλλιώς η λέξη.
+# Αλυσίδες λύνονται στο compile: "thier" -> "their" και "their are" -> "there are" δίνουν "thier are" -> "there are".
+# Οι φράσεις ταιριάζουν και με ορθογραφικά λάθη στις λέξεις τους: κάθε λέξη του κειμένου συγκρίνεται με τη λέξη της
+# φράσης και ως έχει και διορθωμένη (ανά token στο σάρωμα, χωρίς να παράγονται όλες οι παραλλαγές στο compile).
+# Τα λεξικά φορτώνονται από αρχείο TSV: misspelling<TAB>correction ανά γραμμή (# για σχόλια).
+
+import os
+import re
+import sys
+import time
+
+DEFAULT_SPELLING_DICTIONARY = os.path.join("data", "spelling_corrections.tsv")
+
+# Dictionary με κοινά ορθογραφικά → σωστές φόρμες (έχει μόνο πολύ συνηθισμένα λάθη)
+DEFAULT_SPELLING_CORRECTIONS = {
+    # συχνά typos
+    'recieve': 'receive',
+    'occured': 'occurred',
+    'seperate': 'separate',
+    'definately': 'definitely',
+    'wierd': 'weird',
+    'neccessary': 'necessary',
+    'occasion': 'occasion',
+    'publically': 'publicly',
+    'thier': 'their',
+    'beleive': 'believe',
+    'beggining': 'beginning',
+    'commited': 'committed',
+    'existance': 'existence',
+    'consious': 'conscious',
+    'fourty': 'forty',
+    'untill': 'until',
+
+    # συντομεύσεις χωρίς απόστροφο
+    'cant': "can't",
+    'dont': "don't",
+    'didnt': "didn't",
+    'isnt': "isn't",
+    'arent': "aren't",
+    'wasnt': "wasn't",
+    'werent': "weren't",
+    'hasnt': "hasn't",
+    'havent': "haven't",
+    'hadnt': "hadn't",
+    'wont': "won't",
+    'wouldnt': "wouldn't",
+    'shouldnt': "shouldn't",
+    'couldnt': "couldn't",
+
+    # πιο συγκεκριμένα
+    'alot': 'a lot',
+    'their are': 'there are',
+    'your welcome': "you're welcome",
+}
+
+_WORD = re.compile(r'\w+')
+
+# ============================== MATCHER ==============================
+
+class SpellingCorrector:
+
+    def __init__(self, corrections):
+        # corrections: dict ή iterable από (misspelling, correction) - σε σύγκρουση κρατιέται η τελευταία
+        if isinstance(corrections, dict):
+            corrections = corrections.items()
+        # Καταχωρήσεις που δεν αποτελούνται μόνο από λέξεις (π.χ. με απόστροφο) δεν μπορούν να ταιριάξουν - αγνοούνται
+        entries = {}
+        self.skipped = 0
+        for misspelling, correction in corrections:
+            key = ' '.join(misspelling.lower().split())
+            if not key or ' '.join(_WORD.findall(key)) != key:
+                self.skipped += 1
+                continue
+            entries[key] = correction
+
+        # Αλυσίδες: η διόρθωση που είναι η ίδια καταχώρηση ακολουθείται μέχρι να σταθεροποιηθεί
+        resolved = {key: self._resolve(entries, key) for key in entries}
+
+        self.words = {key: value for key, value in resolved.items() if ' ' not in key}
+        phrases = {tuple(key.split()): value for key, value in resolved.items() if ' ' in key}
+
+        # Λέξη με ορθογραφικό λάθος -> η διορθωμένη μορφή της, για να ταιριάζουν οι φράσεις ("thier are" -> "there are")
+        self.canonical = {word: correction.lower() for word, correction in self.words.items()
+                          if correction.lower() != word}
+
+        # Trie ανά πρώτη λέξη: (υπόλοιπες λέξεις, διόρθωση), οι μεγαλύτερες φράσεις πρώτα
+        self.phrases = {}
+        for order, (words, value) in enumerate(phrases.items()):
+            self.phrases.setdefault(words[0], []).append((words[1:], value, order))
+        for candidates in self.phrases.values():
+            candidates.sort(key=lambda candidate: -len(candidate[0]))
+
+    @staticmethod
+    def _resolve(entries, key):
+        seen = {key}
+        value = entries[key]
+        while value.lower() in entries and value.lower() not in seen:
+            seen.add(value.lower())
+            value = entries[value.lower()]
+        return value
+
+    def __len__(self):
+        return len(self.words) + sum(len(candidates) for candidates in self.phrases.values())
+
+    def _match_phrase(self, text, matches, words, i):
+        # Η μεγαλύτερη φράση που ξεκινάει στη λέξη i -> (τελευταία λέξη, αυτούσια, -σειρά, διόρθωση) ή None
+        # Σε ίδιο μήκος προτιμάται η φράση που ταιριάζει αυτούσια (χωρίς διόρθωση λέξεων), μετά η πρώτη του λεξικού
+        canonical = self.canonical
+        best = None
+        for key in {words[i], canonical.get(words[i], words[i])}:
+            for rest, value, order in self.phrases.get(key, ()):
+                end = i + len(rest)
+                if best is not None and end < best[0]:
+                    break  # οι υπόλοιπες υποψήφιες είναι μικρότερες
+                if end >= len(matches):
+                    continue
+                phrase = (key,) + rest
+                span = words[i:end + 1]
+                if not all(word == phrase_word or canonical.get(word) == phrase_word
+                           for word, phrase_word in zip(span, phrase)):
+                    continue
+                # οι λέξεις της φράσης χωρίζονται με ακριβώς ένα κενό
+                if not all(text[matches[j].end():matches[j + 1].start()] == ' ' for j in range(i, end)):
+                    continue
+                candidate = (end, tuple(span) == phrase, -order, value)
+                if best is None or candidate[:3] > best[:3]:
+                    best = candidate
+        return best
+
+    def correct(self, text):
+        matches = list(_WORD.finditer(text))
+        words = [match.group().lower() for match in matches]
+
+        parts = []
+        position = 0
+        i = 0
+        while i < len(matches):
+            replacement = None
+            last = i
+
+            if words[i] in self.phrases or words[i] in self.canonical:
+                match = self._match_phrase(text, matches, words, i)
+                if match is not None:
+                    last, replacement = match[0], match[3]
+
+            if replacement is None:
+                replacement = self.words.get(words[i])
+
+            if replacement is not None:
+                parts.append(text[position:matches[i].start()])
+                parts.append(replacement)
+                position = matches[last].end()
+            i = last + 1
+
+        parts.append(text[position:])
+        return ''.join(parts)
+
+# ============================== DICTIONARY I/O ==============================
+
+def load_spelling_dictionary(filepath):
+    # TSV: misspelling<TAB>correction - κενές γραμμές και γραμμές με # αγνοούνται
+    corrections = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip('\r\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            fields = line.split('\t')
+            if len(fields) != 2 or not fields[0].strip():
+                raise ValueError(f"{filepath}:{line_number}: expected 'misspelling<TAB>correction'")
+            corrections.append((fields[0].strip(), fields[1].strip()))
+    return corrections
+
+
+def save_spelling_dictionary(corrections, filepath):
+    if isinstance(corrections, dict):
+        corrections = corrections.items()
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for misspelling, correction in corrections:
+            f.write(f"{misspelling}\t{correction}\n")
+
+
+def load_spelling_corrector(filepath=DEFAULT_SPELLING_DICTIONARY):
+    # Το default λεξικό + οι καταχωρήσεις του αρχείου (αν υπάρχει), που υπερισχύουν
+    corrections = list(DEFAULT_SPELLING_CORRECTIONS.items())
+    if filepath and os.path.exists(filepath):
+        corrections += load_spelling_dictionary(filepath)
+    return SpellingCorrector(corrections)
+
+# Lazy global: compile μία φορά ανά process
+_corrector = None
+
+
+def get_spelling_corrector():
+    global _corrector
+    if _corrector is None:
+        _corrector = load_spelling_corrector()
+    return _corrector
+
+
+def set_spelling_corrector(corrector):
+    # Αντικατάσταση του λεξικού που χρησιμοποιεί το apply_spelling_correction
+    global _corrector
+    _corrector = corrector
+
+
+if __name__ == "__main__":
+    # python -m src.spelling <dictionary.tsv> [text] : compile ενός λεξικού και διόρθωση κειμένου
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.spelling <dictionary.tsv> [text]")
+        sys.exit(1)
+    start = time.perf_counter()
+    corrector = load_spelling_corrector(sys.argv[1])
+    print(f"Compiled {len(corrector)} entries in {time.perf_counter() - start:.2f}s")
+    if len(sys.argv) > 2:
+        print(corrector.correct(' '.join(sys.argv[2:])))
@@ -0,0 +1,233 @@
+# Pipelined εκτέλεση των τριών σταδίων του Deliverable 1A (producer/consumer)
+# Κάθε στάδιο (preprocessing, syntactic, correction) τρέχει στο δικό του pool από processes,
+# τα στάδια συνδέονται με bounded queues (backpressure: όταν γεμίσει μια ουρά, το προηγούμενο στάδιο περιμένει).
+# Ο αριθμός workers ρυθμίζεται ανά στάδιο ώστε το πιο αργό στάδιο να παίρνει περισσότερους.
+# Για κάθε στάδιο μετράμε βάθος ουράς εισόδου και utilisation για να φαίνεται το bottleneck.
+# Με cache_path κάθε στάδιο διαβάζει / γράφει τη result cache (src/result_cache.py) για το δικό του αποτέλεσμα.
+
+import time
+import queue
+import threading
+import multiprocessing
+
+from .preprocessing import (preprocess_pipeline, warm_up, set_tagger_engine, tagger_cache_config, LEAN_STAGES,
+                            DEFAULT_TAGGER_ENGINE)
+from .syntactic_analysis import syntactic_analysis_pipeline
+from .grammatical_correction import grammatical_correction_pipeline
+from .result_cache import get_result_cache, configure_result_cache, cached_batch, correction_payload, DEFAULT_MAX_BYTES
+
+DEFAULT_QUEUE_SIZE = 64
+QUEUE_SAMPLE_INTERVAL = 0.05
+
+# ============================== STAGES ==============================
+# Κάθε στάδιο δέχεται το record (dict) και το συμπληρώνει
+
+def _preprocess_stage(record):
+    record['pos_tags'], = cached_batch(get_result_cache(), 'preprocess', [record['original']], lambda batch: [
+        preprocess_pipeline(batch[0], False, keep=LEAN_STAGES)['pos_tags']
+    ], config=tagger_cache_config())
+
+
+def _syntactic_stage(record):
+    syntax, = cached_batch(get_result_cache(), 'syntactic', [record.pop('pos_tags')], lambda batch: [
+        syntactic_analysis_pipeline(batch[0], False, details=False)
+    ])
+    record['reconstructed'] = syntax['reconstructed']
+    record['problems_fixed'] = syntax['problems_fixed']
+    record['reconstructed_stream'] = syntax['reconstructed_stream']
+
+
+def _correction_stage(record):
+    # το token stream του syntactic stage χρησιμοποιείται μόνο για το retagging, δεν μένει στο record
+    syntax = {'reconstructed': record['reconstructed'], 'reconstructed_stream': record.pop('reconstructed_stream', None)}
+    record['corrected'], = cached_batch(get_result_cache(), 'correction', [syntax], lambda batch: [
+        grammatical_correction_pipeline(batch[0]['reconstructed'], False, stream=batch[0]['reconstructed_stream'])
+    ], config=tagger_cache_config(), key=correction_payload)
+
+
+STAGES = (
+    ('preprocess', _preprocess_stage),
+    ('syntactic', _syntactic_stage),
+    ('correction', _correction_stage),
+)
+
+# ============================== WORKERS ==============================
+
+def _stage_worker(stage_index, in_queue, out_queue, stats_queue, cache=(None, DEFAULT_MAX_BYTES),
+                  tagger_engine=DEFAULT_TAGGER_ENGINE):
+    # Worker ενός σταδίου: διαβάζει (seq, record) μέχρι το sentinel None
+    # Records με error περνάνε απευθείας στο επόμενο στάδιο
+    name, stage = STAGES[stage_index]
+    configure_result_cache(*cache)
+    set_tagger_engine(tagger_engine)
+    if name in ('preprocess', 'correction'):
+        warm_up()
+
+    started = time.perf_counter()
+    busy = 0.0
+    processed = 0
+    while True:
+        item = in_queue.get()
+        if item is None:
+            break
+        seq, record = item
+        if 'error' not in record:
+            begin = time.perf_counter()
+            try:
+                stage(record)
+            except Exception as e:
+                record['error'] = f"{name}: {type(e).__name__}: {e}"
+            busy += time.perf_counter() - begin
+            processed += 1
+        out_queue.put((seq, record))
+
+    stats_queue.put((stage_index, processed, busy, time.perf_counter() - started))
+
+
+def _queue_depth(stage_queue):
+    try:
+        return stage_queue.qsize()
+    except NotImplementedError:  # macOS
+        return None
+
+# ============================== PIPELINED EXECUTION ==============================
+
+def run_pipelined(texts, stage_workers=(1, 1, 1), queue_size=DEFAULT_QUEUE_SIZE, stats=None,
+                  cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES, tagger_engine=DEFAULT_TAGGER_ENGINE):
+    # Generator: επιστρέφει records με τη σειρά της εισόδου (ίδια μορφή με το run_corpus)
+    # stage_workers: workers ανά στάδιο (preprocess, syntactic, correction)
+    # cache_path: αρχείο της result cache (None: χωρίς cache)
+    # tagger_engine: 'perceptron' ή 'numpy' (preprocessing.TAGGER_ENGINES)
+    # stats (dict, προαιρετικό): records, elapsed, records_per_sec και ανά στάδιο
+    #   workers, processed, busy, utilisation, queue_mean, queue_max
+    if len(stage_workers) != len(STAGES) or min(stage_workers) < 1:
+        raise ValueError(f"stage_workers must have {len(STAGES)} values >= 1, got {stage_workers}")
+    if stats is None:
+        stats = {}
+
+    context = multiprocessing.get_context()
+    # queues[k] = είσοδος του σταδίου k, queues[-1] = έξοδος του τελευταίου σταδίου
+    queues = [context.Queue(maxsize=queue_size) for _ in range(len(STAGES) + 1)]
+    stats_queue = context.Queue()
+    pending = {}  # seq -> original, για records που χάθηκαν σε crash
+    pending_lock = threading.Lock()
+    finished = threading.Event()
+
+    pools = []
+    for stage_index, workers in enumerate(stage_workers):
+        pool = [
+            context.Process(
+                target=_stage_worker,
+                args=(stage_index, queues[stage_index], queues[stage_index + 1], stats_queue,
+                      (cache_path, cache_max_bytes), tagger_engine),
+                daemon=True,
+            )
+            for _ in range(workers)
+        ]
+        for process in pool:
+            process.start()
+        pools.append(pool)
+
+    feed_errors = []  # exception του iterator εισόδου - ξανασηκώνεται στον generator αφού βγουν τα records πριν από αυτό
+
+    def feed():
+        try:
+            for seq, text in enumerate(texts):
+                with pending_lock:
+                    pending[seq] = text
+                queues[0].put((seq, {'original': text}))
+        except BaseException as e:
+            feed_errors.append(e)
+        finally:
+            # τα sentinels μπαίνουν πάντα, αλλιώς τα στάδια (και ο generator) περιμένουν για πάντα
+            for _ in range(stage_workers[0]):
+                queues[0].put(None)
+
+    def close_stage(stage_index):
+        # Όταν τελειώσουν όλοι οι workers ενός σταδίου, στείλε sentinels στο επόμενο
+        for process in pools[stage_index]:
+            process.join()
+        next_workers = stage_workers[stage_index + 1] if stage_index + 1 < len(STAGES) else 1
+        for _ in range(next_workers):
+            queues[stage_index + 1].put(None)
+
+    depth_samples = [[] for _ in STAGES]
+
+    def sample_queues():
+        while not finished.wait(QUEUE_SAMPLE_INTERVAL):
+            for stage_index in range(len(STAGES)):
+                depth = _queue_depth(queues[stage_index])
+                if depth is not None:
+                    depth_samples[stage_index].append(depth)
+
+    threads = [threading.Thread(target=feed, daemon=True), threading.Thread(target=sample_queues, daemon=True)]
+    threads += [threading.Thread(target=close_stage, args=(k,), daemon=True) for k in range(len(STAGES))]
+    for thread in threads:
+        thread.start()
+
+    start = time.perf_counter()
+    records = 0
+    ready = {}
+    next_seq = 0
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is None:
+                break
+            seq, record = item
+            ready[seq] = record
+            while next_seq in ready:
+                with pending_lock:
+                    pending.pop(next_seq, None)
+                yield ready.pop(next_seq)
+                records += 1
+                next_seq += 1
+
+        # Ό,τι έμεινε χάθηκε σε worker που κατέρρευσε
+        with pending_lock:
+            lost = dict(pending)
+        for seq in sorted(set(lost) | set(ready)):
+            record = ready.pop(seq, None) or {'original': lost[seq], 'error': "worker process died"}
+            yield record
+            records += 1
+        if feed_errors:
+            raise feed_errors[0]
+    finally:
+        finished.set()
+        for pool in pools:
+            for process in pool:
+                if process.is_alive():
+                    process.terminate()
+
+    elapsed = time.perf_counter() - start
+    stats.update({'records': records, 'elapsed': elapsed, 'records_per_sec': records / elapsed if elapsed > 0 else 0.0})
+
+    stage_stats = {name: {'workers': workers, 'processed': 0, 'busy': 0.0, 'lifetime': 0.0}
+                   for (name, _), workers in zip(STAGES, stage_workers)}
+    for _ in range(sum(stage_workers)):
+        try:
+            stage_index, processed, busy, lifetime = stats_queue.get(timeout=1.0)
+        except queue.Empty:  # worker που κατέρρευσε δεν στέλνει stats
+            break
+        entry = stage_stats[STAGES[stage_index][0]]
+        entry['processed'] += processed
+        entry['busy'] += busy
+        entry['lifetime'] += lifetime
+    for stage_index, (name, _) in enumerate(STAGES):
+        entry = stage_stats[name]
+        samples = depth_samples[stage_index]
+        entry['utilisation'] = entry['busy'] / entry['lifetime'] if entry['lifetime'] > 0 else 0.0
+        entry['queue_mean'] = sum(samples) / len(samples) if samples else 0.0
+        entry['queue_max'] = max(samples) if samples else 0
+    stats['stages'] = stage_stats
+
+
+def format_stage_stats(stats):
+    # Πίνακας ανά στάδιο - το στάδιο με υψηλό utilisation και γεμάτη ουρά εισόδου είναι το bottleneck
+    lines = [f"{'stage':<12}{'workers':>8}{'processed':>11}{'busy(s)':>10}{'util':>7}{'queue avg':>11}{'queue max':>11}"]
+    for name, entry in stats.get('stages', {}).items():
+        lines.append(
+            f"{name:<12}{entry['workers']:>8}{entry['processed']:>11}{entry['busy']:>10.2f}"
+            f"{entry['utilisation']:>7.0%}{entry['queue_mean']:>11.1f}{entry['queue_max']:>11}"
+        )
+    return "\n".join(lines)
@@ -1,7 +1,12 @@
 # Συντακτική ανακατασκευή χρησιμοποιώντας ετικέτες POS, εξαγωγή ουσιαστικών (noun),
 # string transformation με βάση κανόνες και pattern matching
-import re
 from typing import List, Tuple, Dict
+from .plan_cache import PlanCache
+from nlp_common.postprocessing import postprocess
+from .tagged_sentence import (
+    TaggedSentence, tag_class, tag_masks, token_list, token_text, select, move,
+    NOUN, PRONOUN, POSSESSIVE, DETERMINER, ADJECTIVE, ADVERB, VERB, MODAL, PREPOSITION, PARTICLE, CONJUNCTION,
+)
 
 # ============== CONSTANTS ==============
 
@@ -46,6 +51,8 @@ AUXILIARY_VERBS = {
 
 # RP = phrasal verb particles πχ up, out, pick up
 
+# Οι έλεγχοι κατηγορίας γίνονται με bitmasks (tagged_sentence.py): masks[i] & NOUN αντί για
+# pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']
 
 
 # ============== STEP 1: POS PATTERN DETECTION ==============
@@ -58,32 +65,35 @@ def identify_noun_phrases(pos_tags):
     # - NN(S)? alone
     # - PRP alone
     # Επιστρέφει: List[Tuple[start_idx, end_idx, tokens]]
+    masks = tag_masks(pos_tags)
+    tokens = token_list(pos_tags)
+    n = len(masks)
     noun_phrases = []
     i = 0
     
-    while i < len(pos_tags):
+    while i < n:
         phrase_start = i
         phrase_tokens = []
         
         # Pronouns alone (PRP)
-        if pos_tags[i][1] == 'PRP':
-            noun_phrases.append((i, i+1, [pos_tags[i][0]]))
+        if masks[i] & PRONOUN:
+            noun_phrases.append((i, i+1, [tokens[i]]))
             i += 1
             continue
         
         # Determiners (DT) or Possessives (PRP$)
-        if pos_tags[i][1] in ['DT', 'PRP$']:
-            phrase_tokens.append(pos_tags[i][0])
+        if masks[i] & (DETERMINER | POSSESSIVE):
+            phrase_tokens.append(tokens[i])
             i += 1
         
         # Adjectives (JJ, JJR, JJS)
-        while i < len(pos_tags) and pos_tags[i][1] in ['JJ', 'JJR', 'JJS']:
-            phrase_tokens.append(pos_tags[i][0])
+        while i < n and masks[i] & ADJECTIVE:
+            phrase_tokens.append(tokens[i])
             i += 1
         
         # Nouns (NN, NNS, NNP, NNPS)
-        if i < len(pos_tags) and pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
-            phrase_tokens.append(pos_tags[i][0])
+        if i < n and masks[i] & NOUN:
+            phrase_tokens.append(tokens[i])
             i += 1
             
             # We have a noun phrase
@@ -93,8 +103,8 @@ def identify_noun_phrases(pos_tags):
             # Not a complete noun phrase
             if len(phrase_tokens) == 0:
                 # Check if standalone noun
-                if i < len(pos_tags) and pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
-                    noun_phrases.append((i, i+1, [pos_tags[i][0]]))
+                if i < n and masks[i] & NOUN:
+                    noun_phrases.append((i, i+1, [tokens[i]]))
                     i += 1
                 else:
                     i = phrase_start + 1
@@ -106,26 +116,29 @@ def identify_noun_phrases(pos_tags):
 # Αναγνώριση ομάδων ρημάτων και διάκριση βοηθητικών από κύριων ρημάτων 
 def find_verb_groups(pos_tags):
     # Επιστρέφει: List of (start_idx, end_idx, tokens, is_main_verb)
+    masks = tag_masks(pos_tags)
+    tokens = token_list(pos_tags)
+    n = len(masks)
     verb_groups = []
     i = 0
     
-    while i < len(pos_tags):
+    while i < n:
         phrase_start = i
         phrase_tokens = []
         
         # Έλεγχος κύριου ή δευτερεύων / βοηθητικού
-        if pos_tags[i][1] == 'MD' or (pos_tags[i][1].startswith('VB') and pos_tags[i][0].lower() in AUXILIARY_VERBS):
-            phrase_tokens.append(pos_tags[i][0])
+        if masks[i] & MODAL or (masks[i] & VERB and tokens[i].lower() in AUXILIARY_VERBS):
+            phrase_tokens.append(tokens[i])
             i += 1
         
         # κύριο ρήμα
-        if i < len(pos_tags) and pos_tags[i][1].startswith('VB'):
-            phrase_tokens.append(pos_tags[i][0])
-            is_main = pos_tags[i][0].lower() not in AUXILIARY_VERBS
+        if i < n and masks[i] & VERB:
+            phrase_tokens.append(tokens[i])
+            is_main = tokens[i].lower() not in AUXILIARY_VERBS
             i += 1
             
-            if i < len(pos_tags) and pos_tags[i][1] == 'RP':
-                phrase_tokens.append(pos_tags[i][0])
+            if i < n and masks[i] & PARTICLE:
+                phrase_tokens.append(tokens[i])
                 i += 1
             
             if len(phrase_tokens) > 0:
@@ -142,12 +155,93 @@ def find_verb_groups(pos_tags):
 def detect_subordinate_conjunctions(pos_tags):
     subordinate_markers = []
     
-    for i, (token, pos) in enumerate(pos_tags):
+    for i, token in enumerate(token_list(pos_tags)):
         if token.lower() in SUBORDINATE_CONJUNCTIONS:
             subordinate_markers.append((i, token.lower()))
     
     return subordinate_markers
 
+# ============== ANALYSIS CONTEXT ==============
+
+class AnalysisContext:
+    # Αποτελέσματα ανάλυσης για μία (υπο)ακολουθία pos_tags, υπολογίζονται μία φορά (lazily)
+    # και τα ξαναχρησιμοποιούν όλοι οι consumers (SVO, clauses, reorder, problem detection)
+    # Ισχύει μόνο όσο η ακολουθία δεν αλλάζει - μετά από διόρθωση χρειάζεται νέο context
+    __slots__ = ('pos_tags', '_noun_phrases', '_np_index', '_verb_groups', '_subordinate_markers',
+                 '_prepositional_phrases', '_svo_layout', '_svo_components')
+
+    def __init__(self, pos_tags):
+        self.pos_tags = pos_tags
+        self._noun_phrases = None
+        self._np_index = None
+        self._verb_groups = None
+        self._subordinate_markers = None
+        self._prepositional_phrases = None
+        self._svo_layout = None
+        self._svo_components = None
+
+    @property
+    def noun_phrases(self):
+        if self._noun_phrases is None:
+            self._noun_phrases = identify_noun_phrases(self.pos_tags)
+        return self._noun_phrases
+
+    @property
+    def np_index(self):
+        # (by_start, by_end): NP spans με κλειδί τη θέση αρχής / τέλους τους
+        if self._np_index is None:
+            self._np_index = build_span_index(self.noun_phrases)
+        return self._np_index
+
+    @property
+    def verb_groups(self):
+        if self._verb_groups is None:
+            self._verb_groups = find_verb_groups(self.pos_tags)
+        return self._verb_groups
+
+    @property
+    def subordinate_markers(self):
+        if self._subordinate_markers is None:
+            self._subordinate_markers = detect_subordinate_conjunctions(self.pos_tags)
+        return self._subordinate_markers
+
+    @property
+    def prepositional_phrases(self):
+        if self._prepositional_phrases is None:
+            self._prepositional_phrases = extract_prepositional_phrases(self.pos_tags, self.noun_phrases, self.np_index[0])
+        return self._prepositional_phrases
+
+    @property
+    def svo_layout(self):
+        if self._svo_layout is None:
+            self._svo_layout = extract_svo_layout(self.pos_tags, self)
+        return self._svo_layout
+
+    @property
+    def svo_components(self):
+        if self._svo_components is None:
+            self._svo_components = extract_svo_components(self.pos_tags, self)
+        return self._svo_components
+
+
+def build_span_index(spans):
+    # Index θέσεων για spans (start, end, ...): by_start[start] -> span, by_end[end] -> span
+    # Τα NP spans δεν επικαλύπτονται, οπότε κάθε θέση αρχής/τέλους αντιστοιχεί σε ένα span
+    # (σε ισοπαλία κρατάμε το πρώτο, όπως οι γραμμικές αναζητήσεις που αντικαθιστά)
+    by_start = {}
+    by_end = {}
+    for span in spans:
+        by_start.setdefault(span[0], span)
+        by_end.setdefault(span[1], span)
+    return by_start, by_end
+
+
+def _context_for(pos_tags, context):
+    # Το context του caller αν αφορά την ίδια ακολουθία, αλλιώς νέο
+    if context is not None and context.pos_tags is pos_tags:
+        return context
+    return AnalysisContext(pos_tags)
+
 # ============== STEP 2: PROBLEMATIC PATTERN DETECTION WITH FIXES ==============
 def fix_preposition_adjective_no_noun(pos_tags, problem_idx):
     # Fix: IN + JJ without NN
@@ -155,21 +249,14 @@ def fix_preposition_adjective_no_noun(pos_tags, problem_idx):
     # Εύρεση πλησιέστερου ουσιαστικού μετά το επίθετο
     nearest_noun_idx = None
     for i in range(problem_idx + 2, min(problem_idx + 5, len(pos_tags))):
-        if pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
+        if tag_class(pos_tags[i][1]) & NOUN:
             nearest_noun_idx = i
             break
     
     if nearest_noun_idx:
-        adj_token = pos_tags[problem_idx + 1] # Επίθετο δίπλα από το ουσιαστικό 
-        # Αναδιάταξη: διατήρηση πρόθεσης, μετακίνηση επιθέτου και ουσιαστικού μαζί
-        new_tags = (
-            pos_tags[:problem_idx+1] +  # Keep up to preposition
-            [adj_token] +                # Adjective
-            [pos_tags[nearest_noun_idx]] +  # Noun
-            pos_tags[problem_idx+2:nearest_noun_idx] +  # In-between
-            pos_tags[nearest_noun_idx+1:]  # Rest
-        )
-        return new_tags
+        # Αναδιάταξη: διατήρηση πρόθεσης και επιθέτου, το ουσιαστικό μετακινείται αμέσως μετά το επίθετο
+        # (TaggedSentence: in-place)
+        return move(pos_tags, nearest_noun_idx, problem_idx + 2)
     
     return pos_tags
 
@@ -181,38 +268,23 @@ def fix_verb_without_subject(pos_tags, verb_idx):
     
     # Πρώτα έλεγχος πριν το ρήμα
     for i in range(max(0, verb_idx - 5), verb_idx):
-        if pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS', 'PRP']:
+        if tag_class(pos_tags[i][1]) & (NOUN | PRONOUN):
             subject_idx = i
     
     # Αν δεν το βρει, τότε έλεγξε μετά το ρήμα
     if subject_idx is None:
         for i in range(verb_idx + 1, min(verb_idx + 5, len(pos_tags))):
-            if pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS', 'PRP']:
+            if tag_class(pos_tags[i][1]) & (NOUN | PRONOUN):
                 subject_idx = i
                 break
     
     if subject_idx is not None and subject_idx != verb_idx - 1:
-        # Μετακίνησε το υποκείμενο πριν το ρήμα 
-        subject_token = pos_tags[subject_idx]
-        
+        # Μετακίνησε το υποκείμενο πριν το ρήμα (TaggedSentence: in-place)
         if subject_idx < verb_idx:
             # Υποκείμενο είναι πριν αλλά όχι αμέσως πριν
-            new_tags = (
-                pos_tags[:subject_idx] +  # Before 
-                pos_tags[subject_idx+1:verb_idx] +  # Between (subject-verb)
-                [subject_token] +  # Subject moved 
-                pos_tags[verb_idx:]  # Verb and rest
-            )
-        else:
-            # Υποκείμενο είναι μετά, μετακίνησε το πριν
-            new_tags = (
-                pos_tags[:verb_idx] +  # Before
-                [subject_token] +  # Subject moved 
-                pos_tags[verb_idx:subject_idx] +  # Verb to subject
-                pos_tags[subject_idx+1:]  # After subject
-            )
-        
-        return new_tags
+            return move(pos_tags, subject_idx, verb_idx - 1)
+        # Υποκείμενο είναι μετά, μετακίνησε το πριν
+        return move(pos_tags, subject_idx, verb_idx)
     
     return pos_tags
 
@@ -222,39 +294,36 @@ def fix_unusual_start(pos_tags):
     if len(pos_tags) < 2:
         return pos_tags
     
-    first_token = pos_tags[0]
-    
     # Βρες πρώτο ουσιαστικό ή ρήμα
     target_idx = None
     for i in range(1, len(pos_tags)):
-        if pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS', 'PRP'] or pos_tags[i][1].startswith('VB'):
+        if tag_class(pos_tags[i][1]) & (NOUN | PRONOUN | VERB):
             target_idx = i
             break
     
     if target_idx:
-        # Μετακίνηση επιθέτου/επιρρήματος μετά τον στόχο
-        new_tags = (
-            pos_tags[1:target_idx+1] +  # Skip first, go to target
-            [first_token] +  # Move first token here
-            pos_tags[target_idx+1:]  # Rest
-        )
-        return new_tags
+        # Μετακίνηση επιθέτου/επιρρήματος μετά τον στόχο (TaggedSentence: in-place)
+        return move(pos_tags, 0, target_idx)
     
     return pos_tags
 
 # Εντοπισμός προβληματικών μοτίβων και εφαρμογή διορθώσεων
-def detect_and_fix_problems(pos_tags):
-    # Επιστρέφει: (fixed_pos_tags, problems_found)
+def detect_and_fix_problems(pos_tags, context=None):
+    # Επιστρέφει: (fixed_pos_tags, problems_found) - ίδιος τύπος με την είσοδο (TaggedSentence ή λίστα)
+    # context: AnalysisContext του pos_tags - τα verb groups του ξαναχρησιμοποιούνται αν δεν άλλαξε τίποτα στο Problem 1
+    # Οι διορθώσεις γίνονται in-place σε αντίγραφο TaggedSentence (μία μετακίνηση token η καθεμία)
+    # αντί να ξαναχτίζεται όλη η λίστα σε κάθε διόρθωση
     problems = []
-    fixed_tags = list(pos_tags)
+    fixed_tags = TaggedSentence.from_pos_tags(pos_tags).copy()
+    masks = fixed_tags.masks
     
     # Problem 1: IN + JJ without NN
     i = 0
     while i < len(fixed_tags) - 1:
-        if fixed_tags[i][1] == 'IN' and fixed_tags[i+1][1] in ['JJ', 'JJR', 'JJS']:
+        if masks[i] & PREPOSITION and masks[i+1] & ADJECTIVE:
             # Check if followed by noun
             has_noun = False
-            if i+2 < len(fixed_tags) and fixed_tags[i+2][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
+            if i+2 < len(fixed_tags) and masks[i+2] & NOUN:
                 has_noun = True
             
             if not has_noun:
@@ -263,17 +332,20 @@ def detect_and_fix_problems(pos_tags):
                     'position': i,
                     'original': [fixed_tags[i][0], fixed_tags[i+1][0]]
                 })
-                fixed_tags = fix_preposition_adjective_no_noun(fixed_tags, i)
+                fix_preposition_adjective_no_noun(fixed_tags, i)
         i += 1
     
     # Problem 2: Verb without subject (check main verbs only)
-    verb_groups = find_verb_groups(fixed_tags)
+    if context is not None and context.pos_tags is pos_tags and not problems:
+        verb_groups = context.verb_groups
+    else:
+        verb_groups = find_verb_groups(fixed_tags)
     for start, end, tokens, is_main in verb_groups:
         if is_main:
             # Check for subject before verb
             has_subject = False
             for i in range(max(0, start - 3), start):
-                if fixed_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS', 'PRP']:
+                if masks[i] & (NOUN | PRONOUN):
                     has_subject = True
                     break
             
@@ -283,117 +355,132 @@ def detect_and_fix_problems(pos_tags):
                     'position': start,
                     'original': tokens
                 })
-                fixed_tags = fix_verb_without_subject(fixed_tags, start)
+                fix_verb_without_subject(fixed_tags, start)
     
     # Problem 3: Unusual start
-    if len(fixed_tags) > 0 and fixed_tags[0][1] in ['JJ', 'RB', 'RBR', 'RBS']:
-        if len(fixed_tags) < 3 or fixed_tags[1][1] not in ['NN', 'NNS', 'NNP', 'NNPS', 'PRP']:
+    if len(fixed_tags) > 0 and (fixed_tags[0][1] == 'JJ' or masks[0] & ADVERB):
+        if len(fixed_tags) < 3 or not masks[1] & (NOUN | PRONOUN):
             problems.append({
                 'type': 'unusual_start',
                 'position': 0,
                 'original': [fixed_tags[0][0]]
             })
             # Apply fix
-            fixed_tags = fix_unusual_start(fixed_tags)
+            fix_unusual_start(fixed_tags)
     
+    if not isinstance(pos_tags, TaggedSentence):
+        return fixed_tags.to_pos_tags(), problems
     return fixed_tags, problems
 
 # ============== STEP 3: S-V-O EXTRACTION ==============
 
 # Εξαγωγή SVO Υποκείμενο-Ρήμα-Αντικείμενο
-def extract_svo_components(pos_tags):
+def extract_svo_components(pos_tags, context=None):
     # Επιστρέφει dictionary με: 'subject', 'verb', 'object', 'prepositional_phrases', 'other'
+    # context: AnalysisContext με τα ήδη υπολογισμένα NP spans / verb groups / prep phrases
+    layout = _context_for(pos_tags, context).svo_layout
+    tokens = token_list(pos_tags)
     components = {
         'subject': [],
         'verb': [],
         'object': [],
-        'prepositional_phrases': [],  # ← ΝΕΟ!
+        'prepositional_phrases': layout['prepositional_phrases'],  # ← ΝΕΟ!
+        'other': [tokens[i] for i in layout['other']]
+    }
+    for role in ('subject', 'verb', 'object'):
+        if layout[role] is not None:
+            start, end = layout[role]
+            components[role] = tokens[start:end]
+    return components
+
+
+def extract_svo_layout(pos_tags, context=None):
+    # Οι θέσεις των S-V-O στοιχείων: 'subject', 'verb', 'object' ως (start, end) ή None,
+    # 'prepositional_phrases' ως (prep_idx, np_start, np_end) και 'other' ως λίστα θέσεων
+    # Από αυτό χτίζονται τόσο τα components (tokens) όσο και η αναδιάταξη (reorder_clause_plan)
+    context = _context_for(pos_tags, context)
+    layout = {
+        'subject': None,
+        'verb': None,
+        'object': None,
+        'prepositional_phrases': [],
         'other': []
     }
     
-    noun_phrases = identify_noun_phrases(pos_tags)
-    verb_groups = find_verb_groups(pos_tags)
-    
-    # Βρες όλα τα ρήματα (για να ελέγξουμε πολλαπλά ρήματα) 
-    all_verb_positions = [start for start, end, tokens, is_main in verb_groups]
+    noun_phrases = context.noun_phrases
+    verb_groups = context.verb_groups
     
     # Βρες το κύριο ρήμα (πρώτα είναι το κύριο, μετά το βοηθητικό)
     main_verb_idx = None
-    main_verb_tokens = []
+    verb_end = None
     
     for start, end, tokens, is_main in verb_groups:
         if is_main:
-            main_verb_idx = start
-            main_verb_tokens = tokens
-            components['verb'] = tokens
+            main_verb_idx, verb_end = start, end
             break
     
     # Αν δεν έχει κύριο ρήμα, χρησιμοποίησε το πρώτο
     if main_verb_idx is None and len(verb_groups) > 0:
-        main_verb_idx = verb_groups[0][0]
-        main_verb_tokens = verb_groups[0][2]
-        components['verb'] = main_verb_tokens
+        main_verb_idx, verb_end = verb_groups[0][0], verb_groups[0][1]
+    
+    if main_verb_idx is not None:
+        layout['verb'] = (main_verb_idx, verb_end)
     
     # Εξαγωγή προθετικών φράσεων (IN + NP)
-    prepositional_phrases = extract_prepositional_phrases(pos_tags, noun_phrases)
-    components['prepositional_phrases'] = prepositional_phrases
+    prepositional_phrases = context.prepositional_phrases
+    layout['prepositional_phrases'] = prepositional_phrases
     
+    # Span index: NP ανά θέση αρχής / τέλους
+    np_by_start, np_by_end = context.np_index
+
     # Υποκείμενο: κοντινότερο NP πριν το κύριο ρήμα (όχι το πρώτο NP)
+    # = το NP με το μεγαλύτερο end <= main_verb_idx
     if main_verb_idx is not None:
-        closest_np = None
-        closest_distance = float('inf')
-        
-        for start, end, tokens in noun_phrases:
-            if end <= main_verb_idx:
-                distance = main_verb_idx - end
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_np = tokens
-        
-        if closest_np:
-            components['subject'] = closest_np
+        for end in range(main_verb_idx, -1, -1):
+            if end in np_by_end:
+                layout['subject'] = np_by_end[end][:2]
+                break
     
     # Υποκείμενο: Πρώτο NP μετά το κύριο ρήμα
     if main_verb_idx is not None:
-        verb_end = main_verb_idx + len(main_verb_tokens)
-        for start, end, tokens in noun_phrases:
-            if start >= verb_end:
-                components['object'] = tokens
+        for start in range(verb_end, len(pos_tags)):
+            if start in np_by_start:
+                layout['object'] = np_by_start[start][:2]
                 break
     
     # Συλλογή υπόλοιπων tokens (εκτός από prep phrases)
-    used_indices = set()
+    # Σημειώνονται οι θέσεις των spans που χρησιμοποιήθηκαν (όχι όσα NPs έχουν ίδια tokens με το υποκείμενο/αντικείμενο)
+    used = bytearray(len(pos_tags))
     
     # Σημείωσε χρησιμοποιημένους δείκτες
-    for start, end, tokens in noun_phrases:
-        if tokens == components['subject'] or tokens == components['object']:
-            used_indices.update(range(start, end))
-    
-    if main_verb_idx is not None:
-        used_indices.update(range(main_verb_idx, main_verb_idx + len(main_verb_tokens)))
+    for role in ('subject', 'verb', 'object'):
+        if layout[role] is not None:
+            start, end = layout[role]
+            used[start:end] = b'\x01' * (end - start)
     
     # Σημείωσε τους δείκτες προθετικών φράσεων
     for prep_idx, np_start, np_end in prepositional_phrases:
-        used_indices.update(range(prep_idx, np_end))
+        used[prep_idx:np_end] = b'\x01' * (np_end - prep_idx)
     
     # Σύλλεξε τα λοιπά tokens
-    for i, (token, pos) in enumerate(pos_tags):
-        if i not in used_indices and token not in [',', '.', '!', '?']:
-            components['other'].append(token)
+    for i, token in enumerate(token_list(pos_tags)):
+        if not used[i] and token not in [',', '.', '!', '?']:
+            layout['other'].append(i)
     
-    return components
+    return layout
     
 # helper function για το SVO - Εξαγωγή προθετικών φράσεων (IN + NP)
-def extract_prepositional_phrases(pos_tags, noun_phrases):
+def extract_prepositional_phrases(pos_tags, noun_phrases, np_by_start=None):
     # Επιστρέφει λίστα
+    # np_by_start: NP spans ανά θέση αρχής (build_span_index) - O(1) lookup ανά πρόθεση
+    if np_by_start is None:
+        np_by_start = build_span_index(noun_phrases)[0]
     prep_phrases = []
     
-    for i, (token, pos) in enumerate(pos_tags):
-        if pos == 'IN': # Ψάξε το NP που ακολουθεί 
-            for start, end, tokens in noun_phrases:
-                if start == i + 1:  
-                    prep_phrases.append((i, start, end))
-                    break
+    for i, mask in enumerate(tag_masks(pos_tags)):
+        if mask & PREPOSITION and i + 1 in np_by_start: # Ψάξε το NP που ακολουθεί 
+            start, end = np_by_start[i + 1][:2]
+            prep_phrases.append((i, start, end))
     
     return prep_phrases
 
@@ -402,7 +489,7 @@ def extract_prepositional_phrases(pos_tags, noun_phrases):
 # ============== STEP 4: CLAUSE IDENTIFICATION AND REORDERING ==============
 
 # Διαχωρισμός πρότασης σε κύριες και εξαρτημένες χρησιμοποι΄ώντας σαφής συνδέσμους
-def identify_clauses(pos_tags):
+def identify_clauses(pos_tags, context=None):
     # Επιστρέφει dictionary με: 'main', 'dependent', 'subordinate_positions'
     clauses = {
         'main': [],
@@ -410,7 +497,7 @@ def identify_clauses(pos_tags):
         'subordinate_positions': []
     }
     
-    sub_positions = detect_subordinate_conjunctions(pos_tags) # Βρες σαφείς βοηθητικούς συνδέσμους
+    sub_positions = _context_for(pos_tags, context).subordinate_markers # Βρες σαφείς βοηθητικούς συνδέσμους
     
     if len(sub_positions) == 0: # Αν δεν υπάρχει εξαρτημένη πρόταση, τότε όλα είναι κύρια        
         clauses['main'] = list(range(len(pos_tags)))
@@ -422,8 +509,9 @@ def identify_clauses(pos_tags):
     if sub_positions[0][0] < 3:
         # Η εξαρτημένη πρόταση προηγείται - βρες αν υπάρχει κομμα
         boundary = len(pos_tags) // 2
+        tokens = token_list(pos_tags)
         for i in range(sub_positions[0][0] + 1, len(pos_tags)):
-            if pos_tags[i][0] == ',':
+            if tokens[i] == ',':
                 boundary = i
                 break
         
@@ -436,51 +524,53 @@ def identify_clauses(pos_tags):
     return clauses
 
 
-def reorder_clause(pos_tags):
-    # Αναδιάταξη μιας μεμονωμένης πρότασης σε δομή S-V-O με προθετικές φράσεις.
+def reorder_clause_plan(pos_tags, context=None):
+    # Η νέα σειρά των θέσεων μιας πρότασης: Υποκείμενο + Ρήμα + Αντικείμενο + Προθετικές φράσεις + Άλλο
+    # (οι προθετικές φράσεις διατηρούνται μαζί ως μονάδες)
     if len(pos_tags) == 0:
-        return ""
-    
-    components = extract_svo_components(pos_tags)
-    # Σχηματισμός πρότασης: Υποκείμενο + Ρήμα + Αντικείμενο + Προθετικές φράσεις + Άλλο
-    parts = []
-    
-    if components['subject']:
-        parts.append(' '.join(components['subject']))
-    
-    if components['verb']:
-        parts.append(' '.join(components['verb']))
-    
-    if components['object']:
-        parts.append(' '.join(components['object']))
+        return []
     
-    # Προσθήκη προθετικών φράσεων (που διατηρούνται μαζί ως μονάδες)
-    if components['prepositional_phrases']:
-        for prep_idx, np_start, np_end in components['prepositional_phrases']:
-            prep_token = pos_tags[prep_idx][0]
-            np_tokens = [pos_tags[i][0] for i in range(np_start, np_end)]
-            prep_phrase = f"{prep_token} {' '.join(np_tokens)}"
-            parts.append(prep_phrase)
-    
-    # Προσθήκη υπόλοιπων tokens
-    if components['other']:
-        parts.append(' '.join(components['other']))
-    
-    result = ' '.join(parts)
-    
-    return result
+    layout = _context_for(pos_tags, context).svo_layout
+    order = []
+    for role in ('subject', 'verb', 'object'):
+        if layout[role] is not None:
+            order.extend(range(*layout[role]))
+    for prep_idx, np_start, np_end in layout['prepositional_phrases']:
+        order.append(prep_idx)
+        order.extend(range(np_start, np_end))
+    order.extend(layout['other'])
+    return order
+
+
+def reorder_clause(pos_tags, context=None):
+    # Αναδιάταξη μιας μεμονωμένης πρότασης σε δομή S-V-O με προθετικές φράσεις.
+    tokens = token_list(pos_tags)
+    return ' '.join(tokens[i] for i in reorder_clause_plan(pos_tags, context))
 
 
-def handle_clauses(pos_tags):
+def _clause_template(pos_tags, positions, context=None):
+    # Template για reorder_clause(pos_tags) με τις θέσεις μεταφρασμένες σε positions (θέσεις της αρχικής πρότασης)
+    template = []
+    for i in reorder_clause_plan(pos_tags, context):
+        if template:
+            template.append(' ')
+        template.append(positions[i])
+    return template
+
+
+def handle_clauses_plan(pos_tags, context=None):
     # Χειρισμός πολλαπλών προτάσεων με καλύτερη ανίχνευση ορίων.
     # 1. Διαχωρισμός με συντονισμένους συνδέσμους (and, but, or)
     # 2. Προσδιορισμός εξαρτημένων προτάσεων (με δευτερεύοντες συνδέσμους)
     # 3. Αναδιάταξη
+    # Επιστρέφει template: λίστα από θέσεις tokens (int) και literal strings (διαχωριστικά),
+    # το render_plan(template, tokens) δίνει το αποτέλεσμα του handle_clauses
+    # Το template εξαρτάται μόνο από τα tags και τις λεξικές σημαίες του plan_signature
 
     # CΈλεγχος για συντονισμένους συνδέσμους (CC: and, but, or)
     coord_conj_positions = []
-    for i, (token, pos) in enumerate(pos_tags):
-        if pos == 'CC' or token.lower() in ['but', 'and', 'or']:
+    for i, (token, mask) in enumerate(zip(token_list(pos_tags), tag_masks(pos_tags))):
+        if mask & CONJUNCTION or token.lower() in ['but', 'and', 'or']:
             coord_conj_positions.append(i)
     
     # Αν υπάρχουν πολλαπλοί συντονισμένοι σύνδεσμοι, χωρίσε τους σε ξεχωριστές προτάσεις
@@ -489,61 +579,169 @@ def handle_clauses(pos_tags):
         start = 0
         
         for conj_pos in coord_conj_positions:
-            clause_tokens = pos_tags[start:conj_pos]
-            if len(clause_tokens) > 0:
-                clauses.append((clause_tokens, None))  # (tokens, conjunction)
+            if conj_pos > start:
+                clauses.append((start, conj_pos, None))  # (start, end, conjunction position)
             
-            conjunction = pos_tags[conj_pos][0] # Αποθήκευση συνδέσμο
+            # Αποθήκευση συνδέσμου (σύνδεσμος στην αρχή της πρότασης: κενή πρόταση πριν από αυτόν)
+            if clauses:
+                clauses[-1] = (clauses[-1][0], clauses[-1][1], conj_pos)
+            else:
+                clauses.append((start, conj_pos, conj_pos))
             start = conj_pos + 1
-            clauses[-1] = (clauses[-1][0], conjunction) if clauses else (clause_tokens, conjunction)
         
         if start < len(pos_tags): # Τε΄λευταία πρόταση
-            clauses.append((pos_tags[start:], None))
+            clauses.append((start, len(pos_tags), None))
         
         # Αναδιάταξη και συνδυασμός κάθε πρότασης
-        reconstructed_clauses = []
-        for clause_tokens, conj in clauses:
-            if len(clause_tokens) > 0:
-                reordered = reorder_clause(clause_tokens)
-                if conj:
-                    reconstructed_clauses.append(f"{reordered} {conj}")
-                else:
-                    reconstructed_clauses.append(reordered)
+        template = []
+        for clause_start, clause_end, conj in clauses:
+            if clause_end > clause_start:
+                if template:
+                    template.append(' ')
+                template += _clause_template(pos_tags[clause_start:clause_end], range(clause_start, clause_end))
+                if conj is not None:
+                    template += [' ', conj]
+            elif conj is not None:
+                # π.χ. "And the cat ran": ο σύνδεσμος μένει στη θέση του
+                if template:
+                    template.append(' ')
+                template.append(conj)
         
-        return ' '.join(reconstructed_clauses)
+        return template
     
     # Αλλιώς χειρισμός ως μια πρόταση με εξαρτημένη
-    clause_info = identify_clauses(pos_tags)
+    clause_info = identify_clauses(pos_tags, context)
     
     if len(clause_info['dependent']) == 0:
-        return reorder_clause(pos_tags)
+        return _clause_template(pos_tags, range(len(pos_tags)), context)
     
-    main_tokens = [pos_tags[i] for i in clause_info['main']]
-    dependent_tokens = [pos_tags[i] for i in clause_info['dependent']]
+    main = clause_info['main']
+    dependent = clause_info['dependent']
     
-    main_reconstructed = ""
-    if len(main_tokens) > 0:
-        main_reconstructed = reorder_clause(main_tokens)
+    main_template = []
+    if len(main) > 0:
+        main_template = _clause_template(select(pos_tags, main), main)
     
-    dependent_reconstructed = ""
-    if len(dependent_tokens) > 0:
-        conjunction = dependent_tokens[0][0]
-        rest_tokens = dependent_tokens[1:]
+    dependent_template = []
+    if len(dependent) > 0:
+        dependent_template = [dependent[0]]  # σύνδεσμος
+        rest = dependent[1:]
         
-        if len(rest_tokens) > 0:
-            rest_reconstructed = reorder_clause(rest_tokens)
-            dependent_reconstructed = f"{conjunction} {rest_reconstructed}".strip()
+        if len(rest) > 0:
+            rest_template = _clause_template(select(pos_tags, rest), rest)
+            if rest_template:
+                dependent_template += [' '] + rest_template
+    
+    if main_template and dependent_template:
+        return main_template + [', '] + dependent_template
+    return main_template or dependent_template
+
+
+def render_plan(template, tokens):
+    # Εφαρμογή template (handle_clauses_plan) στα tokens μιας πρότασης
+    return ''.join([tokens[part] if part.__class__ is int else part for part in template])
+
+
+def handle_clauses(pos_tags, context=None):
+    # Ανακατασκευή ολόκληρης της πρότασης (βλ. handle_clauses_plan)
+    return render_plan(handle_clauses_plan(pos_tags, context), token_list(pos_tags))
+
+def finalize_reconstruction(reconstructed):
+    # Step 7 του pipeline: κενά πριν τη στίξη, κεφαλαίο πρώτο γράμμα, τελεία στο τέλος
+    # (κοινό post-processing, profile 'syntactic')
+    return postprocess(reconstructed, 'syntactic')
+
+def reconstruction_stream(template, fixed, source):
+    # Το token stream του finalize_reconstruction(render_plan(template, tokens)) χωρίς tokenization,
+    # για το incremental retagging του grammatical correction (βλ. retag_stream)
+    # fixed: η πρόταση μετά το Step 1 (origins = θέσεις στο source), source: η πρόταση όπως ήρθε από το preprocessing
+    # origins[k]: θέση του token k στο source - None για τη στίξη των διαχωριστικών και την τελεία του Step 7
+    fixed_tokens = fixed.tokens()
+    tokens = []
+    origins = []
+    for part in template:
+        if part.__class__ is int:
+            tokens.append(fixed_tokens[part])
+            origins.append(fixed.origins[part] if fixed.origins is not None else part)
         else:
-            dependent_reconstructed = conjunction
-    
-    if main_reconstructed and dependent_reconstructed:
-        result = f"{main_reconstructed}, {dependent_reconstructed}"
-    elif main_reconstructed:
-        result = main_reconstructed
-    else:
-        result = dependent_reconstructed
-    
-    return result
+            for piece in part.split():
+                tokens.append(piece)
+                origins.append(None)
+
+    # Ίδιες αλλαγές με το finalize_reconstruction: κεφαλαίο πρώτο γράμμα, τελεία στο τέλος
+    if tokens:
+        tokens[0] = tokens[0][0].upper() + tokens[0][1:]
+        if tokens[-1][-1] not in '.!?':
+            tokens.append('.')
+            origins.append(None)
+
+    return {
+        'tokens': tokens,
+        'origins': origins,
+        'source_tokens': source.tokens(),
+        'source_tags': source.tags(),
+    }
+
+# ============== PLAN CACHE ==============
+# Templates του handle_clauses_plan ανά plan_signature (βλ. plan_cache.py)
+
+# Λεξικές σημαίες που επηρεάζουν την αναδιάταξη εκτός από τα tags
+AUXILIARY_FLAG = 1 << 0    # βοηθητικό ρήμα (verb groups)
+SUBORDINATE_FLAG = 1 << 1  # δευτερεύων σύνδεσμος (clauses)
+COORDINATE_FLAG = 1 << 2   # but / and / or (handle_clauses)
+COMMA_FLAG = 1 << 3        # ',' (όριο εξαρτημένης πρότασης)
+PUNCTUATION_FLAG = 1 << 4  # , . ! ? (εξαιρούνται από τα 'other')
+
+_plan_cache = None
+
+
+def lexical_flags(token):
+    word = token.lower()
+    flags = 0
+    if word in AUXILIARY_VERBS:
+        flags |= AUXILIARY_FLAG
+    if word in SUBORDINATE_CONJUNCTIONS:
+        flags |= SUBORDINATE_FLAG
+    if word in ['but', 'and', 'or']:
+        flags |= COORDINATE_FLAG
+    if token == ',':
+        flags |= COMMA_FLAG
+    if token in [',', '.', '!', '?']:
+        flags |= PUNCTUATION_FLAG
+    return flags
+
+
+def plan_signature(sentence):
+    # Κλειδί της plan cache: tag class masks + λεξικές σημαίες ανά token
+    # Οι σημαίες κρατιούνται ανά token id στην cache του token table της πρότασης (ελευθερώνονται μαζί του)
+    flags = bytearray(len(sentence.token_ids))
+    table = sentence.table
+    cached_flags = table.cache
+    for i, tid in enumerate(sentence.token_ids):
+        token_flags = cached_flags.get(tid)
+        if token_flags is None:
+            token_flags = cached_flags[tid] = lexical_flags(token_text(tid, table))
+        flags[i] = token_flags
+    return sentence.masks.tobytes() + bytes(flags)
+
+
+def get_plan_cache():
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = PlanCache()
+    return _plan_cache
+
+
+def cached_handle_clauses_plan(pos_tags, context=None, cache=None):
+    # handle_clauses_plan μέσω της cache - σε hit δεν γίνεται καμία ανάλυση
+    sentence = TaggedSentence.from_pos_tags(pos_tags)
+    cache = cache if cache is not None else get_plan_cache()
+    key = plan_signature(sentence)
+    template = cache.get(key)
+    if template is None:
+        template = tuple(handle_clauses_plan(sentence, context))
+        cache.put(key, template)
+    return template
 
 # ============== STEP 5: PRINT FUNCTIONS ==============
 
@@ -577,7 +775,7 @@ def print_analysis_step(step_number, step_name, content):
 
 # ============== MAIN SYNTACTIC ANALYSIS PIPELINE ==============
 
-def syntactic_analysis_pipeline(pos_tags, verbose):
+def syntactic_analysis_pipeline(pos_tags, verbose, check_problems=True, details=True):
     # 1. Εντοπισμός και διόρθωση προβληματικών μοτίβων
     # 2. Προσδιορισμός noun phrases και verb groups
     # 3. Εξαγωγή S-V-O στοιχείων 
@@ -585,6 +783,10 @@ def syntactic_analysis_pipeline(pos_tags, verbose):
     # 5. Αναδόμηση πρότασης
     # Παίρνει pos_tags από το preprocessing και μεταβλητή που αν αληθής δείχνει τα βήματα
     # Επιστρέφει dicrionary με: original, reconstructed, analysis details
+    # και reconstructed_stream: τα tokens του reconstructed με τη θέση τους στο pos_tags (για incremental retagging)
+    # check_problems=False: παράλειψη του Step 1 για προτάσεις που το batch scan (pattern_scan) βρήκε χωρίς προβλήματα
+    # details=False: μόνο original, reconstructed, problems_fixed, reconstructed_stream - η αναδιάταξη έρχεται από την plan cache
+    # (ίδιο reconstructed, χωρίς NP/VG/SVO ανάλυση για templates που έχουν ξαναεμφανιστεί)
     if len(pos_tags) == 0:
         return {
             'original': '',
@@ -593,11 +795,15 @@ def syntactic_analysis_pipeline(pos_tags, verbose):
             'verb_groups': [],
             'problems_fixed': [],
             'clauses': {},
-            'svo_components': {}
+            'svo_components': {},
+            'reconstructed_stream': None
         }
     
+    # Compact αναπαράσταση (interned token ids, tag ids, masks) για όλο το stage
+    sentence = TaggedSentence.from_pos_tags(pos_tags)
+
     # Original 
-    original = ' '.join([token for token, _ in pos_tags])
+    original = ' '.join(sentence.tokens())
     
     if verbose:
         print("\n" + "="*80)
@@ -606,7 +812,16 @@ def syntactic_analysis_pipeline(pos_tags, verbose):
         print_analysis_step(0, "Original Sentence", original)
     
     # Step 1: Εντοπισμός και διόρθωση προβλημάτων
-    fixed_pos_tags, problems = detect_and_fix_problems(pos_tags)
+    context = AnalysisContext(sentence)
+    if check_problems:
+        fixed_pos_tags, problems = detect_and_fix_problems(sentence, context)
+    else:
+        problems = []
+    if problems:
+        fixed_pos_tags = TaggedSentence.from_pos_tags(fixed_pos_tags)
+        context = AnalysisContext(fixed_pos_tags)
+    else:
+        fixed_pos_tags = sentence
     
     if verbose:
         if len(problems) > 0:
@@ -614,40 +829,43 @@ def syntactic_analysis_pipeline(pos_tags, verbose):
         else:
             print_analysis_step(1, "Problems Detected & Fixed", "No problems detected")
     
+    if not details and not verbose:
+        template = cached_handle_clauses_plan(fixed_pos_tags, context)
+        return {
+            'original': original,
+            'reconstructed': finalize_reconstruction(render_plan(template, fixed_pos_tags.tokens())),
+            'problems_fixed': problems,
+            'reconstructed_stream': reconstruction_stream(template, fixed_pos_tags, sentence),
+        }
+    
     # Step 2: Αναγνώριση noun phrases
-    noun_phrases = identify_noun_phrases(fixed_pos_tags)
+    noun_phrases = context.noun_phrases
     if verbose:
         print_analysis_step(2, "Noun Phrases Identified", noun_phrases)
     
     # Step 3: Αναγνώριση verb groups 
-    verb_groups = find_verb_groups(fixed_pos_tags)
+    verb_groups = context.verb_groups
     if verbose:
         formatted_verbs = [(start, end, tokens, "MAIN" if is_main else "AUX") 
                           for start, end, tokens, is_main in verb_groups]
         print_analysis_step(3, "Verb Groups Identified", formatted_verbs)
     
     # Step 4: Αναγνώριση προτάσεων
-    clauses = identify_clauses(fixed_pos_tags)
+    clauses = identify_clauses(fixed_pos_tags, context)
     if verbose:
         print_analysis_step(4, "Clause Structure", clauses)
     
     # Step 5: Εξαγωγή S-V-O 
-    svo_components = extract_svo_components(fixed_pos_tags)
+    svo_components = context.svo_components
     if verbose:
         print_analysis_step(5, "S-V-O Components Extracted", svo_components)
     
     # Step 6: Ανακατασκευή με χειρισμό προτάσεων
-    reconstructed = handle_clauses(fixed_pos_tags)
+    template = handle_clauses_plan(fixed_pos_tags, context)
+    reconstructed = render_plan(template, fixed_pos_tags.tokens())
     
     # Step 7: Καθαρισμός
-    reconstructed = re.sub(r'\s+([.,!?])', r'\1', reconstructed)
-    reconstructed = re.sub(r'\s+', ' ', reconstructed).strip()
-    
-    # Πρώτο γράμμα κεφαλαίο
-    if reconstructed: reconstructed = reconstructed[0].upper() + reconstructed[1:]
-    
-    # Βάλε τελεία αν λείπει
-    if reconstructed and reconstructed[-1] not in '.!?': reconstructed += '.'
+    reconstructed = finalize_reconstruction(reconstructed)
     
     if verbose:
         print_analysis_step(6, "Reconstructed Sentence (FINAL)", reconstructed)
@@ -662,7 +880,8 @@ def syntactic_analysis_pipeline(pos_tags, verbose):
         'verb_groups': verb_groups,
         'problems_fixed': problems,
         'clauses': clauses,
-        'svo_components': svo_components
+        'svo_components': svo_components,
+        'reconstructed_stream': reconstruction_stream(template, fixed_pos_tags, sentence)
     }
     
     return result
@@ -0,0 +1,276 @@
+# Compact αναπαράσταση πρότασης για το syntactic analysis stage
+# Αντί για λίστα από (token, tag) tuples:
+# - token ids: interned ids σε array('I') (κάθε διαφορετικό token αποθηκεύεται μία φορά ανά token table - βλ.
+#              INTERNING TABLES για το όριο μεγέθους)
+# - tag ids:   μικροί ακέραιοι σε array('B')
+# - masks:     bitmask κατηγορίας ανά token σε array('H'), ώστε οι έλεγχοι του τύπου
+#              tag in ['NN', 'NNS', 'NNP', 'NNPS'] να γίνονται με ένα & (masks[i] & NOUN)
+# Το TaggedSentence συμπεριφέρεται και ως sequence από (token, tag) tuples (adapter για το υπάρχον API)
+# Είναι mutable μόνο μέσω move(): οι διορθώσεις του syntactic stage μετακινούν ένα token τη φορά
+# in-place (κόστος ανάλογο της απόστασης, όχι του μήκους της πρότασης) και το origins κρατάει
+# την αρχική θέση κάθε token
+
+import threading
+from array import array
+
+# ============== TAG CLASS BITMASKS ==============
+
+NOUN = 1 << 0          # NN, NNS, NNP, NNPS
+PRONOUN = 1 << 1       # PRP
+POSSESSIVE = 1 << 2    # PRP$
+DETERMINER = 1 << 3    # DT
+ADJECTIVE = 1 << 4     # JJ, JJR, JJS
+ADVERB = 1 << 5        # RB, RBR, RBS
+VERB = 1 << 6          # VB* (όλα τα tags που ξεκινούν με VB)
+MODAL = 1 << 7         # MD
+PREPOSITION = 1 << 8   # IN
+PARTICLE = 1 << 9      # RP
+CONJUNCTION = 1 << 10  # CC
+
+_TAG_CLASSES = {
+    'NN': NOUN, 'NNS': NOUN, 'NNP': NOUN, 'NNPS': NOUN,
+    'PRP': PRONOUN,
+    'PRP$': POSSESSIVE,
+    'DT': DETERMINER,
+    'JJ': ADJECTIVE, 'JJR': ADJECTIVE, 'JJS': ADJECTIVE,
+    'RB': ADVERB, 'RBR': ADVERB, 'RBS': ADVERB,
+    'MD': MODAL,
+    'IN': PREPOSITION,
+    'RP': PARTICLE,
+    'CC': CONJUNCTION,
+}
+
+# Penn Treebank tags - παίρνουν σταθερά ids, άγνωστα tags προστίθενται στο τέλος
+PENN_TAGS = (
+    'CC', 'CD', 'DT', 'EX', 'FW', 'IN', 'JJ', 'JJR', 'JJS', 'LS', 'MD',
+    'NN', 'NNS', 'NNP', 'NNPS', 'PDT', 'POS', 'PRP', 'PRP$', 'RB', 'RBR', 'RBS',
+    'RP', 'SYM', 'TO', 'UH', 'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ',
+    'WDT', 'WP', 'WP$', 'WRB', '$', '#', "''", '``', '(', ')', ',', '.', ':',
+)
+
+
+def tag_class(tag):
+    # Bitmask κατηγορίας ενός tag
+    mask = _TAG_CLASSES.get(tag, 0)
+    if tag.startswith('VB'):
+        mask |= VERB
+    return mask
+
+# ============== INTERNING TABLES ==============
+# Tags: πίνακας ανά process - μόνο προσθήκες (λίγα διαφορετικά tags), οπότε τα ids μένουν σταθερά
+# Tokens: τα διαφορετικά tokens δεν έχουν όριο (αριθμοί, URLs, typos), οπότε σε long-running process (server,
+# staged workers) ένας πίνακας μόνο με προσθήκες μεγαλώνει χωρίς τέλος. Κάθε πρόταση κρατάει τον TokenTable
+# στον οποίο έγιναν intern τα tokens της. Όταν ο τρέχων πίνακας ξεπεράσει τα TOKEN_TABLE_LIMIT tokens, οι
+# νέες προτάσεις παίρνουν νέο πίνακα - ο παλιός ελευθερώνεται όταν δεν τον κρατάει καμία πρόταση
+
+TOKEN_TABLE_LIMIT = 1 << 18
+
+
+class TokenTable:
+    __slots__ = ('tokens', 'ids', 'cache')
+
+    def __init__(self):
+        self.tokens = []
+        self.ids = {}
+        self.cache = {}  # token id -> τιμή, για caches των χρηστών ανά token (π.χ. λεξικές σημαίες)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def intern(self, token):
+        tid = self.ids.get(token)
+        if tid is None:
+            with _lock:
+                tid = self.ids.get(token)
+                if tid is None:
+                    tid = len(self.tokens)
+                    self.tokens.append(token)
+                    self.ids[token] = tid
+        return tid
+
+
+_lock = threading.Lock()
+_TAGS = []
+_TAG_IDS = {}
+_TAG_MASKS = []
+_token_table = TokenTable()
+
+
+def current_token_table():
+    # Ο πίνακας για νέες προτάσεις - νέος αν ο τρέχων ξεπέρασε το TOKEN_TABLE_LIMIT
+    global _token_table
+    table = _token_table
+    if len(table) >= TOKEN_TABLE_LIMIT:
+        with _lock:
+            if _token_table is table:
+                _token_table = TokenTable()
+            table = _token_table
+    return table
+
+
+def tag_id(tag):
+    tid = _TAG_IDS.get(tag)
+    if tid is None:
+        with _lock:
+            tid = _TAG_IDS.get(tag)
+            if tid is None:
+                if len(_TAGS) >= 256:
+                    raise ValueError(f"Too many distinct POS tags (max 256), cannot add {tag!r}")
+                tid = len(_TAGS)
+                _TAGS.append(tag)
+                _TAG_MASKS.append(tag_class(tag))
+                _TAG_IDS[tag] = tid
+    return tid
+
+
+def token_id(token, table=None):
+    return (table or current_token_table()).intern(token)
+
+
+def tag_name(tid):
+    return _TAGS[tid]
+
+
+def token_text(tid, table=None):
+    return (table or _token_table).tokens[tid]
+
+
+for _tag in PENN_TAGS:
+    tag_id(_tag)
+
+# ============== TAGGED SENTENCE ==============
+
+class TaggedSentence:
+    __slots__ = ('token_ids', 'tag_ids', 'masks', 'origins', 'table')
+
+    def __init__(self, token_ids=None, tag_ids=None, masks=None, origins=None, table=None):
+        # table: ο TokenTable των token_ids (default ο τρέχων)
+        self.table = table if table is not None else current_token_table()
+        self.token_ids = token_ids if token_ids is not None else array('I')
+        self.tag_ids = tag_ids if tag_ids is not None else array('B')
+        self.masks = masks if masks is not None else array('H')
+        # origins[i]: αρχική θέση του token i - None όσο δεν έχει γίνει καμία μετακίνηση
+        self.origins = origins
+
+    @classmethod
+    def from_pos_tags(cls, pos_tags):
+        # Από λίστα (token, tag) tuples - αν είναι ήδη TaggedSentence επιστρέφεται ως έχει
+        if isinstance(pos_tags, cls):
+            return pos_tags
+        table = current_token_table()
+        intern = table.intern
+        token_ids = array('I')
+        tag_ids = array('B')
+        masks = array('H')
+        for token, tag in pos_tags:
+            tid = tag_id(tag)
+            token_ids.append(intern(token))
+            tag_ids.append(tid)
+            masks.append(_TAG_MASKS[tid])
+        return cls(token_ids, tag_ids, masks, table=table)
+
+    # ----- sequence adapter: συμπεριφέρεται σαν λίστα από (token, tag) -----
+
+    def __len__(self):
+        return len(self.tag_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TaggedSentence(self.token_ids[index], self.tag_ids[index], self.masks[index], table=self.table)
+        return (self.table.tokens[self.token_ids[index]], _TAGS[self.tag_ids[index]])
+
+    def __iter__(self):
+        tokens = self.table.tokens
+        for token, tag in zip(self.token_ids, self.tag_ids):
+            yield (tokens[token], _TAGS[tag])
+
+    def __eq__(self, other):
+        if isinstance(other, TaggedSentence):
+            if self.table is other.table:
+                return self.token_ids == other.token_ids and self.tag_ids == other.tag_ids
+            return self.tag_ids == other.tag_ids and self.tokens() == other.tokens()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TaggedSentence({self.to_pos_tags()!r})"
+
+    def copy(self):
+        origins = array('I', self.origins) if self.origins is not None else None
+        return TaggedSentence(array('I', self.token_ids), array('B', self.tag_ids), array('H', self.masks), origins,
+                              table=self.table)
+
+    def move(self, src, dst):
+        # In-place: το token στη θέση src καταλήγει στη θέση dst, τα ενδιάμεσα μετατοπίζονται κατά μία θέση
+        # (ίδιο αποτέλεσμα με item = pop(src); insert(dst, item) σε λίστα)
+        # Αντιγράφεται μόνο το διάστημα [src, dst], όχι όλη η πρόταση
+        n = len(self.tag_ids)
+        if not (0 <= src < n and 0 <= dst < n):
+            raise IndexError(f"move({src}, {dst}) out of range for sentence of length {n}")
+        if src == dst:
+            return
+        if self.origins is None:
+            self.origins = array('I', range(n))
+        for values in (self.token_ids, self.tag_ids, self.masks, self.origins):
+            item = values[src]
+            if src < dst:
+                values[src:dst] = values[src + 1:dst + 1]
+            else:
+                values[dst + 1:src + 1] = values[dst:src]
+            values[dst] = item
+
+    def take(self, indices):
+        # Νέα πρόταση με τα tokens στις δοσμένες θέσεις (με αυτή τη σειρά)
+        return TaggedSentence(
+            array('I', [self.token_ids[i] for i in indices]),
+            array('B', [self.tag_ids[i] for i in indices]),
+            array('H', [self.masks[i] for i in indices]),
+            table=self.table,
+        )
+
+    def tokens(self):
+        tokens = self.table.tokens
+        return [tokens[tid] for tid in self.token_ids]
+
+    def tags(self):
+        return [_TAGS[tid] for tid in self.tag_ids]
+
+    def to_pos_tags(self):
+        return list(self)
+
+# ============== HELPERS FOR THE TUPLE API ==============
+# Οι συναρτήσεις του syntactic stage δέχονται είτε TaggedSentence είτε λίστα από tuples
+
+def tag_masks(pos_tags):
+    if isinstance(pos_tags, TaggedSentence):
+        return pos_tags.masks
+    return [tag_class(tag) for _, tag in pos_tags]
+
+
+def token_list(pos_tags):
+    if isinstance(pos_tags, TaggedSentence):
+        return pos_tags.tokens()
+    return [token for token, _ in pos_tags]
+
+
+def tag_list(pos_tags):
+    if isinstance(pos_tags, TaggedSentence):
+        return pos_tags.tags()
+    return [tag for _, tag in pos_tags]
+
+
+def move(pos_tags, src, dst):
+    # Μετακίνηση token από src σε dst: in-place για TaggedSentence, νέα λίστα για λίστα από tuples
+    # Επιστρέφει την (τροποποιημένη) ακολουθία
+    if isinstance(pos_tags, TaggedSentence):
+        pos_tags.move(src, dst)
+        return pos_tags
+    moved = list(pos_tags)
+    moved.insert(dst, moved.pop(src))
+    return moved
+
+
+def select(pos_tags, indices):
+    # pos_tags στις δοσμένες θέσεις, στον ίδιο τύπο με την είσοδο
+    if isinstance(pos_tags, TaggedSentence):
+        return pos_tags.take(indices)
+    return [pos_tags[i] for i in indices]
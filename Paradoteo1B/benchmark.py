@@ -0,0 +1,58 @@
+# Benchmarks για το Deliverable 1B
+# Χρήση (από τον φάκελο Paradoteo1B): python benchmark.py <name> [<name> ...]
+# Χωρίς όρισμα τρέχουν όλα. Κάθε guard σηκώνει AssertionError σε απόκλιση.
+
+import os
+import sys
+import subprocess
+
+# Startup budget: cumulative χρόνος του `import main` (-X importtime, καλύτερος από μερικά runs) και modules που
+# πρέπει να φορτώνονται μόνο όταν επιλεγεί το pipeline που τα χρειάζεται - βλ. bench_startup
+STARTUP_BUDGET_MS = 150
+LAZY_MODULES = ('textblob', 'nltk', 'gensim', 'transformers', 'torch', 'numpy')
+
+# ============================== HELPERS ==============================
+
+def import_profile(module, cwd="."):
+    # `python -X importtime -c "import <module>"` σε νέο interpreter -> {module: (self_us, cumulative_us)}
+    # (όπως στο Paradoteo1A/benchmark.py)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=cwd, capture_output=True, text=True, check=True)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+# ============================== BENCHMARKS ==============================
+
+def bench_startup(repeat=5, budget_ms=STARTUP_BUDGET_MS):
+    # Χρόνος εκκίνησης του main.py (import του main, πριν επιλεγεί pipeline) - αποτυγχάνει αν κάποιο από τα
+    # LAZY_MODULES φορτώνεται στην εκκίνηση ή αν ξεπεραστεί το budget (guard για regressions)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    profiles = [import_profile('main', cwd) for _ in range(repeat)]
+    startup_ms = min(profile['main'][1] for profile in profiles) / 1000
+    profile = profiles[-1]
+    eager = sorted({name.split('.')[0] for name in profile} & set(LAZY_MODULES))
+
+    print(f"[startup] import main: {startup_ms:.1f}ms (best of {repeat}, budget {budget_ms}ms)")
+    for name, (self_us, cumulative_us) in sorted(profile.items(), key=lambda item: -item[1][0])[:5]:
+        print(f"  {name:<40} self {self_us / 1000:6.1f}ms  cumulative {cumulative_us / 1000:6.1f}ms")
+    assert not eager, f"heavy modules imported at startup: {eager}"
+    assert startup_ms <= budget_ms, f"startup {startup_ms:.1f}ms over budget ({budget_ms}ms)"
+
+
+BENCHMARKS = {
+    'startup': bench_startup,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[name]()
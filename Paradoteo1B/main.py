@@ -1,10 +1,15 @@
 # NLP assignment - paradoteo1b
 import os
 import sys
+import json
+import time
+import argparse
+import importlib
+import functools
 import subprocess
-from src.pipeline_textblob_1.pipeline_1 import pipeline_textblob_1_main
-from src.pipeline_embeddings_2.pipeline_2 import pipeline_embeddings_2_main
-from src.pipeline_transformer_3.pipeline_3 import pipeline_transformer_3_main
+import src  # το src/__init__.py προσθέτει στο sys.path το κοινό package nlp_common
+from nlp_common.readers import iter_path_records
+from nlp_common.checkpoint import CheckpointWriter, DEFAULT_CHECKPOINT_EVERY
 
 # ============================== FILE PATHS ==============================
 # Directories
@@ -21,6 +26,47 @@ PIPELINE1_DIR = os.path.join(RESULTS_DIR, "pipeline_1_data")
 PIPELINE2_DIR = os.path.join(RESULTS_DIR, "pipeline_2_data")
 PIPELINE3_DIR = os.path.join(RESULTS_DIR, "pipeline_3_data")
 
+# ============================== PIPELINES ==============================
+# Τα pipeline modules γίνονται import μόνο όταν επιλεγούν (load_pipelines): το embeddings φέρνει το gensim και
+# το transformer το transformers + torch, που πριν φορτώνονταν σε κάθε εκκίνηση ακόμα κι αν έτρεχε μόνο το TextBlob
+
+# όνομα -> (module, συνάρτηση του demo (εκτυπώνει το αποτέλεσμα), συνάρτηση ανακατασκευής για το batch mode)
+PIPELINES = {
+    'textblob': ('src.pipeline_textblob_1.pipeline_1', 'pipeline_textblob_1_main', 'reconstruct_text_with_textblob'),
+    'embeddings': ('src.pipeline_embeddings_2.pipeline_2', 'pipeline_embeddings_2_main', 'reconstruct_text_with_embeddings'),
+    'transformer': ('src.pipeline_transformer_3.pipeline_3', 'pipeline_transformer_3_main', 'reconstruct_with_transformer'),
+}
+PIPELINE_LABELS = {'textblob': "TextBlob", 'embeddings': "Embeddings", 'transformer': "Transformer"}
+PIPELINE_DIRS = {'textblob': PIPELINE1_DIR, 'embeddings': PIPELINE2_DIR, 'transformer': PIPELINE3_DIR}
+
+# POS tagger engine των pipelines που κάνουν tagging (set_tagger_engine του module, π.χ. pipeline_2):
+# 'perceptron' (ίδιο με το nltk.pos_tag) ή 'numpy' (nlp_common/batch_tagger.py)
+TAGGER_ENGINES = ('perceptron', 'numpy')
+DEFAULT_TAGGER_ENGINE = 'perceptron'
+
+# Spelling correction των pipelines που το υποστηρίζουν (όρισμα spelling, π.χ. pipeline_1 - βλ. SPELLING_METHODS του module):
+# 'textblob' (TextBlob.correct) ή 'symspell' (nlp_common/symspell.py, χρειάζεται τον index)
+SPELLING_METHODS = ('textblob', 'symspell')
+DEFAULT_SPELLING = 'textblob'
+
+
+def load_pipelines(names, demo=False, tagger_engine=DEFAULT_TAGGER_ENGINE, spelling=DEFAULT_SPELLING):
+    # [(όνομα, συνάρτηση)] για τα επιλεγμένα pipelines, με τη σειρά των names - μόνο αυτά τα modules γίνονται import
+    unknown = [name for name in names if name not in PIPELINES]
+    if unknown:
+        raise ValueError(f"Unknown pipelines: {unknown} (available: {tuple(PIPELINES)})")
+    functions = []
+    for name in names:
+        module, demo_function, batch_function = PIPELINES[name]
+        module = importlib.import_module(module)
+        if hasattr(module, 'set_tagger_engine'):
+            module.set_tagger_engine(tagger_engine)
+        function = getattr(module, demo_function if demo else batch_function)
+        if hasattr(module, 'SPELLING_METHODS'):
+            function = functools.partial(function, spelling=spelling)
+        functions.append((name, function))
+    return functions
+
 # ============================== FILE I/O FUNCTIONS ==============================
 def load_text_from_file(filepath): # Φόρτωση κειμένου από αρχείο 
     if not os.path.exists(filepath):
@@ -44,8 +90,54 @@ def save_result(result_text, output_path): # Αποθήκευση κειμένο
 #         subprocess.Popen(['gnome-terminal', '--', 'python3', script_path, text_file])
 
 
+# ============================== BATCH EXECUTION FUNCTION ==============================
+
+def run_batch_1b(input_path, output, pipelines=tuple(PIPELINES), checkpoint_every=DEFAULT_CHECKPOINT_EVERY,
+                 resume=False, tagger_engine=DEFAULT_TAGGER_ENGINE, spelling=DEFAULT_SPELLING):
+    # Εκτέλεση των pipelines σε κάθε εγγραφή του input_path (αρχείο text / JSONL ή φάκελος, βλ. nlp_common/readers.py)
+    # Μία γραμμή JSON ανά εγγραφή στο output: id, original και το αποτέλεσμα κάθε pipeline - αν ένα pipeline
+    # αποτύχει, η εγγραφή έχει error και το run συνεχίζει
+    # Checkpoints στο <output>.ckpt κάθε checkpoint_every εγγραφές (nlp_common/checkpoint.py): resume=True συνεχίζει
+    # ένα run που διακόπηκε στο ίδιο output, χωρίς διπλές γραμμές
+    functions = load_pipelines(pipelines, tagger_engine=tagger_engine, spelling=spelling)
+    writer = CheckpointWriter(output, input_path, every=checkpoint_every, resume=resume)
+    if writer.resumed_records:
+        print(f"Resuming after {writer.resumed_records} records ({writer.manifest_path})", file=sys.stderr)
+
+    records = 0
+    failed = 0
+    start = time.perf_counter()
+    complete = False
+    try:
+        if not writer.complete:
+            for record in iter_path_records(input_path, errors='keep', resume_after=writer.resume_after):
+                result = {'id': record.id, 'original': record.text}
+                if record.error is not None:
+                    result['error'] = record.error
+                else:
+                    for name, function in functions:
+                        try:
+                            result[name] = function(record.text)
+                        except Exception as e:
+                            result['error'] = f"{name}: {e}"
+                            break
+                if 'error' in result:
+                    failed += 1
+                    print(f"[error] record {record.id} ({record.path}:{record.line}, byte {record.offset}): "
+                          f"{result['error']}", file=sys.stderr)
+                writer.write(json.dumps(result, ensure_ascii=False), record.id, record.path, record.offset, record.line)
+                records += 1
+        complete = True
+    finally:
+        writer.close(complete=complete)
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ {records} records in {elapsed:.2f}s ({records / elapsed if elapsed else 0.0:.1f} records/sec, "
+          f"{failed} failed, pipelines: {','.join(pipelines)})", file=sys.stderr)
+    return records
+
 # ============================== MAIN FUNCTION ==============================
-def run_deliverable_1b():
+def run_deliverable_1b(pipelines=tuple(PIPELINES), tagger_engine=DEFAULT_TAGGER_ENGINE, spelling=DEFAULT_SPELLING):
 
     print("\n" + "="*82)
     print("                        NLP ASSIGNMENT 2025 - DELIVERABLE 1B                      ")
@@ -53,9 +145,8 @@ def run_deliverable_1b():
 
     # Δημιουργία φακέλων
     os.makedirs(RAW_DIR, exist_ok=True)
-    os.makedirs(PIPELINE1_DIR, exist_ok=True)
-    os.makedirs(PIPELINE2_DIR, exist_ok=True)
-    os.makedirs(PIPELINE3_DIR, exist_ok=True)
+    for name in pipelines:
+        os.makedirs(PIPELINE_DIRS[name], exist_ok=True)
     
     try:
         # ΦΟΡΤΩΣΗ ΚΕΙΜΕΝΩΝ 
@@ -63,42 +154,18 @@ def run_deliverable_1b():
         text2 = load_text_from_file(TEXT2_FILE)
         print("[ Step 1 ] Load input texts")
         
-        # PIPELINE 1: TextBlob --------       
-        print("[ Step 2 ] Running Pipeline 1 (TextBlob)...")
-        result1_text1 = pipeline_textblob_1_main(text1)
-        save_result(result1_text1, os.path.join(PIPELINE1_DIR, "pipeline1_result_text1.txt"))
-        
-        result1_text2 = pipeline_textblob_1_main(text2)
-        save_result(result1_text2, os.path.join(PIPELINE1_DIR, "pipeline1_result_text2.txt"))
-        input("Press Enter to continue...")
-        # εμφάνιση νέας κονσόλας 
-        # run_pipeline_in_new_console('src/pipeline_textblob_1/filename.py', TEXT1_FILE)
-
-        
-        # PIPELINE 2: Embeddings --------        
-        print("[ Step 3 ] Running Pipeline 2 (Embeddings)...")
-        result2_text1 = pipeline_embeddings_2_main(text1)
-        save_result(result2_text1, os.path.join(PIPELINE2_DIR, "pipeline2_result_text1.txt"))
-        
-        result2_text2 = pipeline_embeddings_2_main(text2)
-        save_result(result2_text2, os.path.join(PIPELINE2_DIR, "pipeline2_result_text2.txt"))
-        
-        input("Press Enter to continue...")
-        # εμφάνιση νέας κονσόλας
-        # run_pipeline_in_new_console('src/pipeline_embeddings_2/filename.py', TEXT1_FILE)
-
-        
-        # PIPELINE 3: Transformer         
-        print("[ Step 4 ] Running Pipeline 3 (Transformer)...")
-        result3_text1 = pipeline_transformer_3_main(text1)
-        save_result(result3_text1, os.path.join(PIPELINE3_DIR, "pipeline3_result_text1.txt"))
-        
-        result3_text2 = pipeline_transformer_3_main(text2)
-        save_result(result3_text2, os.path.join(PIPELINE3_DIR, "pipeline3_result_text2.txt"))
-        
-        input("Press Enter to continue...")
-        # εμφάνιση νέας κονσόλας
-        # run_pipeline_in_new_console('src/pipeline_transformer_3/filename.py', TEXT1_FILE)
+        # PIPELINES: TextBlob, Embeddings, Transformer (ή όσα επιλέχθηκαν με --pipelines) --------
+        # Κάθε pipeline module γίνεται import όταν έρθει η σειρά του
+        for step, name in enumerate(pipelines, start=2):
+            number = list(PIPELINES).index(name) + 1
+            print(f"[ Step {step} ] Running Pipeline {number} ({PIPELINE_LABELS[name]})...")
+            [(_, pipeline_main)] = load_pipelines([name], demo=True, tagger_engine=tagger_engine, spelling=spelling)
+            for index, text in enumerate((text1, text2), start=1):
+                result = pipeline_main(text)
+                save_result(result, os.path.join(PIPELINE_DIRS[name], f"pipeline{number}_result_text{index}.txt"))
+            input("Press Enter to continue...")
+            # εμφάνιση νέας κονσόλας 
+            # run_pipeline_in_new_console(f'src/pipeline_{name}_{number}/filename.py', TEXT1_FILE)
 
         
         # ΤΕΛΟΣ 
@@ -121,6 +188,32 @@ def run_deliverable_1b():
         sys.exit(1)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="NLP Assignment 2025 - Deliverable 1B")
+    parser.add_argument("--input", help="batch mode: ένα κείμενο ανά γραμμή, JSONL με πεδίο 'text' ή φάκελος με αρχεία (χωρίς --input τρέχει το demo με text1/text2)")
+    parser.add_argument("--output", help="αρχείο JSONL εξόδου του batch mode")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help=f"ποια pipelines θα τρέξουν (demo και batch mode), χωρισμένα με κόμμα (default: {','.join(PIPELINES)})")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY, help="checkpoint στο <output>.ckpt κάθε τόσες εγγραφές")
+    parser.add_argument("--resume", action="store_true", help="συνέχεια ενός run που διακόπηκε, στο ίδιο --output")
+    parser.add_argument("--tagger", choices=TAGGER_ENGINES, default=DEFAULT_TAGGER_ENGINE, help="POS tagger engine του pipeline 2: perceptron (ίδιο με το nltk.pos_tag) ή numpy (vectorized tagging ανά batch)")
+    parser.add_argument("--spelling", choices=SPELLING_METHODS, default=DEFAULT_SPELLING, help="spelling correction του pipeline 1: textblob (TextBlob.correct) ή symspell (προϋπολογισμένος index, βλ. nlp_common/symspell.py)")
+    args = parser.parse_args()
+    if args.input and not args.output:
+        parser.error("--input needs --output (τα pipelines τυπώνουν στο stdout)")
+    if args.resume and not args.input:
+        parser.error("--resume needs --input and --output")
+    args.pipelines = tuple(name.strip() for name in args.pipelines.split(',') if name.strip())
+    unknown = [name for name in args.pipelines if name not in PIPELINES]
+    if unknown or not args.pipelines:
+        parser.error(f"--pipelines expects a comma-separated subset of {','.join(PIPELINES)}")
+    return args
+
+
 if __name__ == "__main__":
-    run_deliverable_1b()
+    args = parse_args()
+    if args.input:
+        run_batch_1b(args.input, args.output, args.pipelines, checkpoint_every=args.checkpoint_every,
+                     resume=args.resume, tagger_engine=args.tagger, spelling=args.spelling)
+    else:
+        run_deliverable_1b(args.pipelines, tagger_engine=args.tagger, spelling=args.spelling)
 
@@ -7,9 +7,7 @@
 import nltk
 import numpy as np
 from typing import List, Tuple, Optional
-import gensim.downloader as api
 from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.tag import pos_tag
 import random
 import warnings
 
@@ -27,6 +25,47 @@ warnings.filterwarnings('ignore')
 #     nltk.download('averaged_perceptron_tagger', quiet=True)
 
 
+# Τα pretrained embeddings φορτώνονται μία φορά ανά process (πριν ξαναφορτώνονταν σε κάθε κείμενο) και το
+# gensim γίνεται import μόνο τότε, όχι στο import του module
+_models = {}
+
+def get_embeddings_model(model_name):
+    model = _models.get(model_name)
+    if model is None:
+        import gensim.downloader as api
+        print(f"Φόρτωση pretrained embeddings: {model_name}...")
+        model = _models[model_name] = api.load(model_name)
+        print("✓ Embeddings ")
+    return model
+
+
+# POS tagger: ένας κοινός tagger ανά process (το nltk.pos_tag φόρτωνε νέο PerceptronTagger σε κάθε πρόταση)
+# Engine 'perceptron' (ίδιο με το nltk.pos_tag) ή 'numpy' (nlp_common/batch_tagger.py - όλες οι προτάσεις ενός κειμένου
+# σε ένα vectorized batch)
+TAGGER_ENGINES = ('perceptron', 'numpy')
+_tagger_engine = 'perceptron'
+_tagger = None
+
+def set_tagger_engine(engine):
+    global _tagger, _tagger_engine
+    if engine not in TAGGER_ENGINES:
+        raise ValueError(f"Unknown tagger engine: {engine} (available: {TAGGER_ENGINES})")
+    if engine != _tagger_engine:
+        _tagger = None
+    _tagger_engine = engine
+
+
+def get_pos_tagger():
+    global _tagger
+    if _tagger is None:
+        from nltk.tag import PerceptronTagger
+        _tagger = PerceptronTagger()
+        if _tagger_engine == 'numpy':
+            from nlp_common.batch_tagger import BatchTagger
+            _tagger = BatchTagger(_tagger)
+    return _tagger
+
+
 def pipeline_embeddings_2_main(text):
     
     try:
@@ -59,18 +98,20 @@ def reconstruct_text_with_embeddings(text: str, model_name: str = 'word2vec-goog
     # Αντικαθιστά content words με σημασιολογικά παρόμοιες λέξεις.
 
     # Φόρτωση pretrained embeddings
-    print(f"Φόρτωση pretrained embeddings: {model_name}...")
-    model = api.load(model_name)
-    print("✓ Embeddings ")
+    model = get_embeddings_model(model_name)
     
     # Διαχωρισμός σε προτάσεις
     sentences = sent_tokenize(text)
+
+    # Tokenization και POS tagging όλων των προτάσεων με μία κλήση (batch)
+    token_lists = [word_tokenize(sentence) for sentence in sentences]
+    pos_tags_list = get_pos_tagger().tag_sents(token_lists)
     
     reconstructed_sentences = []
     
-    for sentence in sentences:
+    for pos_tags in pos_tags_list:
         # Ανακατασκευή κάθε πρότασης
-        reconstructed = _reconstruct_sentence(sentence, model, similarity_threshold)
+        reconstructed = _reconstruct_sentence(pos_tags, model, similarity_threshold)
         if reconstructed:
             reconstructed_sentences.append(reconstructed)
     
@@ -79,19 +120,12 @@ def reconstruct_text_with_embeddings(text: str, model_name: str = 'word2vec-goog
 
 
 # Ανακατασκευή της πρότασης με word embeddings
-def _reconstruct_sentence(sentence: str, model, similarity_threshold: float) -> str:
-    # Βήματα:
-    # 1. Tokenization
-    # 2. POS tagging
+def _reconstruct_sentence(pos_tags: List[Tuple[str, str]], model, similarity_threshold: float) -> str:
+    # Βήματα (τα 1. Tokenization και 2. POS tagging γίνονται για όλες τις προτάσεις στο
+    # reconstruct_text_with_embeddings):
     # 3. Εύρεση semantic neighbors για content words
     # 4. Αντικατάσταση με similarity threshold
     # 5. Ανασύνθεση πρότασης
-
-    # Βήμα 1: Tokenization
-    tokens = word_tokenize(sentence)
-    
-    # Βήμα 2: POS tagging
-    pos_tags = pos_tag(tokens)
     
     # Content word POS tags
     content_pos = {'NN', 'NNS', 'NNP', 'NNPS',  # Nouns
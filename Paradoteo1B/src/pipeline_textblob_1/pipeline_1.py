@@ -6,17 +6,22 @@
 
 from textblob import TextBlob
 from typing import List, Tuple
-import re
 import warnings
 
+from nlp_common.postprocessing import postprocess
+
 warnings.filterwarnings('ignore')
 
-def pipeline_textblob_1_main(text):
+# Μέθοδοι ορθογραφικής διόρθωσης: 'textblob' (sentence.correct(), αργό σε μεγάλα κείμενα)
+# ή 'symspell' (edit distance με προϋπολογισμένο index - βλ. nlp_common/symspell.py)
+SPELLING_METHODS = ('textblob', 'symspell')
+
+def pipeline_textblob_1_main(text, spelling='textblob'):
     #main συνάρτηση για το pipeline 1 - καλεί τις υπόλοιπες, εκτυπώνει και επιστρέφει το νέο κείμενο στη main
     
     try:
         og_text = text
-        reconstructed_txt = reconstruct_text_with_textblob(text)
+        reconstructed_txt = reconstruct_text_with_textblob(text, spelling)
 
         print("\n" + "="*82)
         print("                  PIPELINE 1: TextBlob-based Text Reconstruction                  ")
@@ -38,15 +43,17 @@ def pipeline_textblob_1_main(text):
     return reconstructed_txt
 
 # η συνάρτηση που είναι υπεύθυνη για το reconstruction με τη χρήση textblob
-def reconstruct_text_with_textblob(text:str)->str:
+def reconstruct_text_with_textblob(text:str, spelling:str='textblob')->str:
     # TextBlob object
+        if spelling not in SPELLING_METHODS:
+            raise ValueError(f"Unknown spelling method: {spelling} (available: {SPELLING_METHODS})")
         blob = TextBlob(text)
         
         # επεξεργασία κάθε πρότασης
         reconstructed_sentences = []
         
         for sentence in blob.sentences: # corrections and reconstruction
-            reconstructed = _reconstruct_sentence(sentence)
+            reconstructed = _reconstruct_sentence(sentence, spelling)
             clean_sent_str = str(reconstructed).strip()
             if reconstructed: reconstructed_sentences.append(reconstructed)
         # ένωσε τις προτάσεις        
@@ -54,7 +61,7 @@ def reconstruct_text_with_textblob(text:str)->str:
 
 
 # Ανακατασκευή της πρότασης με τη χρήση του TextBlob    
-def _reconstruct_sentence(sentence: TextBlob) ->str:    
+def _reconstruct_sentence(sentence: TextBlob, spelling: str = 'textblob') ->str:    
     # Βήματα:
     # 1. Διόρθωση ορθογραφίας (TextBlob το κάνει)
     # 2. Εξαγωγή POS tags και noun phrases (TextBlob το κάνει αυτόματα)
@@ -63,7 +70,7 @@ def _reconstruct_sentence(sentence: TextBlob) ->str:
     # Δέχεται αντικείμενο TextBlob -> επιστρέφει string
 
     # Βήμα 1: Διόρθωση ορθογραφίας 
-    corrected = sentence.correct()
+    corrected = _correct_spelling(sentence, spelling)
     
     # Β΄ήμα 2: εξαγωγή ετικετών
     words = corrected.words # tokenization
@@ -82,6 +89,13 @@ def _reconstruct_sentence(sentence: TextBlob) ->str:
     
     return reconstructed
 
+# Διόρθωση ορθογραφίας μιας πρότασης με την επιλεγμένη μέθοδο
+def _correct_spelling(sentence: TextBlob, spelling: str) -> TextBlob:
+    if spelling == 'symspell':
+        from nlp_common.symspell import get_symspell  # φορτώνεται μόνο όταν ζητηθεί
+        return TextBlob(get_symspell().correct_text(str(sentence)))
+    return sentence.correct()
+
 # Αναδιοργάνωση με βάση τις ετικέτες από το TextBlob
 def _reorganize_by_pos(words: List[str], tags: List[Tuple[str, str]], noun_phrases: List[str]) -> str:
     # Αυτόματη προσθήκη POS tags από TextBlob:
@@ -138,20 +152,5 @@ def _clean_text(text: str) -> str:
     # Διόρθωση της απόστασης με το σημείο στίξης
     # Αφαίρεση διπλού σημείου στίξης
     # Διασφάλιση ότι η πρόταση τελειώνει σωστά
-        
-    # αφαίρεση κενού
-    text = re.sub(r'\s+', ' ', text)
-    
-    # φτιάξε το punctuation
-    text = re.sub(r'\s+([.,!?;:])', r'\1', text)
-    text = re.sub(r'([.,!?;:])\s*', r'\1 ', text)
-    
-    # αφαίρεση διπλότυπου
-    text = re.sub(r'([.,!?;:])\1+', r'\1', text)
-    
-    # Να είμαστε σίγουροι ότι η πρόταση τελειώνει σωστά
-    text = text.strip()
-    if text and text[-1] not in '.!?':
-        text += '.'
-    
-    return text
+    # Σε ένα πέρασμα με το κοινό post-processing (nlp_common/postprocessing.py, profile 'textblob')
+    return postprocess(text, 'textblob')
@@ -1,13 +1,35 @@
 # Pipeline 3: Transformer-based text reconstruction with text-to-text generation
 # Το pipeline χρησιμοποιεί encoder-decoder transformer για επανεγγραφή κειμένου με βάση τα συμφραζόμενα
 
-from transformers import pipeline as hf_pipeline
 #from typing import Optional
 import warnings
 
+from nlp_common.postprocessing import postprocess
+
 warnings.filterwarnings('ignore')
 
 
+# Το μοντέλο φορτώνεται μία φορά ανά process (πριν ξαναφορτωνόταν σε κάθε κείμενο) και το transformers (και μαζί
+# του το torch) γίνεται import μόνο τότε, όχι στο import του module
+_reconstructors = {}
+
+def get_reconstructor(model_name):
+    reconstructor = _reconstructors.get(model_name)
+    if reconstructor is None:
+        from transformers import pipeline as hf_pipeline
+        # επιβεβαίωση για το ποιό μοντέλο χρησιμοποιείται για λόγους debug
+        print(f"[Pipeline 3] Loading model: {model_name}") 
+        # Initialize text2text-generation pipeline
+        # This wraps a T5/BART-style encoder-decoder model
+        reconstructor = _reconstructors[model_name] = hf_pipeline(
+            "text2text-generation",
+            model=model_name,
+            device=-1,  # CPU; αλλαή σε 0 για GPU
+            max_length=512
+        )
+    return reconstructor
+
+
 def pipeline_transformer_3_main(text: str) -> str:
     # Χρησιμοποιεί ένα pretrained encoder-decoder transformer model για ανακατασκεύη κειμένου με text-to-text generation.
     # Το μοντέλο επεξεργάζεται την είσοδο με attention mechanisms για να παράγει σαφή και συνεκτική έξοδο  
@@ -53,17 +75,7 @@ def reconstruct_with_transformer(text: str) -> str:
 
     model_name = "google/flan-t5-xl" # μεγάλο, αργό, καλύτερη ποιότητα
     # model_name = "prithvida/grammar_error_correcter_v1" # συγκεκριμένο για γραμματικά errors 
-    # επιβεβαίωση για το ποιό μοντέλο χρησιμοποιείται για λόγους debug
-    print(f"[Pipeline 3] Loading model: {model_name}") 
-    
-    # Initialize text2text-generation pipeline
-    # This wraps a T5/BART-style encoder-decoder model
-    reconstructor = hf_pipeline(
-        "text2text-generation",
-        model=model_name,
-        device=-1,  # CPU; αλλαή σε 0 για GPU
-        max_length=512
-    )
+    reconstructor = get_reconstructor(model_name)
     
     # Προετοιμασία input για το model
     # Κάποια μοντέλα χρειάζονται ακριβής οδηγίες
@@ -99,29 +111,9 @@ def reconstruct_with_transformer(text: str) -> str:
 def _post_process_output(text: str) -> str:
     # Αυτή η συνάρτηση εκτελεί μόνο formatting. Όλες οι σημασιολογικές και γραμματικές βελτιώσεις 
     # προέρχονται από το transformer generation και όχι από διορθώσεις σε κανόνες
-    
-    import re
-    
-    # Cleanup
-    text = text.strip()
-    
-    # Πρώτο γράμμα κεφαλαίο
-    if text: text = text[0].upper() + text[1:]
-    
-    # Κενό πριν και μετά τη τελεία
-    text = re.sub(r'\s+([.,!?;:])', r'\1', text)  # Αφαίρεση κενού
-    text = re.sub(r'([.,!?;:])\s*', r'\1 ', text)  # Προσθήκη 
-    
-    # Αφαίρεση διπλότυπων σημείων στίξης
-    text = re.sub(r'([.,!?;:])\1+', r'\1', text)
-    
-    # Πρόταση τελειώνει με τη σωστή στίξη
-    if text and text[-1] not in '.!?': text += '.'
-    
-    # Τελικός καθαρισμός πολλαπλών χώρων
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
+    # Κεφαλαίο πρώτο γράμμα, κενά γύρω από τη στίξη, τελεία στο τέλος, καθαρισμός κενών
+    # Σε ένα πέρασμα με το κοινό post-processing (nlp_common/postprocessing.py, profile 'transformer')
+    return postprocess(text, 'transformer')
 
 
 # # Alternative: Χρήση paraphrasing μοντέλου αντί για γραμματική διόρθωση
@@ -0,0 +1,3 @@
+# NLP Assignment 2025 - κοινά modules των Paradoteo1A και Paradoteo1B
+# readers, checkpoint, symspell, postprocessing, batch_tagger: τα κάνουν import και τα δύο παραδοτέα ως nlp_common.X
+# (το src/__init__.py κάθε παραδοτέου προσθέτει τον φάκελο του repo στο sys.path)
@@ -0,0 +1,213 @@
+# Vectorized averaged perceptron POS tagger με NumPy - το tagger engine 'numpy' (--tagger numpy)
+# Ο PerceptronTagger του NLTK (και το nltk.pos_tag) βαθμολογεί ένα token τη φορά: dict με 14 features, lookup των
+# weights κάθε feature και άθροισμα ανά class σε Python. Εδώ τα ίδια averaged weights φορτώνονται σε πίνακες και
+# βαθμολογούνται όλα τα tokens ενός batch μαζί:
+# - feature string -> γραμμή μέσω hash table (dict), weights σε CSR (indptr, class ids, weights)
+# - τα features που δεν εξαρτώνται από τα προηγούμενα tags (bias, suffix / prefix, λέξεις i-2..i+2) μαζεύονται για
+#   όλα τα tokens του batch και αθροίζονται με ένα np.bincount -> static scores (tokens x classes)
+# - τα "i-1 tag", "i-2 tag" και "i tag+i-2 tag" είναι πυκνοί πίνακες ανά tag history (prev, prev2)
+# - η αποκωδικοποίηση μένει greedy από αριστερά προς τα δεξιά (ίδιο tag history με το NLTK), αλλά κάθε βήμα
+#   γίνεται για τη θέση i όλων των προτάσεων του batch μαζί - μόνο το "i-1 tag+i word" γίνεται lookup ανά token
+# Ίδια tagdict, normalize και ισοβαθμίες (μεγαλύτερο label) με το NLTK - η μόνη διαφορά είναι η σειρά άθροισης των
+# floats, που αλλάζει το αποτέλεσμα μόνο σε ισοβαθμίες στο τελευταίο bit (βλ. bench_batch_tagger του 1A).
+# (κοινό module των Paradoteo1A και Paradoteo1B, import ως nlp_common.batch_tagger)
+
+import numpy as np
+
+DEFAULT_BATCH_SENTENCES = 512
+
+# Ένα entry του πίνακα weights του nltk_snapshot (struct '<Bd': class id, weight)
+_SNAPSHOT_WEIGHT = np.dtype([('class', 'u1'), ('weight', '<f8')])
+
+# ============================== WEIGHTS ==============================
+
+def _perceptron_weights(tagger):
+    # Από τον PerceptronTagger του NLTK (model.weights: feature -> {class: weight})
+    # -> (feature -> γραμμή, indptr, class ids, weights, classes)
+    classes = sorted(tagger.classes)
+    class_id = {label: c for c, label in enumerate(classes)}
+    features = {}
+    indptr = [0]
+    labels = []
+    values = []
+    for feature, weights in tagger.model.weights.items():
+        features[feature] = len(features)
+        labels.extend(map(class_id.__getitem__, weights))
+        values.extend(weights.values())
+        indptr.append(len(labels))
+    return features, np.array(indptr, dtype=np.int64), np.array(labels, dtype=np.intp), \
+        np.array(values, dtype=np.float64), classes
+
+
+def _snapshot_weights(tagger):
+    # Από το binary snapshot (nltk_snapshot): ο πίνακας weights είναι ήδη CSR - (class id, weight) ανά feature
+    table = tagger.snapshot.tables['weights']
+    keys = bytes(table.keys)
+    key_offsets = table.key_offsets.tolist()
+    features = {keys[key_offsets[i]:key_offsets[i + 1]].decode('utf-8'): i for i in range(len(table))}
+    entries = np.frombuffer(table.values, dtype=_SNAPSHOT_WEIGHT)
+    indptr = np.frombuffer(table.value_offsets, dtype=np.uint64).astype(np.int64) // _SNAPSHOT_WEIGHT.itemsize
+    return features, indptr, entries['class'].astype(np.intp), entries['weight'].copy(), \
+        list(tagger.snapshot.header['classes'])
+
+# ============================== TAGGER ==============================
+
+class BatchTagger:
+    # Ίδιο interface (tag / tag_sents) με τον PerceptronTagger, φορτωμένο από έναν PerceptronTagger ή SnapshotTagger
+    # Τα normalize, tagdict, _get_features και model είναι του αρχικού tagger, ώστε το
+    # grammatical_correction.retag_stream να δουλεύει και με αυτό το engine (ξαναϋπολογίζει λίγες θέσεις ανά
+    # πρόταση με το model.predict)
+
+    def __init__(self, tagger, batch_sentences=DEFAULT_BATCH_SENTENCES):
+        if batch_sentences < 1:
+            raise ValueError(f"batch_sentences must be >= 1, got {batch_sentences}")
+        self.batch_sentences = batch_sentences
+        self.START = list(tagger.START)
+        self.END = list(tagger.END)
+        self.normalize = tagger.normalize
+        self.tagdict = tagger.tagdict
+        self._get_features = tagger._get_features
+        self.model = tagger.model
+
+        loader = _snapshot_weights if hasattr(tagger, 'snapshot') else _perceptron_weights
+        self._rows, indptr, class_ids, weights, classes = loader(tagger)
+        # Classes σε φθίνουσα σειρά: το argmax κρατάει την πρώτη μέγιστη τιμή, άρα σε ισοβαθμία το μεγαλύτερο
+        # label - όπως το max(classes, key=(score, label)) του NLTK
+        self.classes = sorted(classes, reverse=True)
+        order = np.array([self.classes.index(label) for label in classes], dtype=np.intp)
+        self._indptr = indptr
+        self._cols = order[class_ids]
+        self._weights = weights
+        self._class_id = {label: c for c, label in enumerate(self.classes)}
+
+        # Tag history: 0..C-1 τα classes, C και C+1 τα START (prev, prev2 της πρώτης θέσης)
+        self._history = self.classes + self.START
+        history = self._history
+        self._bias = self._row_scores("bias")
+        self._prev_scores = np.stack([self._row_scores("i-1 tag " + prev) for prev in history])
+        self._prev2_scores = np.stack([self._row_scores("i-2 tag " + prev2) for prev2 in history])
+        self._pair_scores = np.stack([
+            np.stack([self._row_scores("i tag+i-2 tag " + prev + " " + prev2) for prev2 in history])
+            for prev in history
+        ])
+
+    def _row_scores(self, feature):
+        scores = np.zeros(len(self.classes))
+        row = self._rows.get(feature)
+        if row is not None:
+            start, end = self._indptr[row], self._indptr[row + 1]
+            scores[self._cols[start:end]] = self._weights[start:end]
+        return scores
+
+    def _gather(self, rows):
+        # Τα CSR entries των γραμμών rows -> (θέση στο rows ανά entry, class ids, weights)
+        starts = self._indptr[rows]
+        counts = self._indptr[rows + 1] - starts
+        owner = np.repeat(np.arange(len(rows)), counts)
+        entries = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + starts[owner]
+        return owner, self._cols[entries], self._weights[entries]
+
+    def _tag_batch(self, sentences):
+        # Οι προτάσεις ταξινομούνται κατά φθίνον μήκος, ώστε στη θέση i να είναι ενεργές οι πρώτες active[i]
+        # Τα tokens αποθηκεύονται ανά θέση: token (b, i) -> offsets[i] + b
+        order = sorted(range(len(sentences)), key=lambda s: -len(sentences[s]))
+        sentences_sorted = [sentences[s] for s in order]
+        max_length = len(sentences_sorted[0]) if sentences_sorted else 0
+        active = [0] * max_length
+        for tokens in sentences_sorted:
+            for i in range(len(tokens)):
+                active[i] += 1
+        offsets = [0] * max_length
+        for i in range(1, max_length):
+            offsets[i] = offsets[i - 1] + active[i - 1]
+        total = offsets[-1] + active[-1] if max_length else 0
+
+        # Static features για κάθε token που δεν βρίσκεται στο tagdict
+        rows_get = self._rows.get
+        tag_of = self.tagdict.get
+        class_id = self._class_id
+        normalize = self.normalize
+        fixed = [-1] * total
+        pending = [[] for _ in range(max_length)]  # ανά θέση: προτάσεις όπου το tag θα προβλεφθεί
+        contexts = []
+        token_ids = []
+        feature_rows = []
+        for b, tokens in enumerate(sentences_sorted):
+            context = self.START + [normalize(word) for word in tokens] + self.END
+            contexts.append(context)
+            for i, word in enumerate(tokens):
+                flat = offsets[i] + b
+                tag = tag_of(word)
+                if tag:
+                    fixed[flat] = class_id[tag]
+                    continue
+                pending[i].append(b)
+                c = i + 2
+                for feature in (
+                    "i suffix " + word[-3:],
+                    "i pref1 " + (word[0] if word else ""),
+                    "i word " + context[c],
+                    "i-1 word " + context[c - 1],
+                    "i-1 suffix " + context[c - 1][-3:],
+                    "i-2 word " + context[c - 2],
+                    "i+1 word " + context[c + 1],
+                    "i+1 suffix " + context[c + 1][-3:],
+                    "i+2 word " + context[c + 2],
+                ):
+                    row = rows_get(feature)
+                    if row is not None:
+                        token_ids.append(flat)
+                        feature_rows.append(row)
+
+        n_classes = len(self.classes)
+        static = np.zeros(total * n_classes)
+        if feature_rows:
+            owner, cols, weights = self._gather(np.array(feature_rows, dtype=np.intp))
+            static = np.bincount(np.array(token_ids, dtype=np.intp)[owner] * n_classes + cols,
+                                 weights=weights, minlength=total * n_classes)
+        static = static.reshape(total, n_classes) + self._bias
+        fixed = np.array(fixed, dtype=np.intp)
+
+        # Greedy αποκωδικοποίηση: μία θέση τη φορά, όλες οι ενεργές προτάσεις μαζί
+        history = self._history
+        prev = np.full(len(sentences_sorted), n_classes, dtype=np.intp)
+        prev2 = np.full(len(sentences_sorted), n_classes + 1, dtype=np.intp)
+        tags = np.empty(total, dtype=np.intp)
+        for i in range(max_length):
+            k, start = active[i], offsets[i]
+            p, p2 = prev[:k], prev2[:k]
+            scores = static[start:start + k] + self._prev_scores[p] + self._prev2_scores[p2] + self._pair_scores[p, p2]
+
+            owners = []
+            rows = []
+            previous = p.tolist()
+            for b in pending[i]:
+                row = rows_get("i-1 tag+i word " + history[previous[b]] + " " + contexts[b][i + 2])
+                if row is not None:
+                    owners.append(b)
+                    rows.append(row)
+            if rows:
+                owner, cols, weights = self._gather(np.array(rows, dtype=np.intp))
+                scores[np.array(owners, dtype=np.intp)[owner], cols] += weights
+
+            step = fixed[start:start + k]
+            step = np.where(step >= 0, step, scores.argmax(axis=1))
+            tags[start:start + k] = step
+            prev2[:k] = p
+            prev[:k] = step
+
+        labels = [self.classes[t] for t in tags.tolist()]
+        tagged = [None] * len(sentences)
+        for b, s in enumerate(order):
+            tagged[s] = [(word, labels[offsets[i] + b]) for i, word in enumerate(sentences[s])]
+        return tagged
+
+    def tag(self, tokens):
+        return self._tag_batch([list(tokens)])[0]
+
+    def tag_sents(self, sentences):
+        sentences = [list(tokens) for tokens in sentences]
+        tagged = []
+        for start in range(0, len(sentences), self.batch_sentences):
+            tagged.extend(self._tag_batch(sentences[start:start + self.batch_sentences]))
+        return tagged
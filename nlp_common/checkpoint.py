@@ -0,0 +1,131 @@
+# Checkpoints για μεγάλα batch runs (resume μετά από διακοπή ή crash)
+# Τα αποτελέσματα γράφονται με τη σειρά της εισόδου, οπότε η πρόοδος ενός run περιγράφεται πλήρως από την
+# τελευταία ολοκληρωμένη εγγραφή. Δίπλα στο αρχείο εξόδου κρατάμε append-only manifest (<output>.ckpt) με μία
+# γραμμή JSON ανά checkpoint (κάθε `every` εγγραφές ή `seconds` δευτερόλεπτα):
+#   records      πόσες εγγραφές έχουν ολοκληρωθεί συνολικά
+#   id, path, offset, line   η τελευταία ολοκληρωμένη εγγραφή (αρχείο, byte offset, αριθμός γραμμής)
+#   output_bytes μέγεθος της εξόδου τη στιγμή του checkpoint (μετά από flush + fsync)
+#   input        το αρχείο / φάκελος εισόδου του run, complete: true στο τελευταίο checkpoint
+# Resume: διαβάζεται η τελευταία πλήρης γραμμή του manifest, η έξοδος κόβεται στο output_bytes (ό,τι γράφτηκε μετά
+# το checkpoint ξαναγράφεται, άρα καμία γραμμή δεν διπλασιάζεται) και η είσοδος συνεχίζει με seek αμέσως μετά την
+# τελευταία εγγραφή (readers.iter_path_records(resume_after=...)) - χωρίς να ξαναδιαβαστούν οι προηγούμενες.
+# (κοινό module των Paradoteo1A και Paradoteo1B, import ως nlp_common.checkpoint)
+
+import os
+import json
+import time
+
+DEFAULT_CHECKPOINT_EVERY = 1000
+DEFAULT_CHECKPOINT_SECONDS = 30.0
+MANIFEST_SUFFIX = ".ckpt"
+
+
+def manifest_path(output_path):
+    return output_path + MANIFEST_SUFFIX
+
+
+def _read_manifest(path):
+    # (τελευταίο πλήρες checkpoint ή None, bytes του manifest μέχρι το τέλος του)
+    state = None
+    valid_bytes = 0
+    if not os.path.exists(path):
+        return state, valid_bytes
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                state = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break
+            valid_bytes += len(line)
+    return state, valid_bytes
+
+
+def load_checkpoint(path):
+    # Το τελευταίο πλήρες checkpoint του manifest ή None (μια μισογραμμένη τελευταία γραμμή αγνοείται)
+    return _read_manifest(path)[0]
+
+
+class CheckpointWriter:
+    # Γράφει τις γραμμές εξόδου και το manifest - resume=True συνεχίζει από το τελευταίο checkpoint
+
+    def __init__(self, output_path, input_path, every=DEFAULT_CHECKPOINT_EVERY,
+                 seconds=DEFAULT_CHECKPOINT_SECONDS, resume=False):
+        if every < 1:
+            raise ValueError(f"every must be >= 1, got {every}")
+        self.output_path = output_path
+        self.input_path = input_path
+        self.every = every
+        self.seconds = seconds
+        self.manifest_path = manifest_path(output_path)
+
+        state, valid_bytes = _read_manifest(self.manifest_path) if resume else (None, 0)
+        if state is not None and os.path.abspath(state.get('input', '')) != os.path.abspath(input_path):
+            raise ValueError(
+                f"Cannot resume: {self.manifest_path} belongs to a run over {state.get('input')}, not {input_path}"
+            )
+        self.state = state
+        self.resumed_records = state['records'] if state else 0
+        self.records = self.resumed_records
+        self._since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+        self._last = None
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        if state is not None:
+            # ό,τι γράφτηκε μετά το τελευταίο checkpoint θα ξαναγραφτεί
+            with open(output_path, 'ab') as f:
+                f.truncate(state['output_bytes'])
+            with open(self.manifest_path, 'ab') as f:
+                f.truncate(valid_bytes)  # μια μισογραμμένη γραμμή από crash δεν πρέπει να κολλήσει με την επόμενη
+            self.out = open(output_path, 'a', encoding='utf-8')
+            self.manifest = open(self.manifest_path, 'a', encoding='utf-8')
+        else:
+            self.out = open(output_path, 'w', encoding='utf-8')
+            self.manifest = open(self.manifest_path, 'w', encoding='utf-8')
+
+    @property
+    def resume_after(self):
+        # (path, offset, line) της τελευταίας ολοκληρωμένης εγγραφής, για το readers.iter_path_records
+        if self.state is None or self.state.get('path') is None:
+            return None
+        return self.state['path'], self.state['offset'], self.state['line']
+
+    @property
+    def complete(self):
+        return bool(self.state and self.state.get('complete'))
+
+    def write(self, line, record_id, path, offset, line_number):
+        # Μία γραμμή εξόδου για την εγγραφή (path, offset, line_number) της εισόδου
+        self.out.write(line + "\n")
+        self.out.flush()  # κάθε αποτέλεσμα γίνεται ορατό μόλις ολοκληρωθεί (π.χ. για tail -f)
+        self.records += 1
+        self._since_checkpoint += 1
+        self._last = {'id': record_id, 'path': path, 'offset': offset, 'line': line_number}
+        if self._since_checkpoint >= self.every or time.monotonic() - self._last_checkpoint >= self.seconds:
+            self.checkpoint()
+
+    def checkpoint(self, complete=False):
+        # Η έξοδος γίνεται durable πριν καταγραφεί στο manifest, ώστε το output_bytes να υπάρχει πάντα στον δίσκο
+        self.out.flush()
+        os.fsync(self.out.fileno())
+        state = dict(self.state or {}, input=self.input_path, records=self.records, output_bytes=self.out.tell())
+        if self._last is not None:
+            state.update(self._last)
+        if complete:
+            state['complete'] = True
+        self.manifest.write(json.dumps(state, ensure_ascii=False) + "\n")
+        self.manifest.flush()
+        os.fsync(self.manifest.fileno())
+        self.state = state
+        self._since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+
+    def close(self, complete=True):
+        # complete=False: κλείσιμο μετά από διακοπή (το run μπορεί να συνεχιστεί με resume)
+        try:
+            self.checkpoint(complete=complete)
+        finally:
+            self.out.close()
+            self.manifest.close()
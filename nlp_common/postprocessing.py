@@ -0,0 +1,151 @@
+# Κοινό post-processing (μορφοποίηση κειμένου) για όλα τα pipelines
+# Τέσσερα σημεία έκαναν σχεδόν την ίδια μορφοποίηση με αλυσίδες από re.sub (ένα πέρασμα του κειμένου η καθεμία):
+# - apply_post_processing (grammatical_correction.py)       -> profile 'grammar'
+# - Step 7 του syntactic_analysis_pipeline (finalize_reconstruction) -> profile 'syntactic'
+# - _clean_text του pipeline 1 (TextBlob)                  -> profile 'textblob'
+# - _post_process_output του pipeline 3 (transformer)      -> profile 'transformer'
+# Εδώ ένα precompiled pattern βρίσκει μόνο τα σημεία που αλλάζουν (ομάδες από σημεία στίξης και κενά,
+# εκτός από το απλό ' ' ανάμεσα σε λέξεις) - το υπόλοιπο κείμενο αντιγράφεται από τη C υλοποίηση του re σε ένα πέρασμα.
+# Κάθε profile δίνει ακριβώς την ίδια έξοδο με την παλιά αλυσίδα του (βλ. python benchmark.py postprocessing)
+# (κοινό module των Paradoteo1A και Paradoteo1B, import ως nlp_common.postprocessing)
+
+import re
+import sys
+import time
+
+PUNCTUATION = '.,!?;:'
+SENTENCE_END = '.!?'
+
+# Μέγιστη ακολουθία από κενά / σημεία στίξης, εκτός από ένα μόνο ' ' ανάμεσα σε λέξεις (που μένει ως έχει)
+# Ξεκινά πάντα με χαρακτήρα από σταθερό σύνολο, οπότε το re ψάχνει τις θέσεις χωρίς να δοκιμάζει κάθε χαρακτήρα
+_GROUP = r'(?:[.,!?;:]|[^\S ]|\s(?=[\s.,!?;:]))[\s.,!?;:]*'
+_FORMAT_PATTERN = re.compile(_GROUP)
+# Ίδιο, με κενό group 1 όταν ακολουθεί λατινικό γράμμα (για space_after='before_letter')
+_FORMAT_PATTERN_LETTER = re.compile(_GROUP + r'((?=[A-Za-z]))?')
+
+# ============================== PROFILES ==============================
+# strip_space_before: σημεία στίξης που χάνουν τα κενά πριν από αυτά (τα υπόλοιπα κρατούν ένα κενό)
+# space_after: 'always' = ακριβώς ένα κενό μετά από κάθε σημείο στίξης,
+#              'before_letter' = κενό μόνο αν ακολουθεί αμέσως λατινικό γράμμα, None = όπως είναι
+# collapse_repeats: σημεία στίξης που όταν επαναλαμβάνονται γίνονται ένα ('!!!' -> '!')
+# capitalize: κεφαλαίο πρώτο γράμμα
+# final_period: True = τελεία αν το κείμενο δεν τελειώνει σε . ! ?, False = καμία,
+#               'spaced' = πάντα τελεία, μετά από κενό αν το κείμενο τελειώνει σε στίξη (έξοδος του pipeline 3)
+
+PROFILES = {
+    'grammar': {
+        'strip_space_before': PUNCTUATION,
+        'space_after': 'before_letter',
+        'collapse_repeats': SENTENCE_END,
+        'capitalize': True,
+        'final_period': True,
+    },
+    'syntactic': {
+        'strip_space_before': '.,!?',
+        'space_after': None,
+        'collapse_repeats': '',
+        'capitalize': True,
+        'final_period': True,
+    },
+    'textblob': {
+        'strip_space_before': PUNCTUATION,
+        'space_after': 'always',
+        'collapse_repeats': '',
+        'capitalize': False,
+        'final_period': True,
+    },
+    'transformer': {
+        'strip_space_before': PUNCTUATION,
+        'space_after': 'always',
+        'collapse_repeats': '',
+        'capitalize': True,
+        'final_period': 'spaced',
+    },
+}
+
+# ============================== FORMATTER ==============================
+
+def _format_group(group, before_letter, profile):
+    # Νέα μορφή μιας ομάδας του _FORMAT_PATTERN - before_letter: αμέσως μετά την ομάδα ακολουθεί λατινικό γράμμα
+    if group.isspace():
+        # κενά (tabs, newlines, πολλαπλά) -> ένα κενό
+        return ' '
+
+    # ομάδα στίξης: κενά πριν από κάθε σημείο + τα κενά μετά το τελευταίο
+    parts = []
+    pending_space = False
+    for char in group:
+        if char.isspace():
+            pending_space = True
+            continue
+        if pending_space and char not in profile['strip_space_before']:
+            parts.append(' ')
+        pending_space = False
+        if parts and parts[-1] == char and char in profile['collapse_repeats']:
+            continue
+        parts.append(char)
+        if profile['space_after'] == 'always':
+            parts.append(' ')
+
+    if profile['space_after'] == 'always':
+        pass  # τα κενά μετά την ομάδα έχουν ήδη αντικατασταθεί από ένα
+    elif pending_space or (before_letter and profile['space_after'] == 'before_letter'):
+        parts.append(' ')
+    return ''.join(parts)
+
+
+def postprocess(text, profile):
+    # Μορφοποίηση κειμένου σύμφωνα με ένα profile (όνομα από τα PROFILES ή dict με τις ίδιες επιλογές)
+    if not text:
+        return text
+    if isinstance(profile, str):
+        profile = PROFILES[profile]
+
+    cache = {}  # ομάδα -> νέα μορφή (οι ίδιες ομάδες, π.χ. ', ', επαναλαμβάνονται σε όλο το κείμενο)
+
+    if profile['space_after'] == 'before_letter':
+        letter_cache = {}  # ομάδες που ακολουθούνται αμέσως από γράμμα
+
+        def replace(match):
+            group, letter = match.group(0, 1)
+            before_letter = letter is not None
+            groups = letter_cache if before_letter else cache
+            formatted = groups.get(group)
+            if formatted is None:
+                formatted = groups[group] = _format_group(group, before_letter, profile)
+            return formatted
+        pattern = _FORMAT_PATTERN_LETTER
+    else:
+        def replace(match):
+            group = match.group()
+            formatted = cache.get(group)
+            if formatted is None:
+                formatted = cache[group] = _format_group(group, False, profile)
+            return formatted
+        pattern = _FORMAT_PATTERN
+
+    text = pattern.sub(replace, text).strip()
+
+    if text and profile['capitalize']:
+        text = text[0].upper() + text[1:]
+
+    final_period = profile['final_period']
+    if text and final_period == 'spaced':
+        text += ' .' if text[-1] in PUNCTUATION else '.'
+    elif text and final_period and text[-1] not in SENTENCE_END:
+        text += '.'
+
+    return text
+
+
+if __name__ == "__main__":
+    # PYTHONPATH=.. python -m nlp_common.postprocessing <profile> <αρχείο> : μορφοποίηση αρχείου και χρόνος
+    if len(sys.argv) != 3 or sys.argv[1] not in PROFILES:
+        print(f"Usage: PYTHONPATH=.. python -m nlp_common.postprocessing <{'|'.join(PROFILES)}> <file>")
+        sys.exit(1)
+    with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        content = f.read()
+    start = time.perf_counter()
+    formatted = postprocess(content, sys.argv[1])
+    print(formatted)
+    print(f"\n({len(content)} chars formatted in {time.perf_counter() - start:.3f}s)", file=sys.stderr)
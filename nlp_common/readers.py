@@ -0,0 +1,185 @@
+# Streaming readers για μεγάλα αρχεία εισόδου (πολλά GB)
+# Το αρχείο γίνεται memory-map και οι εγγραφές διαβάζονται lazily μία-μία, χωρίς f.read() όλου του αρχείου.
+# Υποστηρίζονται:
+# - 'text':  μία πρόταση/κείμενο ανά γραμμή (οι κενές γραμμές αγνοούνται)
+# - 'jsonl': ένα JSON object ανά γραμμή με πεδίο κειμένου (default 'text') και προαιρετικό id
+# - φάκελο: κάθε αρχείο .jsonl/.ndjson διαβάζεται ως jsonl και κάθε άλλο ως text - ή, με whole_files=True, κάθε
+#   άλλο αρχείο είναι ένα κείμενο (iter_path_records)
+# Κάθε εγγραφή κρατάει byte offset και αριθμό γραμμής ώστε μια αποτυχημένη εγγραφή να εντοπίζεται στο αρχείο.
+# (κοινό module των Paradoteo1A και Paradoteo1B, import ως nlp_common.readers)
+
+import os
+import mmap
+import json
+from collections import namedtuple
+
+# id: από το JSONL ή ο αριθμός γραμμής, offset: byte offset της αρχής της γραμμής, line: αριθμός γραμμής (από 1)
+# error: μήνυμα λάθους αν η εγγραφή δεν διαβάστηκε (μόνο με errors='keep'), αλλιώς None
+# path: το αρχείο της εγγραφής (χρήσιμο όταν διαβάζεται φάκελος)
+Record = namedtuple('Record', ['id', 'text', 'offset', 'line', 'error', 'path'], defaults=(None,))
+
+FORMATS = ('text', 'jsonl')
+_BOM = b'\xef\xbb\xbf'
+
+
+class RecordError(ValueError):
+    # Λάθος ανάγνωσης με τη θέση της εγγραφής στο αρχείο
+    def __init__(self, filepath, line, offset, message):
+        super().__init__(f"{filepath}:{line} (byte {offset}): {message}")
+        self.filepath = filepath
+        self.line = line
+        self.offset = offset
+
+# ============================== LINES ==============================
+
+def iter_lines(filepath, start_offset=0, start_line=0):
+    # Generator από (offset, line_number, raw_bytes) για κάθε γραμμή του αρχείου, μέσω mmap
+    # start_offset / start_line: συνέχεια από την αρχή μιας γραμμής (byte offset) με γνωστό αριθμό γραμμών πριν από
+    # αυτή - για resume χωρίς να ξαναδιαβαστεί το αρχείο από την αρχή
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File not found: {filepath}")
+    if os.path.getsize(filepath) == 0:
+        return  # το mmap δεν δέχεται άδεια αρχεία
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+
+        size = len(mm)
+        position = max(start_offset, len(_BOM) if mm[:len(_BOM)] == _BOM else 0)
+        line_number = start_line
+        while position < size:
+            end = mm.find(b'\n', position)
+            if end == -1:
+                end = size
+            line_number += 1
+            raw = mm[position:end]
+            if raw.endswith(b'\r'):
+                raw = raw[:-1]
+            yield position, line_number, raw
+            position = end + 1
+
+# ============================== RECORDS ==============================
+
+def detect_format(filepath):
+    extension = os.path.splitext(filepath)[1].lower()
+    return 'jsonl' if extension in ('.jsonl', '.ndjson') else 'text'
+
+
+def _parse_line(filepath, fmt, offset, line_number, raw, text_field, id_field):
+    # Επιστρέφει Record ή None για κενή γραμμή - σηκώνει RecordError σε λάθος
+    try:
+        line = raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise RecordError(filepath, line_number, offset, f"invalid UTF-8 ({e.reason})")
+
+    if not line.strip():
+        return None
+
+    if fmt == 'text':
+        return Record(line_number, line.strip(), offset, line_number, None, filepath)
+
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise RecordError(filepath, line_number, offset, f"invalid JSON ({e.msg})")
+    if not isinstance(data, dict) or not isinstance(data.get(text_field), str):
+        raise RecordError(filepath, line_number, offset, f"expected an object with a string '{text_field}' field")
+    return Record(data.get(id_field, line_number), data[text_field], offset, line_number, None, filepath)
+
+
+def iter_records(filepath, fmt='auto', text_field='text', id_field='id', errors='raise', start_offset=0, start_line=0):
+    # Generator από Record για κάθε μη κενή εγγραφή του αρχείου
+    # fmt: 'auto' (από την κατάληξη: .jsonl/.ndjson -> jsonl), 'text' ή 'jsonl'
+    # errors: 'raise' (RecordError), 'skip' (αγνόησε την εγγραφή) ή 'keep' (Record με text=None και error)
+    # start_offset / start_line: όπως στο iter_lines
+    if fmt == 'auto':
+        fmt = detect_format(filepath)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt} (available: {FORMATS})")
+    if errors not in ('raise', 'skip', 'keep'):
+        raise ValueError(f"errors must be 'raise', 'skip' or 'keep', got {errors!r}")
+
+    for offset, line_number, raw in iter_lines(filepath, start_offset, start_line):
+        try:
+            record = _parse_line(filepath, fmt, offset, line_number, raw, text_field, id_field)
+        except RecordError as e:
+            if errors == 'raise':
+                raise
+            if errors == 'keep':
+                yield Record(line_number, None, offset, line_number, str(e), filepath)
+            continue
+        if record is not None:
+            yield record
+
+
+def _records_after(records, offset):
+    # Παραλείπει την εγγραφή στο offset (την τελευταία που είχε ολοκληρωθεί) αν είναι η πρώτη
+    first = next(records, None)
+    if first is not None and first.offset != offset:
+        yield first
+    yield from records
+
+
+def iter_path_records(path, fmt='auto', text_field='text', id_field='id', errors='raise', resume_after=None,
+                      whole_files=False):
+    # Όπως το iter_records, αλλά το path μπορεί να είναι και φάκελος: τα αρχεία του (όχι υποφάκελοι / κρυφά)
+    # διαβάζονται με αλφαβητική σειρά - τα .jsonl/.ndjson ως jsonl, τα υπόλοιπα ως text (μία εγγραφή ανά γραμμή,
+    # όπως ένα αρχείο που δίνεται μόνο του)
+    # whole_files: τα αρχεία εκτός jsonl του φακέλου είναι ένα κείμενο το καθένα (όπως τα sentence1.txt /
+    # sentence2.txt) με id το όνομα του αρχείου - διαβάζονται ολόκληρα στη μνήμη
+    # resume_after: (path, offset, line) μιας εγγραφής - η ανάγνωση συνεχίζει αμέσως μετά από αυτή (seek, χωρίς
+    # να ξαναδιαβαστούν οι προηγούμενες)
+    if not os.path.isdir(path):
+        if resume_after is None:
+            yield from iter_records(path, fmt=fmt, text_field=text_field, id_field=id_field, errors=errors)
+            return
+        _, offset, line = resume_after
+        yield from _records_after(iter_records(path, fmt=fmt, text_field=text_field, id_field=id_field,
+                                               errors=errors, start_offset=offset, start_line=line - 1), offset)
+        return
+
+    names = sorted(name for name in os.listdir(path)
+                   if not name.startswith('.') and os.path.isfile(os.path.join(path, name)))
+    if resume_after is not None:
+        resume_name = os.path.basename(resume_after[0])
+        if resume_name not in names:
+            raise ValueError(f"Cannot resume: {resume_after[0]} is no longer in {path}")
+        names = names[names.index(resume_name):]
+
+    for name in names:
+        filepath = os.path.join(path, name)
+        resuming = resume_after is not None and name == os.path.basename(resume_after[0])
+        file_fmt = detect_format(filepath)
+        if file_fmt == 'jsonl' or not whole_files:
+            if resuming:
+                _, offset, line = resume_after
+                yield from _records_after(iter_records(filepath, fmt=file_fmt, text_field=text_field,
+                                                       id_field=id_field, errors=errors,
+                                                       start_offset=offset, start_line=line - 1), offset)
+            else:
+                yield from iter_records(filepath, fmt=file_fmt, text_field=text_field, id_field=id_field, errors=errors)
+            continue
+        if resuming:
+            continue  # ένα κείμενο ανά αρχείο: το αρχείο έχει ήδη ολοκληρωθεί
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        if raw.startswith(_BOM):
+            raw = raw[len(_BOM):]
+        try:
+            text = raw.decode('utf-8').strip()
+        except UnicodeDecodeError as e:
+            error = RecordError(filepath, 1, 0, f"invalid UTF-8 ({e.reason})")
+            if errors == 'raise':
+                raise error
+            if errors == 'keep':
+                yield Record(name, None, 0, 1, str(error), filepath)
+            continue
+        if text:
+            yield Record(name, text, 0, 1, None, filepath)
+
+
+def iter_texts(filepath, fmt='auto', text_field='text'):
+    # Μόνο τα κείμενα, για callers που δεν χρειάζονται ids/offsets
+    for record in iter_records(filepath, fmt=fmt, text_field=text_field):
+        yield record.text
@@ -0,0 +1,256 @@
+# Ορθογραφική διόρθωση άγνωστων λέξεων με edit distance (Symmetric Delete, όπως το SymSpell)
+# Το λεξικό διορθώσεων (spelling.py) διορθώνει μόνο λάθη που έχουν καταγραφεί. Εδώ:
+# - Offline: από μια λίστα συχνοτήτων λέξεων (λέξη συχνότητα ανά γραμμή) χτίζεται index από
+#   deletes: για κάθε λέξη όλες οι παραλλαγές της με έως max_distance διαγραφές χαρακτήρων (στα πρώτα
+#   prefix_length γράμματα) -> λέξεις. Ο index αποθηκεύεται με pickle.
+# - Runtime: οι deletes της άγνωστης λέξης βρίσκουν υποψήφιες λέξεις με lookup, και μόνο αυτές
+#   ελέγχονται με Damerau-Levenshtein (OSA) απόσταση - χωρίς παραγωγή όλων των edits όπως το TextBlob.
+# Προτείνεται η κοντινότερη λέξη (απόσταση 1 ή 2), σε ισοπαλία η πιο συχνή.
+# (κοινό module των Paradoteo1A και Paradoteo1B, import ως nlp_common.symspell)
+
+import os
+import re
+import sys
+import pickle
+from collections import Counter
+from functools import lru_cache
+
+DEFAULT_FREQUENCY_LIST = os.path.join("data", "frequency_words.txt")
+DEFAULT_SYMSPELL_INDEX = os.path.join("data", "symspell_index.pkl")
+DEFAULT_MAX_DISTANCE = 2
+DEFAULT_PREFIX_LENGTH = 7
+DEFAULT_CACHE_SIZE = 100_000
+MIN_WORD_LENGTH = 3  # πιο μικρές λέξεις δεν διορθώνονται (πολλές υποψήφιες σε απόσταση 1-2)
+
+_WORD = re.compile(r'[A-Za-z]+')
+
+# ============================== DISTANCE ==============================
+
+def edit_distance(source, target, max_distance):
+    # Optimal string alignment (Damerau-Levenshtein με μεταθέσεις γειτονικών) - επιστρέφει
+    # max_distance + 1 μόλις η απόσταση ξεπεράσει το όριο
+    # Το κοινό prefix/suffix αφαιρείται και υπολογίζεται μόνο η λωρίδα |i - j| <= max_distance του πίνακα
+    if source == target:
+        return 0
+    too_far = max_distance + 1
+    start = 0
+    end_s, end_t = len(source), len(target)
+    while start < end_s and start < end_t and source[start] == target[start]:
+        start += 1
+    while end_s > start and end_t > start and source[end_s - 1] == target[end_t - 1]:
+        end_s -= 1
+        end_t -= 1
+    source, target = source[start:end_s], target[start:end_t]
+    n_s, n_t = len(source), len(target)
+    if abs(n_s - n_t) > max_distance:
+        return too_far
+    if n_s == 0 or n_t == 0:
+        return max(n_s, n_t)
+
+    previous2 = None
+    previous = [j if j <= max_distance else too_far for j in range(n_t + 1)]
+    for i in range(1, n_s + 1):
+        current = [too_far] * (n_t + 1)
+        current[0] = row_min = i if i <= max_distance else too_far
+        char_s = source[i - 1]
+        for j in range(max(1, i - max_distance), min(n_t, i + max_distance) + 1):
+            char_t = target[j - 1]
+            value = previous[j - 1] if char_s == char_t else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if previous2 is not None and j > 1 and char_s == target[j - 2] and source[i - 2] == char_t:
+                if previous2[j - 2] + 1 < value:
+                    value = previous2[j - 2] + 1
+            if value > too_far:
+                value = too_far
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return too_far
+        previous2, previous = previous, current
+    return previous[n_t]
+
+# ============================== INDEX ==============================
+
+def _deletes(word, max_distance):
+    # Όλες οι παραλλαγές με έως max_distance διαγραφές (μαζί με την ίδια τη λέξη)
+    found = {word}
+    level = {word}
+    for _ in range(max_distance):
+        level = {candidate[:i] + candidate[i + 1:] for candidate in level for i in range(len(candidate))}
+        found |= level
+    return found
+
+
+class SymSpell:
+
+    def __init__(self, max_distance=DEFAULT_MAX_DISTANCE, prefix_length=DEFAULT_PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = {}    # λέξη -> συχνότητα
+        self.deletes = {}  # delete -> λίστα λέξεων
+        self.max_length = 0
+        self._init_cache()
+
+    def _init_cache(self):
+        # LRU cache ανά instance για τις διορθώσεις λέξεων (οι ίδιες άγνωστες λέξεις επανέρχονται)
+        self._correct_cached = lru_cache(maxsize=DEFAULT_CACHE_SIZE)(self._correct_word)
+
+    def add_word(self, word, count=1):
+        word = word.lower()
+        if word in self.words:
+            self.words[word] += count
+            return
+        self.words[word] = count
+        self._correct_cached.cache_clear()
+        self.max_length = max(self.max_length, len(word))
+        for delete in _deletes(word[:self.prefix_length], self.max_distance):
+            self.deletes.setdefault(delete, []).append(word)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word.lower() in self.words
+
+    def lookup(self, word, max_distance=None, closest=False):
+        # Προτάσεις για τη λέξη: λίστα από (λέξη, απόσταση, συχνότητα), οι κοντινότερες πρώτα και
+        # σε ίδια απόσταση οι πιο συχνές
+        # closest=True: μόνο οι προτάσεις της μικρότερης απόστασης - σταματά νωρίς μόλις βρεθούν
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        word = word.lower()
+        if word in self.words:
+            return [(word, 0, self.words[word])]
+        if len(word) - max_distance > self.max_length:
+            return []
+
+        # Οι deletes της λέξης ανά επίπεδο (αριθμός διαγραφών): μια λέξη σε απόσταση d βρίσκεται
+        # το αργότερο στο επίπεδο d, άρα όσες βρεθούν πρώτη φορά στο επίπεδο k απέχουν >= k
+        suggestions = {}
+        bound = max_distance
+        level = {word[:self.prefix_length]}
+        for depth in range(max_distance + 1):
+            if closest and depth > bound:
+                break
+            for delete in level:
+                for candidate in self.deletes.get(delete, ()):
+                    if candidate in suggestions or abs(len(candidate) - len(word)) > bound:
+                        continue
+                    distance = edit_distance(word, candidate, bound)
+                    suggestions[candidate] = distance
+                    if closest and distance < bound:
+                        bound = distance
+            level = {delete[:i] + delete[i + 1:] for delete in level for i in range(len(delete))}
+
+        found = [(candidate, distance, self.words[candidate])
+                 for candidate, distance in suggestions.items() if distance <= bound]
+        found.sort(key=lambda suggestion: (suggestion[1], -suggestion[2], suggestion[0]))
+        return found
+
+    def correct_word(self, word):
+        # Η καλύτερη πρόταση με την ίδια κεφαλαιοποίηση, ή η λέξη όπως είναι αν είναι γνωστή / δεν βρέθηκε τίποτα
+        return self._correct_cached(word)
+
+    def _correct_word(self, word):
+        if len(word) < MIN_WORD_LENGTH or word.lower() in self.words:
+            return word
+        suggestions = self.lookup(word, closest=True)
+        if not suggestions:
+            return word
+        best = suggestions[0][0]
+        if word.isupper():
+            return best.upper()
+        if word[0].isupper():
+            return best.capitalize()
+        return best
+
+    def correct_text(self, text):
+        # Διόρθωση κάθε λέξης (μόνο λατινικοί χαρακτήρες) - στίξη και κενά μένουν όπως είναι
+        return _WORD.sub(lambda match: self.correct_word(match.group()), text)
+
+    def __getstate__(self):
+        # Η lru_cache του instance δεν αποθηκεύεται
+        return {'max_distance': self.max_distance, 'prefix_length': self.prefix_length,
+                'words': self.words, 'deletes': self.deletes, 'max_length': self.max_length}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_cache()
+
+# ============================== BUILD / I/O ==============================
+
+def load_frequency_list(filepath):
+    # Μία λέξη ανά γραμμή με προαιρετική συχνότητα: "λέξη συχνότητα" ή "λέξη\tσυχνότητα"
+    counts = Counter()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            count = int(fields[1]) if len(fields) > 1 and fields[1].isdigit() else 1
+            counts[fields[0].lower()] += count
+    return counts
+
+
+def frequency_list_from_texts(texts):
+    # Λίστα συχνοτήτων από corpus (για όταν δεν υπάρχει έτοιμη)
+    counts = Counter()
+    for text in texts:
+        counts.update(word.lower() for word in _WORD.findall(text))
+    return counts
+
+
+def build_symspell(counts, max_distance=DEFAULT_MAX_DISTANCE, prefix_length=DEFAULT_PREFIX_LENGTH, min_count=1):
+    # counts: dict λέξη -> συχνότητα
+    symspell = SymSpell(max_distance, prefix_length)
+    for word, count in counts.items():
+        if count >= min_count and _WORD.fullmatch(word):
+            symspell.add_word(word, count)
+    return symspell
+
+
+def save_symspell(symspell, filepath=DEFAULT_SYMSPELL_INDEX):
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    with open(filepath, 'wb') as f:
+        pickle.dump(symspell, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_symspell(filepath=DEFAULT_SYMSPELL_INDEX):
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(
+            f"SymSpell index not found: {filepath} "
+            f"(build it with: PYTHONPATH=.. python -m nlp_common.symspell [frequency_words.txt] [{filepath}])"
+        )
+    with open(filepath, 'rb') as f:
+        return pickle.load(f)
+
+# Lazy global: ο index φορτώνεται μία φορά ανά process
+_symspell = None
+
+
+def get_symspell():
+    global _symspell
+    if _symspell is None:
+        _symspell = load_symspell()
+    return _symspell
+
+
+def set_symspell(symspell):
+    global _symspell
+    _symspell = symspell
+
+
+if __name__ == "__main__":
+    # Χρήση: PYTHONPATH=.. python -m nlp_common.symspell [frequency_words.txt] [index.pkl]
+    frequency_list = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FREQUENCY_LIST
+    output = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SYMSPELL_INDEX
+    if not os.path.exists(frequency_list):
+        print("Usage: PYTHONPATH=.. python -m nlp_common.symspell [frequency_words.txt] [index.pkl]")
+        print(f"Frequency list not found: {frequency_list}")
+        sys.exit(1)
+    symspell = build_symspell(load_frequency_list(frequency_list))
+    save_symspell(symspell, output)
+    print(f"✓ SymSpell index with {len(symspell)} words and {len(symspell.deletes)} deletes saved to: {output}")